@@ -10,12 +10,77 @@ ENVIRONMENT = os.getenv("ENVIRONMENT")
 
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 
 class Settings(BaseSettings):
     MONGODB_URI: str = MONGODB_URI
     DATABASE_NAME: str = DATABASE_NAME
     ENVIRONMENT: str = ENVIRONMENT
 
+    # In-process userprofile read cache
+    PROFILE_CACHE_TTL_SECONDS: int = 300
+    PROFILE_CACHE_MAX_ENTRIES: int = 10000
+    PROFILE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+    # Shared cache tier; unset keeps caching in-process (e.g. redis://redis:6379/0)
+    REDIS_URL: Optional[str] = os.getenv("REDIS_URL")
+    CACHE_NAMESPACE: str = "mentorhood"
+    CACHE_DEFAULT_TTL_SECONDS: int = 60
+    # Lifetime of the per-worker copy of a profile when a shared cache is configured
+    PROFILE_CACHE_LOCAL_TTL_SECONDS: int = 10
+
+    # Session catalog pagination
+    CATALOG_PAGE_SIZE: int = 20
+    CATALOG_MAX_PAGE_SIZE: int = 100
+
+    # Rows fetched per cursor batch and flushed per chunk by streaming exports
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Write-behind counters (upvotes): flush every N ms or after K pending increments.
+    # The interval bounds how stale a count can be on other workers.
+    COUNTER_FLUSH_INTERVAL_MS: int = 250
+    COUNTER_FLUSH_THRESHOLD: int = 1000
+
+    # Trending questions: a hot score loses half its weight every half-life;
+    # the decay job re-bases all scores at this interval
+    HOT_HALF_LIFE_SECONDS: int = 1800
+    HOT_DECAY_INTERVAL_SECONDS: int = 60
+
+    # Live Q&A push: per-subscriber queue bound, count-update coalescing window,
+    # SSE keepalive, and whether events come from change streams (replica set
+    # required; lets every worker push writes made on any worker)
+    LIVE_QUEUE_SIZE: int = 100
+    LIVE_COALESCE_MS: int = 250
+    LIVE_KEEPALIVE_SECONDS: int = 15
+    LIVE_CHANGE_STREAMS: bool = False
+
+    # Duplicate-question detection: minimum estimated similarity for a
+    # candidate, how many to return, and bounds on the per-session indexes
+    SIMILARITY_THRESHOLD: float = 0.5
+    SIMILARITY_MAX_CANDIDATES: int = 5
+    SIMILARITY_MAX_SESSIONS: int = 200
+    SIMILARITY_MAX_BYTES: int = 128 * 1024 * 1024
+    SIMILARITY_IDLE_SECONDS: int = 3 * 3600
+
+    # Mentor and session search: page bounds, facet values returned per field,
+    # and how many matches facet counts are computed over
+    SEARCH_PAGE_SIZE: int = 20
+    SEARCH_MAX_PAGE_SIZE: int = 100
+    SEARCH_MAX_SKIP: int = 1000
+    SEARCH_FACET_SIZE: int = 20
+    SEARCH_FACET_SCAN_LIMIT: int = 10000
+
+    # Typeahead: results per suggestion request, and how often the prefix index
+    # is checked for writes made on other workers
+    SUGGEST_MAX_RESULTS: int = 20
+    SUGGEST_REBUILD_SECONDS: int = 300
+
+    # Upper bound on ids accepted by batch lookup endpoints
+    BATCH_MAX_IDS: int = 100
+
+    # Responses smaller than this are sent uncompressed
+    COMPRESSION_MIN_SIZE: int = 1024
+
     class Config:
         env_file = ".env"
         env_file_encoding = 'utf-8'
@@ -1,8 +1,12 @@
+import logging
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
 from app.config import DATABASE_URL
 from fastapi import HTTPException
 from bson import ObjectId
 
+logger = logging.getLogger(__name__)
+
 try:
     client = AsyncIOMotorClient(DATABASE_URL)
     db = client.mentorhood
@@ -38,4 +42,93 @@ def get_collection(collection_name):
     return db[collection_name]
 
 def close_connection():
-    client.close()
\ No newline at end of file
+    client.close()
+
+# Indexes backing the query patterns of the routers, created at startup
+INDEXES = {
+    "sessions": [
+        # Keyset pagination of the session catalog
+        IndexModel([("sessionType", ASCENDING), ("_id", DESCENDING)]),
+        IndexModel([("userId", ASCENDING)]),
+        # Session search
+        IndexModel(
+            [(field, TEXT) for field in ("sessionName", "topics", "description")],
+            weights={"sessionName": 10, "topics": 6, "description": 2},
+            name="session_search"
+        ),
+    ],
+    "userprofile": [
+        IndexModel([("userId", ASCENDING)]),
+        # Mentor listing and browse-mode search, newest first
+        IndexModel([("role", ASCENDING), ("_id", DESCENDING)]),
+        # Mentor search; a match in a higher-weighted field ranks above one in the bio
+        IndexModel(
+            [(field, TEXT) for field in ("primaryExpertise", "skills", "tools", "mentoringTopics", "disciplines", "bio")],
+            weights={"primaryExpertise": 10, "skills": 8, "tools": 6, "mentoringTopics": 5, "disciplines": 4, "bio": 1},
+            name="mentor_search"
+        ),
+    ],
+    "registrations": [
+        # Streaming export of a session's registrations in _id order
+        IndexModel([("session_id", ASCENDING), ("_id", ASCENDING)]),
+        # One registration per email per session; also enforces it under concurrent claims
+        IndexModel([("session_id", ASCENDING), ("email", ASCENDING)], unique=True),
+    ],
+    "waitlist": [
+        # Arrival order per session; one entry per email
+        IndexModel([("session_id", ASCENDING), ("_id", ASCENDING)]),
+        IndexModel([("session_id", ASCENDING), ("email", ASCENDING)], unique=True),
+    ],
+    "questionnaires": [
+        # Keyset pagination of a session's questions, newest or most upvoted first
+        IndexModel([("session_id", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("session_id", ASCENDING), ("upvotes", DESCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("timestamp", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("upvotes", DESCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)]),
+        # Trending top-K per session, and the decay job's scan of live scores
+        IndexModel([("session_id", ASCENDING), ("hot_score", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("hot_score", DESCENDING)]),
+    ],
+    "answers": [
+        IndexModel([("question_id", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("question_id", ASCENDING), ("upvotes", DESCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)]),
+    ],
+    "votes": [
+        # One vote per user per target; rejects repeat votes and covers the "did I upvote" lookup
+        IndexModel([("user_id", ASCENDING), ("target_type", ASCENDING), ("target_id", ASCENDING)], unique=True),
+    ],
+    "bookings": [
+        IndexModel([("session_id", ASCENDING), ("_id", ASCENDING)]),
+        # Covers the batch booking-status lookup (no document fetch)
+        IndexModel([
+            ("email", ASCENDING), ("session_id", ASCENDING),
+            ("date", ASCENDING), ("time", ASCENDING), ("timezone", ASCENDING)
+        ]),
+    ],
+}
+
+async def ensure_indexes():
+    """
+    Create INDEXES at startup. A missing plain index only costs speed, so
+    that failure is logged. The unique indexes are what stop double
+    registrations and repeat votes, so if one of them cannot be built
+    (usually because duplicates already exist) startup fails and the
+    duplicates have to be removed first.
+    """
+    for collection_name, indexes in INDEXES.items():
+        unique = [index for index in indexes if index.document.get("unique")]
+        others = [index for index in indexes if not index.document.get("unique")]
+        if unique:
+            try:
+                await db[collection_name].create_indexes(unique)
+            except Exception as e:
+                logger.critical(f"Failed to create unique indexes on {collection_name}: {str(e)}")
+                raise RuntimeError(
+                    f"Unique index on {collection_name} could not be created; "
+                    f"remove the duplicate documents it reports and restart"
+                ) from e
+        if others:
+            try:
+                await db[collection_name].create_indexes(others)
+            except Exception as e:
+                logger.error(f"Failed to create indexes on {collection_name}: {str(e)}")
@@ -7,18 +7,33 @@ from app.routes import questionnaire as questionnaire_routes
 from app.routes import session as session_routes
 from app.routes import ama_session as ama_session_routes
 from app.utils.email import email_sender
+from app.database import ensure_indexes
 from app.routes import mentor as mentor_routes
 from app.routes import registration as registration_routes
 from app.routes import booking as booking_routes
 from app.routes import dashboard
 from app.routes import upload
 from app.routes import tokens  # Add this with your other imports
+from app.routes import live as live_routes
+from app.routes import search as search_routes
+from app.utils.profile_cache import profile_cache
+from app.utils.cache_backend import shared_cache
+from app.utils.singleflight import singleflight
+from app.utils.notifications import notifications
+from app.utils.counters import COUNTER_BUFFERS
+from app.utils.hot import hot_decay
+from app.utils.live import broker, change_feed
+from app.utils.similarity import similarity_index
+from app.utils.suggest import suggestions
+from app.utils.responses import BSONJSONResponse
+from app.utils.compression import CompressionMiddleware, compression_stats, precompressed_cache
+from app.config import settings
 
 # Add this near the start of your application
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+app = FastAPI(default_response_class=BSONJSONResponse)
 
 # Configure CORS
 origins = [
@@ -34,8 +49,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
 # Include routers
 app.include_router(user_routes.router)
 app.include_router(questionnaire_routes.router)
@@ -47,11 +65,28 @@ app.include_router(booking_routes.router)
 app.include_router(dashboard.router)
 app.include_router(upload.router)
 app.include_router(tokens.router) 
+app.include_router(live_routes.router)
+app.include_router(search_routes.router)
 
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the FastAPI MongoDB app!"}
 
+@app.get("/cache/stats")
+def cache_stats():
+    return {
+        "profiles": profile_cache.stats(),
+        "shared": shared_cache.stats(),
+        "singleflight": singleflight.stats(),
+        "notifications": notifications.stats(),
+        "counters": {name: counter.stats() for name, counter in COUNTER_BUFFERS.items()},
+        "hot_decay": hot_decay.stats(),
+        "live": broker.stats(),
+        "similarity": similarity_index.stats(),
+        "suggest": suggestions.stats(),
+        "compression": {**compression_stats, "precompressed": precompressed_cache.stats()}
+    }
+
 @app.get("/test-email")
 async def test_email():
     try:
@@ -70,6 +105,16 @@ async def test_email():
 # Add this to check if environment variables are set (remove before production)
 @app.on_event("startup")
 async def startup_event():
+    await ensure_indexes()
+    notifications.start()
+    for counter in COUNTER_BUFFERS.values():
+        counter.start()
+    hot_decay.start()
+    broker.start()
+    suggestions.start()
+    if settings.LIVE_CHANGE_STREAMS:
+        change_feed.start()
+
     logger.info("Checking S3 configuration...")
     s3_vars = {
         "AWS_ACCESS_KEY": os.environ.get("AWS_ACCESS_KEY"),
@@ -82,4 +127,15 @@ async def startup_event():
         if value:
             logger.info(f"{key} is set")
         else:
-            logger.warning(f"{key} is NOT set!")
\ No newline at end of file
+            logger.warning(f"{key} is NOT set!")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    change_feed.stop()
+    suggestions.stop()
+    broker.stop()
+    hot_decay.stop()
+    for counter in COUNTER_BUFFERS.values():
+        await counter.stop()
+    await notifications.stop()
+    await shared_cache.close()
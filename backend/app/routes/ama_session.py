@@ -1,32 +1,83 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, status, Request, Response
 from typing import List
 from datetime import datetime
 from app.schemas.ama_session import AMASession, AMASessionCreate, PyObjectId
 from app.database import get_collection
+from app.utils.etag import bump_version, get_version, make_etag, not_modified, set_cache_headers
+from app.utils.singleflight import request_key, singleflight
+from app.utils.projection import model_projection
+from app.utils.responses import dumps
+from app.utils.batch import order_by_ids, parse_ids
+from app.utils.similarity import similarity_index
 from bson import ObjectId
 
 router = APIRouter()
 
-@router.get("/ama-sessions", response_model=List[AMASession])
-async def get_ama_sessions(is_woman_tech: bool = None):
+AMA_SESSION_FIELDS = model_projection(AMASession)
+
+async def _render_ama_sessions(is_woman_tech: bool = None) -> bytes:
     collection = get_collection("ama_sessions")
     query = {}
     if is_woman_tech is not None:
         query["isWomanTech"] = is_woman_tech
     
-    sessions = await collection.find(query).to_list(length=None)
-    return sessions
+    # Projected to the AMASession fields, so documents are serialized without re-validation
+    sessions = await collection.find(query, AMA_SESSION_FIELDS).to_list(length=None)
+    return dumps(sessions)
 
-@router.get("/ama-sessions/{session_id}", response_model=AMASession)
-async def get_ama_session_by_id(session_id: str):
+@router.get("/ama-sessions", response_model=List[AMASession])
+async def get_ama_sessions(request: Request, is_woman_tech: bool = None):
+    # Read the version before the data so a concurrent write can only make the ETag older
+    version = await get_version("ama_sessions")
+    etag = make_etag("ama_sessions", version, is_woman_tech)
+    cached = not_modified(request, etag, "ama_sessions")
+    if cached:
+        return cached
+
+    # Identical concurrent polls share one query and one serialized body. The
+    # version is part of the key, so a render started before a write is never
+    # served under the ETag of a version read after it.
+    body = await singleflight.do((request_key(request), version), lambda: _render_ama_sessions(is_woman_tech))
+    response = Response(content=body, media_type="application/json")
+    set_cache_headers(response, etag, "ama_sessions")
+    return response
+
+@router.get("/ama-sessions/batch")
+async def get_ama_sessions_batch(ids: str):
     collection = get_collection("ama_sessions")
     try:
-        session = await collection.find_one({"_id": ObjectId(session_id)})
-        if session is None:
-            raise HTTPException(status_code=404, detail="Session not found")
-        return session
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Invalid session ID: {str(e)}")
+        session_ids = parse_ids(ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Invalid IDs cannot match anything, so they are simply reported as missing
+    object_ids = [ObjectId(session_id) for session_id in session_ids if ObjectId.is_valid(session_id)]
+    documents = await collection.find({"_id": {"$in": object_ids}}, AMA_SESSION_FIELDS).to_list(length=None)
+    sessions, missing = order_by_ids(documents, session_ids, "_id")
+    return Response(
+        content=dumps({"sessions": sessions, "missing": missing}),
+        media_type="application/json"
+    )
+
+@router.get("/ama-sessions/{session_id}", response_model=AMASession)
+async def get_ama_session_by_id(session_id: str, request: Request, response: Response):
+    collection = get_collection("ama_sessions")
+    if not ObjectId.is_valid(session_id):
+        raise HTTPException(status_code=400, detail="Invalid session ID")
+
+    # Revalidation only needs updated_at, not the whole document
+    if request.headers.get("if-none-match"):
+        stamp = await collection.find_one({"_id": ObjectId(session_id)}, {"updated_at": 1})
+        if stamp is not None:
+            cached = not_modified(request, make_etag("ama_session", session_id, stamp.get("updated_at")), "ama_session")
+            if cached:
+                return cached
+
+    session = await collection.find_one({"_id": ObjectId(session_id)})
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    set_cache_headers(response, make_etag("ama_session", session_id, session.get("updated_at")), "ama_session")
+    return session
 
 @router.post("/ama-sessions", response_model=AMASession, status_code=status.HTTP_201_CREATED)
 async def create_ama_session(session: AMASessionCreate):
@@ -43,6 +94,7 @@ async def create_ama_session(session: AMASessionCreate):
     print('session_dict', session_dict)
     # Insert the session with the generated ID
     await collection.insert_one(session_dict)
+    await bump_version("ama_sessions")
     
     # Retrieve the created session
     created_session = await collection.find_one({"_id": session_id})
@@ -61,6 +113,7 @@ async def update_ama_session(session_id: str, session: AMASessionCreate):
     
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Session not found")
+    await bump_version("ama_sessions")
     
     updated_session = await collection.find_one({"_id": ObjectId(session_id)})
     return updated_session
@@ -71,4 +124,6 @@ async def delete_ama_session(session_id: str):
     result = await collection.delete_one({"_id": ObjectId(session_id)})
     
     if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Session not found") 
\ No newline at end of file
+        raise HTTPException(status_code=404, detail="Session not found")
+    await bump_version("ama_sessions")
+    similarity_index.evict(session_id)
@@ -8,9 +8,14 @@ import secrets
 import re
 
 from ..database import get_collection
-from ..schemas.booking import BookingCreate, Booking as BookingSchema
+from ..schemas.booking import BookingCreate, Booking as BookingSchema, BookingStatusRequest
+from ..config import settings
 from ..utils.email import email_sender
 from ..utils.meeting_service import MeetingService
+from ..utils.cache_backend import shared_cache
+from ..utils.projection import model_projection
+from ..utils.responses import BSONJSONResponse
+from ..utils.export import export_response
 
 router = APIRouter(
     prefix="/bookings",
@@ -27,6 +32,13 @@ class BookingRequest(BaseModel):
 
 meeting_service = MeetingService()
 
+BOOKING_FIELDS = model_projection(BookingSchema)
+# Only fields held in the (email, session_id, date, time, timezone) index
+BOOKING_STATUS_FIELDS = {"session_id": 1, "date": 1, "time": 1, "timezone": 1, "_id": 0}
+BOOKING_EXPORT_COLUMNS = [
+    "_id", "session_id", "email", "date", "time", "timezone", "meeting_link", "created_at"
+]
+
 @router.post("/create", response_model=BookingSchema)
 async def create_booking(booking_request: BookingRequest):
     """
@@ -78,6 +90,8 @@ async def create_booking(booking_request: BookingRequest):
         # Insert the booking
         bookings_collection = get_collection("bookings")
         result = await bookings_collection.insert_one(booking_dict)
+        if booking_request.email:
+            await shared_cache.delete_tag(f"bookings:{booking_request.email}")
         
         # Get the created booking
         created_booking = await bookings_collection.find_one({"_id": result.inserted_id})
@@ -110,14 +124,35 @@ async def list_bookings(session_id: str = None):
             raise HTTPException(status_code=400, detail="Invalid session ID")
         query["session_id"] = session_id
     
-    cursor = bookings_collection.find(query)
+    cursor = bookings_collection.find(query, BOOKING_FIELDS)
     bookings = await cursor.to_list(length=100)
     
-    # Convert ObjectId to string before returning
-    for b in bookings:
-        b["_id"] = str(b["_id"])
+    # Projected to the response model fields, so serialize without re-validation
+    return BSONJSONResponse(bookings)
+
+@router.get("/export")
+async def export_bookings(session_id: str = None, format: str = "ndjson"):
+    """
+    Stream all bookings, optionally filtered by session_id, as NDJSON or CSV.
+    """
+    bookings_collection = get_collection("bookings")
+    query = {}
+    
+    if session_id:
+        if not ObjectId.is_valid(session_id):
+            raise HTTPException(status_code=400, detail="Invalid session ID")
+        query["session_id"] = session_id
     
-    return bookings
+    try:
+        return export_response(
+            bookings_collection,
+            query,
+            BOOKING_EXPORT_COLUMNS,
+            format,
+            f"bookings-{session_id}" if session_id else "bookings"
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{booking_id}", response_model=BookingSchema)
 async def get_booking(booking_id: str):
@@ -167,6 +202,29 @@ async def check_booking_status(session_id: str, email: str):
             detail=f"Error checking booking status: {str(e)}"
         )
 
+@router.post("/check")
+async def check_booking_statuses(request: BookingStatusRequest):
+    """
+    Check a user's bookings for many sessions at once.
+    Returns the booked slots per session from one query on a covering index.
+    """
+    if len(request.session_ids) > settings.BATCH_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.BATCH_MAX_IDS} session IDs can be checked at once")
+    
+    bookings_collection = get_collection("bookings")
+    cursor = bookings_collection.find(
+        {"email": request.email, "session_id": {"$in": request.session_ids}},
+        BOOKING_STATUS_FIELDS
+    )
+    
+    statuses = {session_id: {"has_bookings": False, "bookings": []} for session_id in request.session_ids}
+    async for booking in cursor:
+        status = statuses[booking.pop("session_id")]
+        status["has_bookings"] = True
+        status["bookings"].append(booking)
+    
+    return {"status": "success", "bookings": statuses}
+
 async def send_booking_confirmation_email(email: str, session_data: dict, booking_request: BookingRequest, meeting_link: str):
     """
     Send a confirmation email for a booking.
@@ -5,6 +5,7 @@ from bson import ObjectId
 import logging
 
 from ..database import get_collection
+from ..utils.cache_backend import shared_cache
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -24,6 +25,16 @@ async def get_mentee_dashboard(user_email: str):
     - Past sessions
     - Learning progress
     """
+    # Upcoming/past split depends on the current date, so it is part of the key
+    current_date_str = datetime.utcnow().strftime("%Y-%m-%d")
+    return await shared_cache.get_or_set(
+        f"dashboard:mentee:{user_email}:{current_date_str}",
+        lambda: build_mentee_dashboard(user_email),
+        tags=[f"bookings:{user_email}", "sessions"]
+    )
+
+async def build_mentee_dashboard(user_email: str):
+    """Assemble the mentee dashboard from bookings and their sessions."""
     try:
         # Get user information
         users_collection = get_collection("users")
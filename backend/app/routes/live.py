@@ -0,0 +1,65 @@
+import asyncio
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from app.config import settings
+from app.utils.live import broker, session_channel
+
+router = APIRouter(
+    prefix="/live",
+    tags=["live"]
+)
+
+@router.get("/questionnaires/{session_id}/events")
+async def questionnaire_events(session_id: str):
+    """
+    Server-sent events for an AMA session's Q&A: question_created,
+    answer_added, and coalesced question_upvotes_changed / answer_upvotes_changed.
+    With LIVE_CHANGE_STREAMS, answer_added carries no count and a coalesced
+    question_answers_changed follows it.
+    """
+    channel = session_channel(session_id)
+    queue = broker.subscribe(channel)
+
+    async def stream():
+        try:
+            yield b": connected\n\n"
+            while True:
+                try:
+                    data = await asyncio.wait_for(queue.get(), timeout=settings.LIVE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    # Keeps proxies from closing an idle connection
+                    yield b": keepalive\n\n"
+                    continue
+                yield b"data: " + data + b"\n\n"
+        finally:
+            broker.unsubscribe(channel, queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.websocket("/questionnaires/{session_id}/ws")
+async def questionnaire_socket(websocket: WebSocket, session_id: str):
+    """The same Q&A events as the SSE endpoint, over a WebSocket."""
+    await websocket.accept()
+    channel = session_channel(session_id)
+    queue = broker.subscribe(channel)
+
+    async def forward():
+        while True:
+            await websocket.send_text((await queue.get()).decode("utf-8"))
+
+    sender = asyncio.create_task(forward())
+    try:
+        # Clients do not send anything; receiving is how a disconnect is noticed
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        broker.unsubscribe(channel, queue)
@@ -1,8 +1,15 @@
-from fastapi import APIRouter, HTTPException, status, Query, Body
+from fastapi import APIRouter, HTTPException, Query, Body, Request, Response
 from datetime import datetime, UTC
-from typing import List, Any, Dict
-from app.schemas.mentor import MentorProfile
+from typing import List, Any, Dict, Union
+from app.schemas.mentor import MentorProfile, PatchOperation
 from app.database import get_collection
+from app.utils.profile_patch import apply_profile_patch
+from app.utils.profile_cache import get_profile, get_profiles, invalidate_profile
+from app.utils.projection import apply_projection, build_projection
+from app.utils.responses import BSONJSONResponse
+from app.utils.batch import order_by_ids, parse_ids
+from app.utils.etag import bump_version, get_version, make_etag, not_modified, set_cache_headers
+from app.utils.suggest import suggestions
 import uuid
 
 router = APIRouter(
@@ -11,36 +18,73 @@ router = APIRouter(
 )
 
 @router.get("/all")
-async def get_all_mentors():
+async def get_all_mentors(
+    request: Request,
+    view: str = Query("full", description="Response shape: card or full"),
+    fields: str = Query(None, description="Comma-separated fields to return")
+):
     collection = get_collection("userprofile")
+
+    try:
+        projection = build_projection("userprofile", view, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    etag = make_etag("mentors", await get_version("userprofile"), view, fields)
+    cached = not_modified(request, etag, "mentors")
+    if cached:
+        return cached
     
-    mentors = await collection.find({"role": "mentor"}).to_list(length=None)
+    mentors = await collection.find({"role": "mentor"}, projection or {"_id": 0}).to_list(length=None)
+
+    response = BSONJSONResponse({
+        "status": "success",
+        "mentors": mentors
+    })
+    set_cache_headers(response, etag, "mentors")
+    return response
+
+@router.get("/batch")
+async def get_mentors_batch(
+    ids: str = Query(..., description="Comma-separated mentor user IDs"),
+    view: str = Query("full", description="Response shape: card or full"),
+    fields: str = Query(None, description="Comma-separated fields to return")
+):
+    try:
+        mentor_ids = parse_ids(ids)
+        projection = build_projection("userprofile", view, fields, required=("userId",))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    # Convert ObjectId to string and remove _id field for each mentor
-    mentors_list = []
+    # Served from the profile cache; misses are fetched with one $in query
+    profiles = await get_profiles(mentor_ids)
+    mentors, missing = order_by_ids(profiles, mentor_ids, "userId")
     for mentor in mentors:
-        mentor_dict = dict(mentor)
-        mentor_dict.pop('_id', None)
-        mentors_list.append(mentor_dict)
-
-    return {
+        mentor.pop("_id", None)
+    
+    return BSONJSONResponse({
         "status": "success",
-        "mentors": mentors_list
-    }
+        "mentors": [apply_projection(mentor, projection) for mentor in mentors],
+        "missing": missing
+    })
 
 @router.get("/{mentor_id}")
-async def get_mentor_profile(mentor_id: str):
-    collection = get_collection("userprofile")
-    
+async def get_mentor_profile(mentor_id: str, request: Request, response: Response):
     if not mentor_id:
         raise HTTPException(status_code=400, detail="Mentor ID required")
     
-    mentor = await collection.find_one({"userId": mentor_id})
-    if not mentor:
+    mentor_dict = await get_profile(mentor_id)
+    if not mentor_dict:
         raise HTTPException(status_code=404, detail="Mentor profile not found")
+
+    # Profiles are served from the profile cache, so revalidation skips serialization
+    etag = make_etag("mentor", mentor_id, mentor_dict.get("updated_at"))
+    cached = not_modified(request, etag, "mentor")
+    if cached:
+        return cached
+    set_cache_headers(response, etag, "mentor")
     
-    # Convert ObjectId to string and remove _id field
-    mentor_dict = dict(mentor)
+    # Remove _id field
     mentor_dict.pop('_id', None)
     
     return {
@@ -55,22 +99,46 @@ async def update_mentor_profile(mentor_id: str, profile: dict = Body(...)):
     if not mentor_id:
         raise HTTPException(status_code=400, detail="Mentor ID required")
 
-    # Check if mentor exists
-    existing_mentor = await collection.find_one({"userId": mentor_id})
-    if not existing_mentor:
-        raise HTTPException(status_code=404, detail="Mentor profile not found")
+    profile.pop("_id", None)
+    profile["updated_at"] = datetime.now(UTC)
 
-    # Update the profile
+    # Update the profile; matched_count doubles as the existence check
     result = await collection.update_one(
         {"userId": mentor_id},
         {"$set": profile}
     )
 
-    if result.modified_count == 0:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to update profile"
-        )
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Mentor profile not found")
+    await invalidate_profile(mentor_id)
+    await bump_version("userprofile")
+    await suggestions.refresh_profile(mentor_id)
+
+    return {
+        "status": "success",
+        "message": "Profile updated successfully"
+    }
+
+@router.patch("/{mentor_id}")
+async def patch_mentor_profile(
+    mentor_id: str,
+    patch: Union[List[PatchOperation], Dict[str, Any]] = Body(...)
+):
+    """
+    Apply a partial update to a mentor profile, writing only the changed paths.
+    """
+    if not mentor_id:
+        raise HTTPException(status_code=400, detail="Mentor ID required")
+
+    try:
+        await apply_profile_patch(mentor_id, patch)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except LookupError:
+        raise HTTPException(status_code=404, detail="Mentor profile not found")
+    await invalidate_profile(mentor_id)
+    await bump_version("userprofile")
+    await suggestions.refresh_profile(mentor_id)
 
     return {
         "status": "success",
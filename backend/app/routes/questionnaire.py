@@ -1,18 +1,70 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
 from datetime import datetime
 from bson import ObjectId
 from pydantic import BaseModel, EmailStr
 
 from ..database import get_collection
+from ..config import settings
+from ..schemas.registration import RegistrationStatusRequest
 from ..schemas.questionnaire import QuestionnaireCreate, Questionnaire as QuestionnaireSchema, AnswerCreate, Answer as AnswerSchema
-from ..utils.email import email_sender
+from ..utils.projection import model_projection
+from ..utils.responses import BSONJSONResponse
+from ..utils.seats import SeatUnavailable
+from ..utils.counters import answer_upvotes, question_upvotes
+from ..utils.votes import VOTE_TARGETS, toggle_vote, voted_ids
+from ..utils.batch import order_by_ids, parse_ids
+from ..utils.pagination import apply_cursor, paginate
+from ..utils.hot import ANSWER_POINTS, QUESTION_POINTS, hot_update
+from ..utils import live
+from ..utils.similarity import similarity_index
+from ..utils import registration_service
 
 router = APIRouter(
     prefix="/questionnaires",
     tags=["questionnaires"]
 )
 
+QUESTIONNAIRE_FIELDS = model_projection(QuestionnaireSchema)
+ANSWER_FIELDS = model_projection(AnswerSchema)
+TOP_ANSWERS_SORT = {"upvotes": -1, "timestamp": -1, "_id": -1}
+MAX_EMBEDDED_ANSWERS = 10
+
+def _embedded_answers_pipeline(query, projection, sort_criteria, skip, limit, answers_per_question):
+    """
+    One aggregation for a page of questions with each question's top answers.
+    The $lookup runs only for the page, and each inner sort/limit is served by
+    the answers (question_id, upvotes, timestamp, _id) index.
+    """
+    return [
+        {"$match": query},
+        {"$sort": dict(sort_criteria)},
+        {"$skip": skip},
+        {"$limit": limit},
+        {"$project": projection},
+        # answers.question_id holds the question _id as a string
+        {"$addFields": {"question_key": {"$toString": "$_id"}}},
+        {"$lookup": {
+            "from": "answers",
+            "localField": "question_key",
+            "foreignField": "question_id",
+            "pipeline": [
+                {"$sort": TOP_ANSWERS_SORT},
+                {"$limit": answers_per_question},
+                {"$project": ANSWER_FIELDS},
+            ],
+            "as": "top_answers"
+        }},
+        {"$project": {"question_key": 0}},
+    ]
+
+def _page_response(documents, next_cursor):
+    # The body stays a plain list; the cursor for the next page travels in a header
+    response = BSONJSONResponse(documents)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
+
 # Define a schema for the registration request
 class RegistrationRequest(BaseModel):
     email: EmailStr
@@ -24,7 +76,9 @@ async def list_questionnaires(
     limit: int = 10,
     category_id: str = None,
     session_id: str = None,
-    sort_by: str = "timestamp"  # Default sort by timestamp (newest first)
+    sort_by: str = "timestamp",  # Default sort by timestamp (newest first), "upvotes" or "hot"
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page; replaces skip (none for sort_by=hot)"),
+    embed_answers: int = Query(0, ge=0, le=MAX_EMBEDDED_ANSWERS, description="Include each question's top N answers")
 ):
     collection = get_collection("questionnaires")
     query = {}
@@ -37,22 +91,106 @@ async def list_questionnaires(
             raise HTTPException(status_code=400, detail="Invalid session ID")
         query["session_id"] = session_id
     
-    # Determine sort order based on sort_by parameter
-    sort_order = -1  # Default to descending (newest first)
+    # Determine sort order based on sort_by parameter; _id breaks ties so cursors are stable
+    projection = QUESTIONNAIRE_FIELDS
     if sort_by == "upvotes":
-        sort_criteria = [("upvotes", -1), ("timestamp", -1)]  # Sort by upvotes first, then timestamp
+        sort_criteria = [("upvotes", -1), ("timestamp", -1), ("_id", -1)]  # Sort by upvotes first, then timestamp
+    elif sort_by == "hot":
+        # Trending: top-K on the (session_id, hot_score) index. The decay job
+        # rewrites every score, so a cursor's hot_score would be stale by the
+        # next page; hot pages with skip only.
+        if not session_id:
+            raise HTTPException(status_code=400, detail="session_id is required for sort_by=hot")
+        if cursor:
+            raise HTTPException(status_code=400, detail="sort_by=hot does not take a cursor; page with skip")
+        sort_criteria = [("hot_score", -1), ("_id", -1)]
+        projection = {**QUESTIONNAIRE_FIELDS, "hot_score": 1}
     else:  # Default to timestamp
-        sort_criteria = [("timestamp", -1)]
+        sort_criteria = [("timestamp", -1), ("_id", -1)]
     
-    cursor = collection.find(query).sort(sort_criteria).skip(skip).limit(limit)
-    questionnaires = await cursor.to_list(length=limit)
-    # Convert ObjectId to string before returning
-    for q in questionnaires:
-        q["_id"] = str(q["_id"])
-    return questionnaires
+    try:
+        query = apply_cursor(query, sort_criteria, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Fetch one extra document to know whether there is a next page
+    if embed_answers:
+        results = collection.aggregate(
+            _embedded_answers_pipeline(query, projection, sort_criteria, 0 if cursor else skip, limit + 1, embed_answers)
+        )
+    else:
+        results = collection.find(query, projection).sort(sort_criteria).skip(0 if cursor else skip).limit(limit + 1)
+    questionnaires, next_cursor = paginate(await results.to_list(length=limit + 1), sort_criteria, limit)
+    if sort_by == "hot":
+        next_cursor = None
+    # After the cursor is taken, so it holds the stored sort values
+    question_upvotes.overlay_many(questionnaires)
+    if embed_answers:
+        for questionnaire in questionnaires:
+            answer_upvotes.overlay_many(questionnaire["top_answers"])
+    
+    # Projected to the response model fields, so serialize without re-validation
+    return _page_response(questionnaires, next_cursor)
+
+@router.get("/upvoted", response_model=dict)
+async def get_upvoted(
+    user_id: str,
+    ids: str = Query(..., description="Comma-separated question or answer IDs"),
+    target_type: str = Query("question", description="question or answer")
+):
+    """
+    Return which of the given questions (or answers) a user has upvoted,
+    so a whole list can be rendered with one lookup.
+    """
+    if target_type not in VOTE_TARGETS:
+        raise HTTPException(status_code=400, detail=f"target_type must be one of: {', '.join(VOTE_TARGETS)}")
+    try:
+        target_ids = parse_ids(ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    upvoted = await voted_ids(
+        target_type, user_id, [ObjectId(target_id) for target_id in target_ids if ObjectId.is_valid(target_id)]
+    )
+    return {"status": "success", "upvoted": [target_id for target_id in target_ids if target_id in upvoted]}
+
+async def _similar_questions(session_id: str, title: str, content: Optional[str], limit: Optional[int] = None) -> List[dict]:
+    """Existing questions in the session that look like duplicates, most similar first, with current counts."""
+    matches = await similarity_index.similar(session_id, title, content, limit)
+    if not matches:
+        return []
+    scores = dict(matches)
+    cursor = get_collection("questionnaires").find(
+        {"_id": {"$in": [ObjectId(question_id) for question_id in scores]}},
+        {"title": 1, "content": 1, "upvotes": 1, "answers": 1}
+    )
+    questions, _ = order_by_ids([question async for question in cursor], list(scores), "_id")
+    question_upvotes.overlay_many(questions)
+    for question in questions:
+        question["_id"] = str(question["_id"])
+        question["similarity"] = scores[question["_id"]]
+    return questions
+
+@router.get("/similar", response_model=dict)
+async def get_similar_questions(
+    session_id: str,
+    title: str,
+    content: Optional[str] = None,
+    limit: int = Query(settings.SIMILARITY_MAX_CANDIDATES, ge=1, le=20)
+):
+    """
+    Find questions already asked in a session that look like the given one,
+    so an attendee can upvote an existing question instead of repeating it.
+    """
+    if not ObjectId.is_valid(session_id):
+        raise HTTPException(status_code=400, detail="Invalid session ID")
+    return {"status": "success", "similar": await _similar_questions(session_id, title, content, limit)}
 
 @router.post("/", response_model=QuestionnaireSchema)
-async def create_questionnaire(questionnaire: QuestionnaireCreate):
+async def create_questionnaire(
+    questionnaire: QuestionnaireCreate,
+    check_duplicates: bool = Query(False, description="Reject with 409 and the similar questions if any exist")
+):
     collection = get_collection("questionnaires")
     
     questionnaire_dict = questionnaire.dict(exclude={"author"})
@@ -68,6 +206,8 @@ async def create_questionnaire(questionnaire: QuestionnaireCreate):
         "authors": [author],
         "upvotes": 0,
         "answers": 0,
+        "hot_score": QUESTION_POINTS,
+        "hot_updated_at": datetime.utcnow(),
         "timestamp": datetime.utcnow(),
         "created_at": datetime.utcnow(),
         "updated_at": datetime.utcnow()
@@ -83,11 +223,23 @@ async def create_questionnaire(questionnaire: QuestionnaireCreate):
         session = await ama_sessions_collection.find_one({"_id": ObjectId(questionnaire_dict["session_id"])})
         if session is None:
             raise HTTPException(status_code=404, detail="Session not found")
+        
+        if check_duplicates:
+            similar = await _similar_questions(
+                questionnaire_dict["session_id"], questionnaire_dict["title"], questionnaire_dict.get("content")
+            )
+            if similar:
+                raise HTTPException(
+                    status_code=409,
+                    detail={"message": "Similar questions have already been asked", "similar": similar}
+                )
     
     result = await collection.insert_one(questionnaire_dict)
     created_questionnaire = await collection.find_one({"_id": result.inserted_id})
     # Convert ObjectId to string before returning
     created_questionnaire["_id"] = str(created_questionnaire["_id"])
+    similarity_index.add(created_questionnaire)
+    live.question_created(created_questionnaire)
     return created_questionnaire
 
 @router.get("/{questionnaire_id}", response_model=QuestionnaireSchema)
@@ -100,35 +252,38 @@ async def get_questionnaire(questionnaire_id: str):
     questionnaire = await collection.find_one({"_id": ObjectId(questionnaire_id)})
     if questionnaire is None:
         raise HTTPException(status_code=404, detail="Questionnaire not found")
+    question_upvotes.overlay(questionnaire)
     # Convert ObjectId to string before returning
     questionnaire["_id"] = str(questionnaire["_id"])
     return questionnaire
 
 @router.post("/{questionnaire_id}/upvote", response_model=QuestionnaireSchema)
-async def upvote_questionnaire(questionnaire_id: str):
+async def upvote_questionnaire(
+    questionnaire_id: str,
+    user_id: str = Query(..., min_length=1, description="Voter; a repeat upvote withdraws the vote")
+):
     collection = get_collection("questionnaires")
     
     if not ObjectId.is_valid(questionnaire_id):
         raise HTTPException(status_code=400, detail="Invalid questionnaire ID")
     
-    # Find the questionnaire
-    questionnaire = await collection.find_one({"_id": ObjectId(questionnaire_id)})
+    questionnaire = await collection.find_one({"_id": ObjectId(questionnaire_id)}, QUESTIONNAIRE_FIELDS)
     if questionnaire is None:
         raise HTTPException(status_code=404, detail="Questionnaire not found")
     
-    # Increment the upvotes count
-    result = await collection.update_one(
-        {"_id": ObjectId(questionnaire_id)},
-        {"$inc": {"upvotes": 1}, "$set": {"updated_at": datetime.utcnow()}}
-    )
+    # One vote per user: a repeat upvote withdraws the vote instead of counting twice
+    delta = await toggle_vote("question", questionnaire["_id"], user_id)
     
-    if result.modified_count == 0:
-        raise HTTPException(status_code=500, detail="Failed to update questionnaire")
+    # The change is coalesced with others on this question and written behind
+    question_upvotes.overlay(questionnaire)
+    questionnaire["upvotes"] = questionnaire.get("upvotes", 0) + delta
+    if delta:
+        await question_upvotes.add(questionnaire["_id"], delta)
+        live.question_upvotes_changed(questionnaire.get("session_id"), questionnaire_id, questionnaire["upvotes"])
+    questionnaire["upvoted"] = delta > 0
     
-    # Get the updated questionnaire
-    updated_questionnaire = await collection.find_one({"_id": ObjectId(questionnaire_id)})
-    updated_questionnaire["_id"] = str(updated_questionnaire["_id"])
-    return updated_questionnaire
+    # Projected to the response model fields, so serialize without re-validation
+    return BSONJSONResponse(questionnaire)
 
 @router.post("/{questionnaire_id}/answer", response_model=AnswerSchema)
 async def add_answer_to_questionnaire(questionnaire_id: str, answer: AnswerCreate):
@@ -156,14 +311,16 @@ async def add_answer_to_questionnaire(questionnaire_id: str, answer: AnswerCreat
     result = await answers_collection.insert_one(answer_dict)
     
     # Increment the answers count in the questionnaire
+    # and raise its hot score, decayed to now
     await questionnaire_collection.update_one(
         {"_id": ObjectId(questionnaire_id)},
-        {"$inc": {"answers": 1}, "$set": {"updated_at": datetime.utcnow()}}
+        hot_update(ANSWER_POINTS, answers={"$add": [{"$ifNull": ["$answers", 0]}, 1]})
     )
     
     # Get the created answer
     created_answer = await answers_collection.find_one({"_id": result.inserted_id})
     created_answer["_id"] = str(created_answer["_id"])
+    live.answer_added(questionnaire.get("session_id"), created_answer, questionnaire.get("answers", 0) + 1)
     return created_answer
 
 @router.get("/{questionnaire_id}/answers", response_model=List[AnswerSchema])
@@ -171,7 +328,8 @@ async def get_questionnaire_answers(
     questionnaire_id: str,
     skip: int = 0,
     limit: int = 10,
-    sort_by: str = "timestamp"  # Default sort by timestamp (newest first)
+    sort_by: str = "timestamp",  # Default sort by timestamp (newest first)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page; replaces skip")
 ):
     answers_collection = get_collection("answers")
     
@@ -180,18 +338,21 @@ async def get_questionnaire_answers(
     
     # Determine sort order based on sort_by parameter
     if sort_by == "upvotes":
-        sort_criteria = [("upvotes", -1), ("timestamp", -1)]  # Sort by upvotes first, then timestamp
+        sort_criteria = [("upvotes", -1), ("timestamp", -1), ("_id", -1)]  # Sort by upvotes first, then timestamp
     else:  # Default to timestamp
-        sort_criteria = [("timestamp", -1)]
+        sort_criteria = [("timestamp", -1), ("_id", -1)]
     
-    cursor = answers_collection.find({"question_id": questionnaire_id}).sort(sort_criteria).skip(skip).limit(limit)
-    answers = await cursor.to_list(length=limit)
+    try:
+        query = apply_cursor({"question_id": questionnaire_id}, sort_criteria, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    # Convert ObjectId to string before returning
-    for a in answers:
-        a["_id"] = str(a["_id"])
+    results = answers_collection.find(query, ANSWER_FIELDS).sort(sort_criteria).skip(0 if cursor else skip).limit(limit + 1)
+    answers, next_cursor = paginate(await results.to_list(length=limit + 1), sort_criteria, limit)
+    answer_upvotes.overlay_many(answers)
     
-    return answers
+    # Projected to the response model fields, so serialize without re-validation
+    return _page_response(answers, next_cursor)
 
 @router.post("/register", response_model=dict)
 async def register_user(registration: RegistrationRequest):
@@ -203,149 +364,16 @@ async def register_user(registration: RegistrationRequest):
         if not ObjectId.is_valid(registration.session_id):
             raise HTTPException(status_code=400, detail="Invalid session ID")
         
-        ama_sessions_collection = get_collection("ama_sessions")
-        session = await ama_sessions_collection.find_one({"_id": ObjectId(registration.session_id)})
-        if session is None:
-            raise HTTPException(status_code=404, detail="Session not found")
-        
-        # Check if the user is already registered
-        registrations_collection = get_collection("registrations")
-        existing_registration = await registrations_collection.find_one({
-            "email": registration.email,
-            "session_id": registration.session_id
-        })
-        
-        if existing_registration:
-            raise HTTPException(status_code=400, detail="You are already registered for this session")
-        
-        # Check if the session is full
-        if session["registrants"] >= session["maxRegistrants"]:
-            raise HTTPException(status_code=400, detail="Session is full")
-        
-        # Create the registration document
-        registration_dict = {
-            "email": registration.email,
-            "session_id": registration.session_id,
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow()
-        }
-        
-        # Insert the registration
-        await registrations_collection.insert_one(registration_dict)
-        
-        # Increment the registrants count in the session
-        await ama_sessions_collection.update_one(
-            {"_id": ObjectId(registration.session_id)},
-            {"$inc": {"registrants": 1}, "$set": {"updated_at": datetime.utcnow()}}
-        )
-        
-        # Send confirmation email
-        subject = f"Registration Confirmation - {session['title']}"
-        body = f"""
-        <html>
-            <head>
-                <style>
-                    body {{
-                        font-family: 'Arial', sans-serif;
-                        line-height: 1.6;
-                        color: #333333;
-                        margin: 0;
-                        padding: 0;
-                    }}
-                    .email-container {{
-                        max-width: 600px;
-                        margin: 0 auto;
-                        padding: 20px;
-                    }}
-                    .email-header {{
-                        background-color: #000000;
-                        padding: 20px;
-                        text-align: center;
-                    }}
-                    .logo {{
-                        font-size: 24px;
-                        font-weight: bold;
-                        color: #ffffff;
-                        text-decoration: none;
-                    }}
-                    .email-body {{
-                        background-color: #ffffff;
-                        padding: 30px;
-                        border: 1px solid #e0e0e0;
-                        border-top: none;
-                    }}
-                    h2 {{
-                        color: #000000;
-                        font-size: 22px;
-                        margin-top: 0;
-                        margin-bottom: 20px;
-                    }}
-                    p {{
-                        margin-bottom: 16px;
-                        font-size: 16px;
-                    }}
-                    .session-details {{
-                        background-color: #f5f5f5;
-                        border: 1px solid #e0e0e0;
-                        padding: 15px;
-                        border-radius: 4px;
-                        margin: 20px 0;
-                    }}
-                    .email-footer {{
-                        background-color: #f5f5f5;
-                        padding: 20px;
-                        text-align: center;
-                        font-size: 14px;
-                        color: #666666;
-                    }}
-                </style>
-            </head>
-            <body>
-                <div class="email-container">
-                    <div class="email-header">
-                        <span class="logo">MentorHood</span>
-                    </div>
-                    
-                    <div class="email-body">
-                        <h2>You're registered for {session['title']}!</h2>
-                        
-                        <p>Thank you for registering for our upcoming AMA session. We're excited to have you join us!</p>
-                        
-                        <div class="session-details">
-                            <p><strong>Session:</strong> {session['title']}</p>
-                            <p><strong>Date:</strong> {session['date']}</p>
-                            <p><strong>Time:</strong> {session['time']}</p>
-                            <p><strong>Duration:</strong> {session['duration']}</p>
-                            <p><strong>Host:</strong> {session['mentor']['name']}, {session['mentor']['role']}</p>
-                        </div>
-                        
-                        <p>We'll send you a reminder before the session starts. In the meantime, feel free to prepare your questions!</p>
-                        
-                        <p>If you have any questions, feel free to reach out to our support team at <a href="mailto:support@mentorhood.com">support@mentorhood.com</a>.</p>
-                        
-                        <p>Best regards,<br>The MentorHood Team</p>
-                    </div>
-                    
-                    <div class="email-footer">
-                        <p>© 2025 MentorHood. All rights reserved.</p>
-                        <p>123 Mentorship Avenue, Knowledge City, CA 94103</p>
-                    </div>
-                </div>
-            </body>
-        </html>
-        """
-        
-        success = email_sender.send_email(
-            to_email=registration.email,
-            subject=subject,
-            body=body
-        )
-        
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to send confirmation email")
+        # Claim a seat, insert the registration and queue the confirmation email
+        try:
+            await registration_service.register(registration.dict())
+        except SeatUnavailable as e:
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
         
         return {"message": "Registration successful. Confirmation email sent."}
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Registration failed: {str(e)}")
 
@@ -354,20 +382,28 @@ async def check_registration(session_id: str, email: str):
     """
     Check if a user is already registered for a session.
     """
-    registrations_collection = get_collection("registrations")
-    
     if not ObjectId.is_valid(session_id):
         raise HTTPException(status_code=400, detail="Invalid session ID")
     
-    registration = await registrations_collection.find_one({
-        "email": email,
-        "session_id": session_id
-    })
+    return {"is_registered": await registration_service.is_registered(session_id, email)}
+
+@router.post("/check-registration", response_model=dict)
+async def check_registrations(request: RegistrationStatusRequest):
+    """
+    Check a user's registration status for many sessions at once.
+    """
+    if len(request.session_ids) > settings.BATCH_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.BATCH_MAX_IDS} session IDs can be checked at once")
     
-    return {"is_registered": registration is not None}
+    statuses = await registration_service.registration_statuses(request.session_ids, request.email)
+    return {"status": "success", "registrations": statuses}
 
 @router.post("/{question_id}/answers/{answer_id}/upvote", response_model=AnswerSchema)
-async def upvote_answer(question_id: str, answer_id: str):
+async def upvote_answer(
+    question_id: str,
+    answer_id: str,
+    user_id: str = Query(..., min_length=1, description="Voter; a repeat upvote withdraws the vote")
+):
     """Upvote an answer for a specific question"""
     # Validate question_id
     if not ObjectId.is_valid(question_id):
@@ -380,28 +416,24 @@ async def upvote_answer(question_id: str, answer_id: str):
     # Get answers collection
     answers_collection = get_collection("answers")
     
-    # Check if answer exists and belongs to the question
-    answer = await answers_collection.find_one({
-        "_id": ObjectId(answer_id),
-        "question_id": question_id
-    })
-    
-    if not answer:
-        raise HTTPException(status_code=404, detail="Answer not found for this question")
-    
-    # Increment upvotes
-    result = await answers_collection.update_one(
-        {"_id": ObjectId(answer_id)},
-        {"$inc": {"upvotes": 1}, "$set": {"updated_at": datetime.utcnow()}}
+    # Check the answer exists and belongs to the question
+    answer = await answers_collection.find_one(
+        {"_id": ObjectId(answer_id), "question_id": question_id},
+        ANSWER_FIELDS
     )
+    if answer is None:
+        raise HTTPException(status_code=404, detail="Answer not found for this question")
     
-    if result.modified_count == 0:
-        raise HTTPException(status_code=500, detail="Failed to upvote answer")
-    
-    # Get updated answer
-    updated_answer = await answers_collection.find_one({"_id": ObjectId(answer_id)})
+    # One vote per user: a repeat upvote withdraws the vote instead of counting twice
+    delta = await toggle_vote("answer", answer["_id"], user_id)
     
-    # Convert ObjectId to string for JSON serialization
-    updated_answer["_id"] = str(updated_answer["_id"])
+    # The change is coalesced with others on this answer and written behind
+    answer_upvotes.overlay(answer)
+    answer["upvotes"] = answer.get("upvotes", 0) + delta
+    if delta:
+        await answer_upvotes.add(answer["_id"], delta)
+        await live.answer_upvotes_changed(question_id, answer_id, answer["upvotes"])
+    answer["upvoted"] = delta > 0
     
-    return updated_answer
\ No newline at end of file
+    # Projected to the response model fields, so serialize without re-validation
+    return BSONJSONResponse(answer)
@@ -0,0 +1,111 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
+from app.config import settings
+from app.utils.cache_backend import shared_cache
+from app.utils.etag import get_version
+from app.utils.projection import build_projection
+from app.utils.responses import BSONJSONResponse
+from app.utils.search import SEARCH_TARGETS, search
+from app.utils.suggest import SUGGEST_TYPES, suggestions
+
+router = APIRouter(
+    prefix="/search",
+    tags=["search"]
+)
+
+async def _cached_search(target: str, q: Optional[str], filters: dict, skip: int, limit: int, view: str, fields: Optional[str]) -> dict:
+    """
+    Run a search through the shared cache. The key includes the collection's
+    write version, so any profile or session write retires earlier results.
+    """
+    collection = SEARCH_TARGETS[target]["collection"]
+    try:
+        projection = build_projection(collection, view, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    q = " ".join((q or "").split())
+    version = await get_version(collection)
+    cache_key = "search:" + "|".join([
+        target,
+        f"v={version}",
+        f"q={q}",
+        *(f"{field}={','.join(sorted(map(str, values or [])))}" for field, values in sorted(filters.items())),
+        f"skip={skip}",
+        f"limit={limit}",
+        f"view={view}",
+        f"fields={fields or ''}",
+    ])
+    return await shared_cache.get_or_set(
+        cache_key,
+        lambda: search(target, q, filters, skip, limit, projection)
+    )
+
+@router.get("/mentors")
+async def search_mentors(
+    q: Optional[str] = Query(None, description="Free-text query over expertise, skills, tools, topics and bio"),
+    primaryExpertise: Optional[List[str]] = Query(None),
+    skills: Optional[List[str]] = Query(None),
+    tools: Optional[List[str]] = Query(None),
+    disciplines: Optional[List[str]] = Query(None),
+    skip: int = Query(0, ge=0, le=settings.SEARCH_MAX_SKIP),
+    limit: int = Query(settings.SEARCH_PAGE_SIZE, ge=1, le=settings.SEARCH_MAX_PAGE_SIZE),
+    view: str = Query("full", description="Response shape: card or full"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return")
+):
+    """
+    Search mentor profiles, most relevant first, with counts per facet value
+    (expertise, skills, tools, disciplines) over the matching mentors.
+    Several values for one filter match any of them.
+    """
+    filters = {
+        "primaryExpertise": primaryExpertise,
+        "skills": skills,
+        "tools": tools,
+        "disciplines": disciplines,
+    }
+    result = await _cached_search("mentors", q, filters, skip, limit, view, fields)
+    return BSONJSONResponse({"status": "success", **result})
+
+@router.get("/sessions")
+async def search_sessions(
+    q: Optional[str] = Query(None, description="Free-text query over session name, topics and description"),
+    sessionType: Optional[List[str]] = Query(None),
+    topics: Optional[List[str]] = Query(None),
+    isPaid: Optional[bool] = None,
+    skip: int = Query(0, ge=0, le=settings.SEARCH_MAX_SKIP),
+    limit: int = Query(settings.SEARCH_PAGE_SIZE, ge=1, le=settings.SEARCH_MAX_PAGE_SIZE),
+    view: str = Query("full", description="Response shape: card or full"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return")
+):
+    """
+    Search sessions, most relevant first, with counts per session type,
+    topic and paid/free over the matching sessions.
+    """
+    filters = {
+        "sessionType": sessionType,
+        "topics": topics,
+        "isPaid": None if isPaid is None else [isPaid],
+    }
+    result = await _cached_search("sessions", q, filters, skip, limit, view, fields)
+    return BSONJSONResponse({"status": "success", **result})
+
+@router.get("/suggest")
+async def suggest(
+    q: str = Query(..., min_length=1, description="What the user has typed so far"),
+    types: Optional[str] = Query(None, description="Comma-separated: mentor, skill, tool, topic"),
+    limit: int = Query(10, ge=1, le=settings.SUGGEST_MAX_RESULTS)
+):
+    """
+    Typeahead suggestions: mentor names, skills, tools and session topics
+    with a word starting with q, most popular first. Served from memory.
+    """
+    requested = [type_.strip() for type_ in (types or "").split(",") if type_.strip()] or list(SUGGEST_TYPES)
+    unknown = [type_ for type_ in requested if type_ not in SUGGEST_TYPES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown suggestion types: {', '.join(unknown)}")
+
+    return BSONJSONResponse({
+        "status": "success",
+        "suggestions": await suggestions.suggest(q, limit, requested)
+    })
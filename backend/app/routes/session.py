@@ -1,8 +1,19 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, status, Query, Request, Response
 from datetime import datetime, UTC
-from typing import List
+from typing import List, Optional
+from pymongo import DESCENDING
 from app.schemas.session import Session, SessionCreate
+from app.config import settings
 from app.database import get_collection
+from app.utils.profile_cache import get_profiles
+from app.utils.cache_backend import shared_cache
+from app.utils.pagination import apply_cursor, decode_cursor, paginate
+from app.utils.projection import apply_projection, build_projection
+from app.utils.etag import bump_version, make_etag, not_modified, set_cache_headers
+from app.utils.singleflight import request_key, singleflight
+from app.utils.responses import BSONJSONResponse, dumps
+from app.utils.batch import order_by_ids, parse_ids
+from app.utils.suggest import suggestions
 import uuid
 
 router = APIRouter(
@@ -36,6 +47,9 @@ async def create_session(session: SessionCreate):
     })
     
     result = await collection.insert_one(session_dict)
+    await shared_cache.delete_tag("sessions")
+    await bump_version("sessions")
+    await suggestions.refresh_session(session_dict["sessionId"])
     return {
         "status": "success",
         "sessionId": session_dict["sessionId"]
@@ -77,6 +91,9 @@ async def update_session(session_id: str, session: SessionCreate):
     
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="No data updated")
+    await shared_cache.delete_tag("sessions")
+    await bump_version("sessions")
+    await suggestions.refresh_session(session_id)
     
     return {
         "status": "success",
@@ -93,21 +110,58 @@ async def delete_session(session_id: str):
     
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Session not found")
+    await shared_cache.delete_tag("sessions")
+    await bump_version("sessions")
+    await suggestions.refresh_session(session_id)
     
     return {
         "status": "success",
     }
 
+@router.get("/batch")
+async def get_sessions_batch(
+    ids: str = Query(..., description="Comma-separated session IDs"),
+    view: str = Query("full", description="Response shape: card or full"),
+    fields: str = Query(None, description="Comma-separated fields to return")
+):
+    collection = get_collection("sessions")
+    
+    try:
+        session_ids = parse_ids(ids)
+        projection = build_projection("sessions", view, fields, required=("sessionId",))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    documents = await collection.find(
+        {"sessionId": {"$in": session_ids}}, projection or {"_id": 0}
+    ).to_list(length=None)
+    sessions, missing = order_by_ids(documents, session_ids, "sessionId")
+    
+    return BSONJSONResponse({
+        "status": "success",
+        "sessions": sessions,
+        "missing": missing
+    })
+
 @router.get("/{session_id}")
-async def get_session(session_id: str):
+async def get_session(session_id: str, request: Request, response: Response):
     collection = get_collection("sessions")
     
     if not session_id:
         raise HTTPException(status_code=400, detail="Session ID required")
+
+    # Revalidation only needs updated_at, not the whole document
+    if request.headers.get("if-none-match"):
+        stamp = await collection.find_one({"sessionId": session_id}, {"updated_at": 1})
+        if stamp is not None:
+            cached = not_modified(request, make_etag("session", session_id, stamp.get("updated_at")), "session")
+            if cached:
+                return cached
     
     session = await collection.find_one({"sessionId": session_id})
     if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
+    set_cache_headers(response, make_etag("session", session_id, session.get("updated_at")), "session")
     
     # Convert ObjectId to string and remove _id field
     session_dict = dict(session)
@@ -119,65 +173,162 @@ async def get_session(session_id: str):
     }
 
 @router.get("/mentor/{mentor_id}")
-async def get_mentor_sessions(mentor_id: str):
+async def get_mentor_sessions(
+    mentor_id: str,
+    view: str = Query("full", description="Response shape: card or full"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return")
+):
     collection = get_collection("sessions")
+
+    try:
+        projection = build_projection("sessions", view, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    sessions = await collection.find({"userId": mentor_id}).to_list(length=None)
-    
-    # Convert ObjectId to string and remove _id field for each session
+    sessions = await collection.find({"userId": mentor_id}, projection or {"_id": 0}).to_list(length=None)
+
+    return BSONJSONResponse({
+        "status": "success",
+        "userId": mentor_id,
+        "sessions": sessions
+    })
+
+CATALOG_SORT = [("_id", DESCENDING)]
+
+def _catalog_query(
+    session_type: str,
+    topics: Optional[List[str]],
+    min_price: Optional[float],
+    max_price: Optional[float],
+    is_paid: Optional[bool],
+    mentor_id: Optional[str]
+) -> dict:
+    query = {"sessionType": session_type}
+    if topics:
+        query["topics"] = {"$in": topics}
+    if is_paid is not None:
+        query["isPaid"] = is_paid
+    if mentor_id:
+        query["userId"] = mentor_id
+    # price is stored as a string; tokens holds its numeric value
+    if min_price is not None or max_price is not None:
+        query["tokens"] = {}
+        if min_price is not None:
+            query["tokens"]["$gte"] = min_price * TOKEN_CONVERSION_RATE
+        if max_price is not None:
+            query["tokens"]["$lte"] = max_price * TOKEN_CONVERSION_RATE
+    return query
+
+async def _load_catalog(
+    query: dict,
+    cursor: Optional[str],
+    limit: int,
+    session_projection: Optional[dict],
+    mentor_projection: Optional[dict]
+) -> dict:
+    sessions_collection = get_collection("sessions")
+
+    sessions = await sessions_collection.find(
+        apply_cursor(query, CATALOG_SORT, cursor),
+        session_projection
+    ).sort(CATALOG_SORT).limit(limit + 1).to_list(length=limit + 1)
+    sessions, next_cursor = paginate(sessions, CATALOG_SORT, limit)
+
+    # Only the mentors of the sessions on this page
+    mentor_ids = list(set(session["userId"] for session in sessions))
+    mentors = await get_profiles(mentor_ids) if mentor_ids else []
+
+    # Convert ObjectId to string and remove _id field for each session and mentor
     sessions_list = []
     for session in sessions:
         session_dict = dict(session)
         session_dict.pop('_id', None)
         sessions_list.append(session_dict)
 
+    # Profiles come from the profile cache as full documents; trim them to the view here
+    mentors_list = []
+    for mentor in mentors:
+        mentor_dict = apply_projection(mentor, mentor_projection)
+        mentor_dict.pop('_id', None)
+        mentors_list.append(mentor_dict)
+
     return {
         "status": "success",
-        "userId": mentor_id,
-        "sessions": sessions_list
+        "sessions": sessions_list,
+        "mentors": mentors_list,
+        "next_cursor": next_cursor
     }
 
+def _catalog_tags(catalog: dict) -> List[str]:
+    # Catalog responses embed mentor profiles, so profile writes must evict them too
+    return ["sessions"] + [f"mentor:{mentor['userId']}" for mentor in catalog["mentors"] if "userId" in mentor]
+
+async def get_catalog(
+    session_type: str,
+    cursor: Optional[str] = None,
+    limit: int = settings.CATALOG_PAGE_SIZE,
+    topics: Optional[List[str]] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    is_paid: Optional[bool] = None,
+    mentor_id: Optional[str] = None,
+    view: str = "full",
+    fields: Optional[str] = None
+) -> dict:
+    """
+    Return one page of the session catalog with the mentors of that page.
+    view applies to both sessions and mentors, fields to sessions only.
+    Raises ValueError for a malformed cursor, view or field list.
+    """
+    if cursor:
+        decode_cursor(cursor, CATALOG_SORT)
+    # The sort key and the mentor join key are always fetched
+    session_projection = build_projection("sessions", view, fields, required=("_id", "userId"))
+    mentor_projection = build_projection("userprofile", view, required=("userId",))
+
+    query = _catalog_query(session_type, topics, min_price, max_price, is_paid, mentor_id)
+    cache_key = "catalog:" + "|".join([
+        session_type,
+        f"cursor={cursor or ''}",
+        f"limit={limit}",
+        f"topics={','.join(sorted(topics or []))}",
+        f"min_price={min_price}",
+        f"max_price={max_price}",
+        f"is_paid={is_paid}",
+        f"mentor={mentor_id or ''}",
+        f"view={view}",
+        f"fields={fields or ''}",
+    ])
+    return await shared_cache.get_or_set(
+        cache_key,
+        lambda: _load_catalog(query, cursor, limit, session_projection, mentor_projection),
+        tags=_catalog_tags
+    )
+
+async def _render_catalog(*args) -> bytes:
+    return dumps(await get_catalog(*args))
+
 @router.get("/one-on-one/all")
-async def get_all_one_on_one_sessions():
-    sessions_collection = get_collection("sessions")
-    mentor_collection = get_collection("userprofile")
-    
+async def get_all_one_on_one_sessions(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.CATALOG_PAGE_SIZE, ge=1, le=settings.CATALOG_MAX_PAGE_SIZE),
+    topics: Optional[List[str]] = Query(None),
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    isPaid: Optional[bool] = None,
+    mentor_id: Optional[str] = None,
+    view: str = Query("full", description="Response shape: card or full"),
+    fields: Optional[str] = Query(None, description="Comma-separated session fields to return")
+):
     try:
-        # Get all one-on-one sessions
-        sessions = await sessions_collection.find({"sessionType": "one-on-one"}).to_list(length=None)
-        
-        if not sessions:
-            return {
-                "status": "success",
-                "sessions": [],
-                "mentors": []
-            }
-        
-        # Get unique mentor IDs from sessions
-        mentor_ids = list(set(session["userId"] for session in sessions))
-        
-        # Get mentor profiles
-        mentors = await mentor_collection.find({"userId": {"$in": mentor_ids}}).to_list(length=None)
-        
-        # Convert ObjectId to string and remove _id field for each session and mentor
-        sessions_list = []
-        for session in sessions:
-            session_dict = dict(session)
-            session_dict.pop('_id', None)
-            sessions_list.append(session_dict)
-        
-        mentors_list = []
-        for mentor in mentors:
-            mentor_dict = dict(mentor)
-            mentor_dict.pop('_id', None)
-            mentors_list.append(mentor_dict)
-        
-        return {
-            "status": "success",
-            "sessions": sessions_list,
-            "mentors": mentors_list
-        }
-        
+        # Identical concurrent requests share one catalog load and one serialized body
+        body = await singleflight.do(request_key(request), lambda: _render_catalog(
+            "one-on-one", cursor, limit, topics, min_price, max_price, isPaid, mentor_id, view, fields
+        ))
+        return Response(content=body, media_type="application/json")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -185,46 +336,25 @@ async def get_all_one_on_one_sessions():
         )
 
 @router.get("/group-session/all")
-async def get_all_group_discussion_sessions():
-    sessions_collection = get_collection("sessions")
-    mentor_collection = get_collection("userprofile")
-    
+async def get_all_group_discussion_sessions(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.CATALOG_PAGE_SIZE, ge=1, le=settings.CATALOG_MAX_PAGE_SIZE),
+    topics: Optional[List[str]] = Query(None),
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    isPaid: Optional[bool] = None,
+    mentor_id: Optional[str] = None,
+    view: str = Query("full", description="Response shape: card or full"),
+    fields: Optional[str] = Query(None, description="Comma-separated session fields to return")
+):
     try:
-        # Get all group discussion sessions
-        sessions = await sessions_collection.find({"sessionType": "group-session"}).to_list(length=None)
-        
-        if not sessions:
-            return {
-                "status": "success",
-                "sessions": [],
-                "mentors": []
-            }
-        
-        # Get unique mentor IDs from sessions
-        mentor_ids = list(set(session["userId"] for session in sessions))
-        
-        # Get mentor profiles
-        mentors = await mentor_collection.find({"userId": {"$in": mentor_ids}}).to_list(length=None)
-        
-        # Convert ObjectId to string and remove _id field for each session and mentor
-        sessions_list = []
-        for session in sessions:
-            session_dict = dict(session)
-            session_dict.pop('_id', None)
-            sessions_list.append(session_dict)
-        
-        mentors_list = []
-        for mentor in mentors:
-            mentor_dict = dict(mentor)
-            mentor_dict.pop('_id', None)
-            mentors_list.append(mentor_dict)
-        
-        return {
-            "status": "success",
-            "sessions": sessions_list,
-            "mentors": mentors_list
-        }
-        
+        body = await singleflight.do(request_key(request), lambda: _render_catalog(
+            "group-session", cursor, limit, topics, min_price, max_price, isPaid, mentor_id, view, fields
+        ))
+        return Response(content=body, media_type="application/json")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,9 +1,14 @@
 from fastapi import APIRouter, HTTPException, status, Body
 from datetime import datetime, UTC, timedelta
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
 from passlib.context import CryptContext
 from pydantic import BaseModel
 from app.models.user import User, UserModel
+from app.schemas.mentor import PatchOperation
+from app.utils.profile_patch import apply_profile_patch
+from app.utils.profile_cache import get_profile, invalidate_profile
+from app.utils.etag import bump_version
+from app.utils.suggest import suggestions
 from app.database import get_user, create_user, update_user, delete_user, user_collection, user_profile_collection, get_collection
 from bson import ObjectId  
 import uuid
@@ -163,6 +168,8 @@ async def register(user: UserCreate):
         collection = get_collection("userprofile")
         
         insert_result = await collection.insert_one(profile_dict)
+        await bump_version("userprofile")
+        await suggestions.refresh_profile(profile_dict["userId"])
 
         if not insert_result.inserted_id:
             raise HTTPException(
@@ -310,7 +317,12 @@ async def create_mentor_profile(profile: MentorProfile):
 
         # Insert the profile
         result = await user_profile_collection.insert_one(profile_dict)
-        
+        await bump_version("userprofile")
+        # Cached profiles and suggestions are keyed by the user's userId, not the ObjectId
+        if user.get("userId"):
+            await invalidate_profile(user["userId"])
+            await suggestions.refresh_profile(user["userId"])
+
         if result.inserted_id:
             # Update user role to mentor using ObjectId
             await user_collection.update_one(
@@ -344,13 +356,11 @@ async def create_mentor_profile(profile: MentorProfile):
 @router.post("/profile")
 async def get_user_profile(userId: str):
     try:
-        collection = get_collection("userprofile")
-
         if not userId:
             raise HTTPException(status_code=400, detail="User ID required")
 
         # Check if user profile exists
-        result = await collection.find_one({"userId": userId})
+        result = await get_profile(userId)
         if not result:
             raise HTTPException(status_code=404, detail="User profile not found")
 
@@ -376,11 +386,6 @@ async def update_user_profile(userId: str, profile: dict = Body(...)):
         if not userId:
             raise HTTPException(status_code=400, detail="User ID required")
 
-        # Check if user profile exists
-        existing_user = await collection.find_one({"userId": userId})
-        if not existing_user:
-            raise HTTPException(status_code=404, detail="User profile not found")
-
         # Remove _id if present in the profile payload (can't be updated)
         if "_id" in profile:
             del profile["_id"]
@@ -388,11 +393,16 @@ async def update_user_profile(userId: str, profile: dict = Body(...)):
         # Add timestamp for update
         profile["updated_at"] = datetime.now(UTC)
 
-        # Update the profile
+        # Update the profile; matched_count doubles as the existence check
         result = await collection.update_one(
             {"userId": userId},
             {"$set": profile}
         )
+        if result.matched_count == 0:
+            raise HTTPException(status_code=404, detail="User profile not found")
+        await invalidate_profile(userId)
+        await bump_version("userprofile")
+        await suggestions.refresh_profile(userId)
 
         # Successful even if no changes were made (modified_count could be 0)
         return {
@@ -405,4 +415,32 @@ async def update_user_profile(userId: str, profile: dict = Body(...)):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update profile: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@router.patch("/profile")
+async def patch_user_profile(
+    userId: str,
+    patch: Union[List[PatchOperation], Dict[str, Any]] = Body(...)
+):
+    """
+    Apply a partial update to a user profile.
+    Accepts a JSON Patch document or a mapping of dotted paths to values,
+    and writes only the changed paths in a single update.
+    """
+    if not userId:
+        raise HTTPException(status_code=400, detail="User ID required")
+
+    try:
+        await apply_profile_patch(userId, patch)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except LookupError:
+        raise HTTPException(status_code=404, detail="User profile not found")
+    await invalidate_profile(userId)
+    await bump_version("userprofile")
+    await suggestions.refresh_profile(userId)
+
+    return {
+        "status": "success",
+        "message": "Profile updated successfully"
+    }
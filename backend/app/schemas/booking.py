@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, EmailStr
-from typing import Optional, Any
+from typing import Optional, Any, List
 from datetime import datetime
 from bson import ObjectId
 
@@ -37,4 +37,9 @@ class Booking(BookingBase):
     class Config:
         json_encoders = {ObjectId: str}
         populate_by_name = True
-        arbitrary_types_allowed = True 
\ No newline at end of file
+        arbitrary_types_allowed = True 
+
+
+class BookingStatusRequest(BaseModel):
+    email: EmailStr
+    session_ids: List[str]
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, List, Optional
 from pydantic import BaseModel, Field
 from bson import ObjectId
 
@@ -75,4 +75,61 @@ class MentorProfile(BaseModel):
     reviews: List[Review]
     testimonials: List[Testimonial]
     createdAt: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
-    updatedAt: str = Field(default_factory=lambda: datetime.utcnow().isoformat()) 
\ No newline at end of file
+    updatedAt: str = Field(default_factory=lambda: datetime.utcnow().isoformat()) 
+
+class ProfileExperience(BaseModel):
+    title: Optional[str] = None
+    company: Optional[str] = None
+    duration: Optional[str] = None
+    description: Optional[str] = None
+
+class ProfileProject(BaseModel):
+    title: Optional[str] = None
+    description: Optional[str] = None
+
+class ProfileResource(BaseModel):
+    title: Optional[str] = None
+    description: Optional[str] = None
+    linkText: Optional[str] = None
+
+class ProfileAchievement(BaseModel):
+    title: Optional[str] = None
+    description: Optional[str] = None
+    date: Optional[str] = None
+
+class ProfileStats(BaseModel):
+    sessionsCompleted: Optional[int] = None
+    totalHours: Optional[float] = None
+
+class TotalExperience(BaseModel):
+    years: Optional[int] = None
+    months: Optional[int] = None
+
+class UserProfileDocument(BaseModel):
+    """Editable fields of a ``userprofile`` document, used to validate partial updates."""
+    name: Optional[str] = None
+    profilePhoto: Optional[str] = None
+    headline: Optional[str] = None
+    experience: Optional[List[ProfileExperience]] = None
+    projects: Optional[List[ProfileProject]] = None
+    resources: Optional[List[ProfileResource]] = None
+    stats: Optional[ProfileStats] = None
+    achievements: Optional[List[ProfileAchievement]] = None
+    totalExperience: Optional[TotalExperience] = None
+    linkedinUrl: Optional[str] = None
+    githubUrl: Optional[str] = None
+    primaryExpertise: Optional[str] = None
+    disciplines: Optional[List[str]] = None
+    tools: Optional[List[str]] = None
+    skills: Optional[List[str]] = None
+    bio: Optional[str] = None
+    targetMentees: Optional[List[str]] = None
+    mentoringTopics: Optional[List[str]] = None
+    relationshipType: Optional[str] = None
+    aiTools: Optional[List[str]] = None
+
+class PatchOperation(BaseModel):
+    """A single RFC 6902 JSON Patch operation."""
+    op: str
+    path: str
+    value: Optional[Any] = None
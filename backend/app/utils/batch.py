@@ -0,0 +1,32 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.config import settings
+
+
+def parse_ids(ids: Optional[str]) -> List[str]:
+    """
+    Split a comma-separated ids= parameter, dropping blanks and repeats while
+    keeping the requested order. Raises ValueError when it is empty or has
+    more than BATCH_MAX_IDS ids.
+    """
+    parsed = list(dict.fromkeys(id_.strip() for id_ in (ids or "").split(",") if id_.strip()))
+    if not parsed:
+        raise ValueError("At least one ID is required")
+    if len(parsed) > settings.BATCH_MAX_IDS:
+        raise ValueError(f"At most {settings.BATCH_MAX_IDS} IDs can be requested at once")
+    return parsed
+
+
+def order_by_ids(
+    documents: Iterable[Dict[str, Any]],
+    ids: List[str],
+    key: str
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Arrange documents fetched with an $in query in the order of ids.
+    Returns (documents, ids with no matching document).
+    """
+    by_id = {str(document[key]): document for document in documents}
+    found = [by_id[id_] for id_ in ids if id_ in by_id]
+    missing = [id_ for id_ in ids if id_ not in by_id]
+    return found, missing
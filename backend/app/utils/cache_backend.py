@@ -0,0 +1,312 @@
+import asyncio
+import logging
+import time
+import zlib
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+
+import bson
+
+from app.config import settings
+from app.utils.cache import LRUCache
+from app.utils.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Serialized values start with one format byte so the encoding can evolve
+_FORMAT_BSON = b"\x01"
+_FORMAT_BSON_ZLIB = b"\x02"
+_COMPRESS_THRESHOLD = 1024
+
+_MISSING = object()
+
+
+def serialize(value: Any) -> bytes:
+    """Encode a cache value as BSON, which keeps ObjectId and datetime values intact."""
+    payload = bson.encode({"v": value})
+    if len(payload) >= _COMPRESS_THRESHOLD:
+        return _FORMAT_BSON_ZLIB + zlib.compress(payload, 1)
+    return _FORMAT_BSON + payload
+
+
+def deserialize(data: bytes) -> Any:
+    marker, payload = data[:1], data[1:]
+    if marker == _FORMAT_BSON_ZLIB:
+        payload = zlib.decompress(payload)
+    elif marker != _FORMAT_BSON:
+        raise ValueError("Unknown cache value format")
+    return bson.decode(payload)["v"]
+
+
+class MemoryCacheBackend:
+    """Process-local backend, used when no shared cache is configured."""
+
+    is_shared = False
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024):
+        self._values = LRUCache(max_entries=max_entries, max_bytes=max_bytes, on_remove=self._forget)
+        # Both directions, so a key leaving the cache for any reason leaves its tags too
+        self._tags: Dict[str, set] = {}
+        self._key_tags: Dict[str, set] = {}
+
+    def _forget(self, key: str) -> None:
+        for tag in self._key_tags.pop(key, ()):
+            members = self._tags.get(tag)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del self._tags[tag]
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._values.get(key)
+
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        return [self._values.get(key) for key in keys]
+
+    async def set(self, key: str, value: bytes, ttl: float, tags: Iterable[str] = ()) -> None:
+        self._values.set(key, value, ttl=ttl)
+        if key not in self._values:
+            # Too large to store, so nothing to tag
+            return
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+            self._key_tags.setdefault(key, set()).add(tag)
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        if key in self._values:
+            return False
+        self._values.set(key, value, ttl=ttl)
+        return True
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._values.delete(key)
+
+    async def delete_tag(self, tag: str) -> None:
+        await self.delete(*self._tags.pop(tag, ()))
+
+    async def close(self) -> None:
+        self._values.clear()
+        self._tags.clear()
+        self._key_tags.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"type": "memory", "tags": len(self._tags), **self._values.stats()}
+
+
+class RedisCacheBackend:
+    """
+    Backend over any redis.asyncio-compatible client, e.g. a real Redis server
+    or fakeredis.aioredis.FakeRedis in tests. Tags are Redis sorted sets of
+    keys scored by expiry time; each write to a tag trims members that have
+    expired, so a tag only holds keys that may still exist.
+    """
+
+    is_shared = True
+
+    def __init__(self, client):
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisCacheBackend":
+        if url.startswith("fakeredis://"):
+            import fakeredis.aioredis
+            return cls(fakeredis.aioredis.FakeRedis())
+
+        import redis.asyncio as redis
+        return cls(redis.from_url(url))
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(key)
+
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        return await self.client.mget(keys)
+
+    async def set(self, key: str, value: bytes, ttl: float, tags: Iterable[str] = ()) -> None:
+        ttl_ms = max(int(ttl * 1000), 1)
+        now_ms = int(time.time() * 1000)
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.set(key, value, px=ttl_ms)
+            for tag in tags:
+                tag_key = f"tags:{tag}"
+                pipe.zremrangebyscore(tag_key, "-inf", now_ms)
+                pipe.zadd(tag_key, {key: now_ms + ttl_ms})
+                # A tag set only has to outlive its longest-lived member
+                pipe.pexpire(tag_key, ttl_ms, gt=True)
+                pipe.pexpire(tag_key, ttl_ms, nx=True)
+            await pipe.execute()
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        return bool(await self.client.set(key, value, px=max(int(ttl * 1000), 1), nx=True))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*keys)
+
+    async def delete_tag(self, tag: str) -> None:
+        tag_key = f"tags:{tag}"
+        keys = await self.client.zrange(tag_key, 0, -1)
+        await self.client.delete(tag_key, *keys)
+
+    async def close(self) -> None:
+        await self.client.aclose() if hasattr(self.client, "aclose") else await self.client.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"type": "redis"}
+
+
+class SharedCache:
+    """
+    Namespaced cache over a pluggable backend with serialization, tag-based
+    invalidation and stampede protection for expensive loaders.
+    """
+
+    def __init__(self, backend, namespace: str = "mentorhood", default_ttl: float = 60, lock_timeout: float = 5):
+        self.backend = backend
+        self.namespace = namespace
+        self.default_ttl = default_ttl
+        self.lock_timeout = lock_timeout
+        self._singleflight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.errors = 0
+
+    @property
+    def is_shared(self) -> bool:
+        return self.backend.is_shared
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        try:
+            data = await self.backend.get(self._key(key))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache get failed for {key}: {str(e)}")
+            return default
+        if data is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return deserialize(data)
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Return the cached values for keys in one backend round trip, skipping misses."""
+        keys = list(keys)
+        if not keys:
+            return {}
+        try:
+            values = await self.backend.get_many([self._key(key) for key in keys])
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache get_many failed: {str(e)}")
+            return {}
+        found = {}
+        for key, data in zip(keys, values):
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                found[key] = deserialize(data)
+        return found
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None, tags: Iterable[str] = ()) -> None:
+        try:
+            await self.backend.set(
+                self._key(key),
+                serialize(value),
+                ttl=self.default_ttl if ttl is None else ttl,
+                tags=[self._key(tag) for tag in tags]
+            )
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache set failed for {key}: {str(e)}")
+
+    async def delete(self, *keys: str) -> None:
+        try:
+            await self.backend.delete(*(self._key(key) for key in keys))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache delete failed for {keys}: {str(e)}")
+
+    async def delete_tag(self, *tags: str) -> None:
+        for tag in tags:
+            try:
+                await self.backend.delete_tag(self._key(tag))
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Cache tag invalidation failed for {tag}: {str(e)}")
+
+    async def get_or_set(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+        tags: Union[Iterable[str], Callable[[Any], Iterable[str]]] = ()
+    ) -> Any:
+        """
+        Return the cached value for key, calling loader on a miss. tags may be a
+        callable that derives the tags from the loaded value.
+
+        Concurrent misses for the same key are collapsed: within a process onto
+        one in-flight load, and across workers by a short-lived lock key in the
+        backend whose holder loads while the others wait for the value to appear.
+        """
+        value = await self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        return await self._singleflight.do(key, lambda: self._load(key, loader, ttl, tags))
+
+    async def _load(self, key: str, loader, ttl: Optional[float], tags: Iterable[str]) -> Any:
+        lock_key = self._key(f"lock:{key}")
+        try:
+            acquired = await self.backend.add(lock_key, b"1", ttl=self.lock_timeout)
+        except Exception:
+            acquired = True
+
+        if not acquired:
+            deadline = time.monotonic() + self.lock_timeout
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+                value = await self.get(key, _MISSING)
+                if value is not _MISSING:
+                    return value
+
+        try:
+            self.loads += 1
+            value = await loader()
+            await self.set(key, value, ttl=ttl, tags=tags(value) if callable(tags) else tags)
+            return value
+        finally:
+            if acquired:
+                try:
+                    await self.backend.delete(lock_key)
+                except Exception:
+                    pass
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "loads": self.loads,
+            "errors": self.errors,
+            "backend": self.backend.stats()
+        }
+
+
+def create_backend(url: Optional[str]):
+    if not url or url.startswith("memory://"):
+        return MemoryCacheBackend()
+    return RedisCacheBackend.from_url(url)
+
+
+shared_cache = SharedCache(
+    create_backend(settings.REDIS_URL),
+    namespace=settings.CACHE_NAMESPACE,
+    default_ttl=settings.CACHE_DEFAULT_TTL_SECONDS
+)
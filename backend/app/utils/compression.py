@@ -0,0 +1,216 @@
+import gzip
+import hashlib
+import time
+import zlib
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.utils.cache import LRUCache
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+DEFAULT_POLICY = {"gzip": 6, "br": 4, "cache": False}
+
+# Longest matching path prefix wins
+ROUTE_POLICIES = {
+    # Hot, repetitive catalog payloads: compress harder and keep the result
+    "/sessions/one-on-one/all": {"gzip": 9, "br": 9, "cache": True},
+    "/sessions/group-session/all": {"gzip": 9, "br": 9, "cache": True},
+    "/mentors/all": {"gzip": 9, "br": 9, "cache": True},
+    "/ama-sessions": {"gzip": 9, "br": 9, "cache": True},
+    # Large streaming exports: favour throughput
+    "/registrations/session/": {"gzip": 1, "br": 1, "cache": False},
+    "/bookings/export": {"gzip": 1, "br": 1, "cache": False},
+}
+
+# Content types that are already compressed or must not be buffered
+SKIP_CONTENT_TYPES = ("image/", "video/", "audio/", "application/zip", "application/gzip", "text/event-stream")
+
+compression_stats = {
+    "responses": 0,
+    "compressed": 0,
+    "bytes_in": 0,
+    "bytes_out": 0,
+    "cache_hits": 0,
+    "compress_seconds": 0.0,
+}
+
+# Compressed copies of cacheable bodies, keyed by body digest, encoding and level
+precompressed_cache = LRUCache(max_entries=512, max_bytes=32 * 1024 * 1024, ttl=600)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick br or gzip from an Accept-Encoding header, honouring q=0."""
+    offered = {}
+    for item in accept_encoding.split(","):
+        parts = item.strip().split(";")
+        name = parts[0].strip().lower()
+        quality = 1.0
+        for param in parts[1:]:
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        offered[name] = quality
+
+    candidates = []
+    if brotli is not None:
+        candidates.append("br")
+    candidates.append("gzip")
+    for encoding in candidates:
+        if offered.get(encoding, offered.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def policy_for(path: str) -> Dict:
+    match = ""
+    for prefix in ROUTE_POLICIES:
+        if path.startswith(prefix) and len(prefix) > len(match):
+            match = prefix
+    return ROUTE_POLICIES[match] if match else DEFAULT_POLICY
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+class _StreamCompressor:
+    def __init__(self, encoding: str, level: int):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=level)
+            self._compress = self._compressor.process
+            self._flush = self._compressor.flush
+            self._finish = self._compressor.finish
+        else:
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+            self._compress = self._compressor.compress
+            self._flush = lambda: self._compressor.flush(zlib.Z_SYNC_FLUSH)
+            self._finish = self._compressor.flush
+
+    def chunk(self, data: bytes, more_body: bool) -> bytes:
+        # Flush each chunk so streamed rows reach the client without waiting for the end
+        output = self._compress(data)
+        return output + (self._flush() if more_body else self._finish())
+
+
+class CompressionMiddleware:
+    """
+    Negotiates brotli or gzip for responses of at least minimum_size bytes,
+    with levels chosen per route. Bodies of cacheable routes keep their
+    compressed copy, so a hot payload is compressed once rather than on every hit.
+    Streaming responses are compressed chunk by chunk.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(send, encoding, policy_for(scope["path"]), self.minimum_size)
+        await self.app(scope, receive, responder)
+
+
+class _CompressionResponder:
+    def __init__(self, send, encoding: str, policy: Dict, minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.level = policy[encoding]
+        self.cacheable = policy["cache"]
+        self.minimum_size = minimum_size
+        self.start_message = None
+        self.passthrough = False
+        self.stream: Optional[_StreamCompressor] = None
+
+    async def __call__(self, message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                message["status"] in (204, 304)
+                or "content-encoding" in headers
+                or content_type.startswith(SKIP_CONTENT_TYPES)
+            )
+            if self.passthrough:
+                await self.send(message)
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.stream is None and not more_body:
+            await self._send_whole(body)
+            return
+
+        if self.stream is None:
+            self.stream = _StreamCompressor(self.encoding, self.level)
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            del headers["Content-Length"]
+            await self.send(self.start_message)
+
+        compression_stats["bytes_in"] += len(body)
+        started = time.perf_counter()
+        data = self.stream.chunk(body, more_body)
+        compression_stats["compress_seconds"] += time.perf_counter() - started
+        compression_stats["bytes_out"] += len(data)
+        if not more_body:
+            compression_stats["responses"] += 1
+            compression_stats["compressed"] += 1
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    async def _send_whole(self, body: bytes):
+        compression_stats["responses"] += 1
+        if len(body) < self.minimum_size:
+            await self.send(self.start_message)
+            await self.send({"type": "http.response.body", "body": body})
+            return
+
+        compressed = None
+        if self.cacheable:
+            cache_key = (hashlib.blake2b(body, digest_size=16).digest(), self.encoding, self.level)
+            compressed = precompressed_cache.get(cache_key)
+            if compressed is not None:
+                compression_stats["cache_hits"] += 1
+
+        if compressed is None:
+            started = time.perf_counter()
+            compressed = compress(body, self.encoding, self.level)
+            compression_stats["compress_seconds"] += time.perf_counter() - started
+            if self.cacheable:
+                precompressed_cache.set(cache_key, compressed)
+
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers["Content-Length"] = str(len(compressed))
+        headers.add_vary_header("Accept-Encoding")
+
+        compression_stats["compressed"] += 1
+        compression_stats["bytes_in"] += len(body)
+        compression_stats["bytes_out"] += len(compressed)
+        await self.send(self.start_message)
+        await self.send({"type": "http.response.body", "body": compressed})
@@ -0,0 +1,153 @@
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+from pymongo import UpdateOne
+
+from app.config import settings
+from app.database import get_collection
+from app.utils.hot import UPVOTE_POINTS, hot_update
+
+logger = logging.getLogger(__name__)
+
+
+class CounterBuffer:
+    """
+    Write-behind aggregator for a hot counter field. Increments are summed in
+    memory per document and written with one unordered bulk_write, either
+    every flush_interval_ms or once flush_threshold increments are pending,
+    so a burst of N increments on one document becomes a single $inc.
+
+    Values read on this worker include the pending delta (see overlay); a
+    read racing a flush can be off by that flush's delta for a moment.
+    Other workers see an increment at most flush_interval_ms late, and
+    increments still pending when the process dies without a clean shutdown
+    are lost, so this is only suitable for counts that tolerate that
+    (e.g. upvotes, not seat counts).
+    """
+
+    def __init__(
+        self,
+        collection_name: str,
+        field: str,
+        flush_interval_ms: Optional[int] = None,
+        flush_threshold: Optional[int] = None,
+        hot_points: Optional[float] = None
+    ):
+        self.collection_name = collection_name
+        self.field = field
+        # When set, each flushed unit also adds this many points to the hot score
+        self.hot_points = hot_points
+        self.flush_interval = (flush_interval_ms or settings.COUNTER_FLUSH_INTERVAL_MS) / 1000
+        self.flush_threshold = flush_threshold or settings.COUNTER_FLUSH_THRESHOLD
+        self._pending: Dict[Hashable, int] = defaultdict(int)
+        self._pending_count = 0
+        # Deltas handed to a bulk_write that has not returned yet
+        self._in_flight: Dict[Hashable, int] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self.increments = 0
+        self.flushes = 0
+        self.flushed_increments = 0
+        self.documents_written = 0
+
+    async def add(self, document_id: Hashable, delta: int = 1) -> None:
+        self._pending[document_id] += delta
+        self._pending_count += 1
+        self.increments += 1
+        if self._task is None:
+            # Not started (e.g. outside the app): write through
+            await self.flush()
+        elif self._pending_count >= self.flush_threshold:
+            asyncio.get_running_loop().create_task(self.flush())
+
+    def pending(self, document_id: Hashable) -> int:
+        return self._pending.get(document_id, 0) + self._in_flight.get(document_id, 0)
+
+    def overlay(self, document: Dict[str, Any], document_id: Optional[Hashable] = None) -> Dict[str, Any]:
+        """Add the pending delta to a document read from the database, in place."""
+        delta = self.pending(document_id if document_id is not None else document["_id"])
+        if delta:
+            document[self.field] = document.get(self.field, 0) + delta
+        return document
+
+    def overlay_many(self, documents: Iterable[Dict[str, Any]]) -> None:
+        if self._pending or self._in_flight:
+            for document in documents:
+                self.overlay(document)
+
+    async def flush(self) -> None:
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, defaultdict(int)
+            batch_count, self._pending_count = self._pending_count, 0
+            now = datetime.utcnow()
+            operations = [
+                UpdateOne({"_id": document_id}, self._update(delta, now))
+                for document_id, delta in batch.items() if delta
+            ]
+            if not operations:
+                return
+            self._in_flight = batch
+            try:
+                await get_collection(self.collection_name).bulk_write(operations, ordered=False)
+            except Exception as e:
+                # Put the deltas back so the next flush retries them
+                for document_id, delta in batch.items():
+                    self._pending[document_id] += delta
+                self._pending_count += batch_count
+                logger.error(f"Failed to flush {self.collection_name}.{self.field} counters: {str(e)}")
+                return
+            finally:
+                self._in_flight = {}
+            self.flushes += 1
+            self.flushed_increments += batch_count
+            self.documents_written += len(operations)
+
+    def _update(self, delta: int, now: datetime):
+        if self.hot_points is None:
+            return {"$inc": {self.field: delta}, "$set": {"updated_at": now}}
+        return hot_update(
+            delta * self.hot_points,
+            now,
+            **{self.field: {"$add": [{"$ifNull": [f"${self.field}", 0]}, delta]}}
+        )
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the periodic flush and write out everything still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "increments": self.increments,
+            "flushes": self.flushes,
+            "documents_written": self.documents_written,
+            "pending_documents": len(self._pending),
+            "writes_saved": self.flushed_increments - self.documents_written
+        }
+
+
+question_upvotes = CounterBuffer("questionnaires", "upvotes", hot_points=UPVOTE_POINTS)
+answer_upvotes = CounterBuffer("answers", "upvotes")
+
+COUNTER_BUFFERS = {
+    "question_upvotes": question_upvotes,
+    "answer_upvotes": answer_upvotes,
+}
@@ -0,0 +1,72 @@
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+from app.database import get_collection
+from app.utils.singleflight import singleflight
+
+# Cache-Control policy per route; clients must revalidate, which is cheap with ETags
+CACHE_POLICIES = {
+    "ama_sessions": "public, max-age=5, must-revalidate",
+    "ama_session": "public, max-age=5, must-revalidate",
+    "mentors": "public, max-age=30, must-revalidate",
+    "mentor": "public, max-age=30, must-revalidate",
+    "session": "public, max-age=30, must-revalidate",
+}
+
+VERSIONS_COLLECTION = "collection_versions"
+
+
+async def get_version(collection_name: str) -> int:
+    """Return the write counter for a collection, bumped on every write to it."""
+    async def load():
+        document = await get_collection(VERSIONS_COLLECTION).find_one({"_id": collection_name})
+        return document["version"] if document else 0
+
+    # A burst of polls shares one counter lookup
+    return await singleflight.do(("version", collection_name), load)
+
+
+async def bump_version(*collection_names: str) -> None:
+    """Record a write to each collection so list ETags derived from it change."""
+    versions = get_collection(VERSIONS_COLLECTION)
+    for name in collection_names:
+        await versions.update_one({"_id": name}, {"$inc": {"version": 1}}, upsert=True)
+
+
+def make_etag(*parts: Any) -> str:
+    # Weak validator: the representation may be re-encoded (e.g. compressed) on the way out
+    digest = hashlib.blake2b("|".join(str(part) for part in parts).encode("utf-8"), digest_size=12)
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def not_modified(request: Request, etag: str, policy: str) -> Optional[Response]:
+    """Return a 304 response when the client's If-None-Match matches etag."""
+    if not etag_matches(request, etag):
+        return None
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": CACHE_POLICIES[policy]}
+    )
+
+
+def set_cache_headers(response: Response, etag: str, policy: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_POLICIES[policy]
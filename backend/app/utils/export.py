@@ -0,0 +1,81 @@
+import csv
+import io
+from datetime import datetime
+from typing import Any, AsyncIterator, List
+
+from bson import ObjectId
+from fastapi.responses import StreamingResponse
+
+from app.config import settings
+from app.utils.responses import dumps
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return dumps(value).decode("utf-8")
+    return value
+
+
+async def _ndjson_chunks(cursor, batch_size: int) -> AsyncIterator[bytes]:
+    lines = []
+    async for document in cursor:
+        lines.append(dumps(document))
+        if len(lines) >= batch_size:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+
+async def _csv_chunks(cursor, columns: List[str], batch_size: int) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    rows = 0
+    async for document in cursor:
+        writer.writerow([_csv_value(document.get(column)) for column in columns])
+        rows += 1
+        if rows >= batch_size:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            rows = 0
+    yield buffer.getvalue().encode("utf-8")
+
+
+def export_response(collection, query: dict, columns: List[str], format: str, filename: str) -> StreamingResponse:
+    """
+    Stream every document matching query as NDJSON or CSV. Documents are read
+    from a cursor in batches of EXPORT_BATCH_SIZE and each batch is flushed to
+    the client as soon as it is encoded, so memory stays bounded by one batch.
+    Raises ValueError for an unsupported format.
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {format}")
+
+    batch_size = settings.EXPORT_BATCH_SIZE
+    projection = {column: 1 for column in columns}
+    projection.setdefault("_id", 0)
+    cursor = collection.find(query, projection).sort("_id", 1).batch_size(batch_size)
+
+    if format == "csv":
+        chunks = _csv_chunks(cursor, columns, batch_size)
+    else:
+        chunks = _ndjson_chunks(cursor, batch_size)
+
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'}
+    )
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import math
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.database import get_collection
+
+logger = logging.getLogger(__name__)
+
+# Points an event adds to a question's hot score
+QUESTION_POINTS = 1.0
+UPVOTE_POINTS = 1.0
+ANSWER_POINTS = 3.0
+
+# Decayed scores below this are zeroed so the decay job stops touching them
+MIN_SCORE = 0.01
+
+DECAY_RATE = math.log(2) / settings.HOT_HALF_LIFE_SECONDS
+
+
+def decayed_score(now: datetime) -> Dict[str, Any]:
+    """
+    Aggregation expression for the stored hot_score decayed from
+    hot_updated_at to now: score * e^(-rate * elapsed seconds).
+    """
+    elapsed = {"$divide": [{"$subtract": [now, {"$ifNull": ["$hot_updated_at", now]}]}, 1000]}
+    return {
+        "$multiply": [
+            {"$ifNull": ["$hot_score", 0]},
+            {"$exp": {"$multiply": [-DECAY_RATE, elapsed]}}
+        ]
+    }
+
+
+def hot_update(points: float, now: Optional[datetime] = None, **fields: Any) -> List[Dict[str, Any]]:
+    """
+    Pipeline update that decays a question's hot score to now and adds points.
+    Extra fields are set in the same stage as aggregation expressions
+    (e.g. an increment written as {"$add": ["$answers", 1]}).
+    """
+    now = now or datetime.utcnow()
+    return [{
+        "$set": {
+            "hot_score": {"$add": [decayed_score(now), points]},
+            "hot_updated_at": now,
+            "updated_at": now,
+            **fields
+        }
+    }]
+
+
+async def decay_scores(now: Optional[datetime] = None) -> int:
+    """
+    Bring every non-zero hot score forward to now. Scores decay at the same
+    rate, so once they share a reference time they compare correctly; scores
+    that have faded below MIN_SCORE are set to 0. Returns the number updated.
+    """
+    now = now or datetime.utcnow()
+    result = await get_collection("questionnaires").update_many(
+        {"hot_score": {"$gt": 0}},
+        [{
+            "$set": {
+                "hot_score": {
+                    "$let": {
+                        "vars": {"score": decayed_score(now)},
+                        "in": {"$cond": [{"$lt": ["$$score", MIN_SCORE]}, 0, "$$score"]}
+                    }
+                },
+                "hot_updated_at": now
+            }
+        }]
+    )
+    return result.modified_count
+
+
+class HotScoreDecay:
+    """Background job re-decaying hot scores every HOT_DECAY_INTERVAL_SECONDS."""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.updated = 0
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.HOT_DECAY_INTERVAL_SECONDS)
+            try:
+                self.updated += await decay_scores()
+                self.runs += 1
+            except Exception as e:
+                logger.error(f"Hot score decay failed: {str(e)}")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> Dict[str, int]:
+        return {"runs": self.runs, "updated": self.updated}
+
+
+hot_decay = HotScoreDecay()
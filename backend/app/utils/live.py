@@ -0,0 +1,241 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set, Tuple
+
+from bson import ObjectId
+
+from app.config import settings
+from app.database import get_collection
+from app.utils.cache import LRUCache
+from app.utils.responses import dumps
+
+logger = logging.getLogger(__name__)
+
+
+class LiveBroker:
+    """
+    In-process pub/sub for push channels. Each event is serialized once and
+    the same bytes are put on every subscriber's queue. A subscriber that
+    falls behind loses its oldest events rather than blocking publishers.
+
+    Count updates (e.g. upvotes) are coalesced per channel: only the latest
+    value per key is kept and they go out as one event every
+    LIVE_COALESCE_MS, so a burst of votes is one fan-out, not one per vote.
+    """
+
+    def __init__(self, queue_size: Optional[int] = None, coalesce_ms: Optional[int] = None):
+        self.queue_size = queue_size or settings.LIVE_QUEUE_SIZE
+        self.coalesce_interval = (coalesce_ms or settings.LIVE_COALESCE_MS) / 1000
+        self._channels: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._counts: Dict[str, Dict[str, Dict[str, int]]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    def subscribe(self, channel: str) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._channels[channel].add(queue)
+        return queue
+
+    def unsubscribe(self, channel: str, queue: asyncio.Queue) -> None:
+        subscribers = self._channels.get(channel)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._channels[channel]
+
+    def publish(self, channel: str, event: Dict[str, Any]) -> None:
+        subscribers = self._channels.get(channel)
+        self.published += 1
+        if not subscribers:
+            return
+        data = dumps(event)
+        for queue in subscribers:
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(data)
+        self.delivered += len(subscribers)
+
+    def publish_count(self, channel: str, kind: str, key: str, value: int) -> None:
+        """Queue the latest value of a counter for the next coalesced event."""
+        if channel not in self._channels:
+            return
+        if self._task is None:
+            # No flusher running (e.g. outside the app): deliver right away
+            self.publish(channel, {"type": f"{kind}_changed", "counts": {key: value}})
+            return
+        self._counts.setdefault(channel, {}).setdefault(kind, {})[key] = value
+
+    def flush_counts(self) -> None:
+        counts, self._counts = self._counts, {}
+        for channel, kinds in counts.items():
+            for kind, values in kinds.items():
+                self.publish(channel, {"type": f"{kind}_changed", "counts": values})
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.coalesce_interval)
+            self.flush_counts()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.flush_counts()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "channels": len(self._channels),
+            "subscribers": sum(len(subscribers) for subscribers in self._channels.values()),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped
+        }
+
+
+broker = LiveBroker()
+
+# Question id -> session id, so answer events can be routed without a read
+_question_sessions = LRUCache(max_entries=50000, ttl=6 * 3600)
+
+
+def session_channel(session_id: str) -> str:
+    return f"questions:{session_id}"
+
+
+def remember_question(question_id: str, session_id: Optional[str]) -> None:
+    if session_id:
+        _question_sessions.set(str(question_id), session_id)
+
+
+async def session_for_question(question_id: str) -> Optional[str]:
+    session_id = _question_sessions.get(str(question_id))
+    if session_id is None:
+        question = await get_collection("questionnaires").find_one(
+            {"_id": ObjectId(question_id)}, {"session_id": 1}
+        )
+        session_id = (question or {}).get("session_id")
+        remember_question(question_id, session_id)
+    return session_id
+
+
+# Event helpers called by the write paths. With LIVE_CHANGE_STREAMS the
+# change-stream watcher publishes instead, so events reach every worker.
+
+def question_created(question: Dict[str, Any]) -> None:
+    remember_question(question["_id"], question.get("session_id"))
+    if settings.LIVE_CHANGE_STREAMS or not question.get("session_id"):
+        return
+    broker.publish(session_channel(question["session_id"]), {"type": "question_created", "question": question})
+
+
+def answer_added(session_id: Optional[str], answer: Dict[str, Any], answers: Optional[int] = None) -> None:
+    if settings.LIVE_CHANGE_STREAMS or not session_id:
+        return
+    broker.publish(session_channel(session_id), {"type": "answer_added", "answer": answer, "answers": answers})
+
+
+def question_upvotes_changed(session_id: Optional[str], question_id: Any, upvotes: int) -> None:
+    if settings.LIVE_CHANGE_STREAMS or not session_id:
+        return
+    broker.publish_count(session_channel(session_id), "question_upvotes", str(question_id), upvotes)
+
+
+async def answer_upvotes_changed(question_id: str, answer_id: Any, upvotes: int) -> None:
+    if settings.LIVE_CHANGE_STREAMS:
+        return
+    session_id = await session_for_question(question_id)
+    if session_id:
+        broker.publish_count(session_channel(session_id), "answer_upvotes", str(answer_id), upvotes)
+
+
+class ChangeStreamFeed:
+    """
+    Feeds the broker from MongoDB change streams on questionnaires and
+    answers (requires a replica set), so every worker pushes the writes made
+    by all workers. Reconnects with the last resume token after an error.
+    """
+
+    def __init__(self):
+        self._tasks = []
+
+    def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._watch("questionnaires", ("upvotes", "answers"), self._on_question)),
+                asyncio.create_task(self._watch("answers", ("upvotes",), self._on_answer)),
+            ]
+
+    def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    async def _watch(self, collection_name: str, fields: Tuple[str, ...], handler) -> None:
+        """
+        Watch inserts and the updates that set one of fields. The filter
+        runs on the server, so other writes (e.g. the hot_score decay job
+        rewriting every live question) never reach this worker, and no
+        updateLookup read is made for them.
+        """
+        pipeline = [{"$match": {"$or": [
+            {"operationType": "insert"},
+            {
+                "operationType": "update",
+                "$or": [{f"updateDescription.updatedFields.{field}": {"$exists": True}} for field in fields]
+            },
+        ]}}]
+        resume_token = None
+        while True:
+            try:
+                async with get_collection(collection_name).watch(
+                    pipeline, full_document="updateLookup", resume_after=resume_token
+                ) as stream:
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        await handler(change)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Change stream on {collection_name} failed: {str(e)}")
+                await asyncio.sleep(1)
+
+    async def _on_question(self, change: Dict[str, Any]) -> None:
+        question = change.get("fullDocument")
+        if not question or not question.get("session_id"):
+            return
+        channel = session_channel(question["session_id"])
+        if change["operationType"] == "insert":
+            remember_question(question["_id"], question["session_id"])
+            broker.publish(channel, {"type": "question_created", "question": question})
+            return
+        updated = change["updateDescription"]["updatedFields"]
+        if "upvotes" in updated:
+            broker.publish_count(channel, "question_upvotes", str(question["_id"]), question["upvotes"])
+        if "answers" in updated:
+            # answer_added from the answers stream has no count; it follows here
+            broker.publish_count(channel, "question_answers", str(question["_id"]), question["answers"])
+
+    async def _on_answer(self, change: Dict[str, Any]) -> None:
+        answer = change.get("fullDocument")
+        if not answer:
+            return
+        session_id = await session_for_question(answer["question_id"])
+        if not session_id:
+            return
+        channel = session_channel(session_id)
+        if change["operationType"] == "insert":
+            broker.publish(channel, {"type": "answer_added", "answer": answer})
+        elif "upvotes" in change["updateDescription"]["updatedFields"]:
+            broker.publish_count(channel, "answer_upvotes", str(answer["_id"]), answer["upvotes"])
+
+
+change_feed = ChangeStreamFeed()
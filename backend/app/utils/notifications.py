@@ -0,0 +1,78 @@
+import asyncio
+import logging
+from typing import Optional
+
+from app.utils.email import email_sender
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationQueue:
+    """
+    Sends emails from a background worker so request handlers only enqueue.
+    SMTP is blocking, so each send runs in a worker thread.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.max_size = max_size
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def start(self) -> None:
+        if self._worker is None:
+            self._queue = asyncio.Queue(maxsize=self.max_size)
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Send whatever is still queued, then stop the worker."""
+        if self._worker is None:
+            return
+        await self._queue.join()
+        self._worker.cancel()
+        self._worker = None
+
+    def enqueue_email(self, to_email: str, subject: str, body: str) -> None:
+        if self._queue is None:
+            # No running worker (e.g. a script outside the app); send inline instead
+            self._record(email_sender.send_email(to_email=to_email, subject=subject, body=body), to_email)
+            return
+        try:
+            self._queue.put_nowait((to_email, subject, body))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.error(f"Notification queue full, dropping email to {to_email}")
+
+    async def _run(self) -> None:
+        while True:
+            to_email, subject, body = await self._queue.get()
+            try:
+                success = await asyncio.to_thread(
+                    email_sender.send_email, to_email=to_email, subject=subject, body=body
+                )
+                self._record(success, to_email)
+            except Exception as e:
+                self._record(False, to_email)
+                logger.error(f"Error sending email to {to_email}: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def _record(self, success: bool, to_email: str) -> None:
+        if success:
+            self.sent += 1
+        else:
+            self.failed += 1
+            logger.error(f"Failed to send email to {to_email}")
+
+    def stats(self):
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "sent": self.sent,
+            "failed": self.failed,
+            "dropped": self.dropped
+        }
+
+
+notifications = NotificationQueue()
@@ -0,0 +1,75 @@
+import base64
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import bson
+
+SortSpec = Sequence[Tuple[str, int]]
+
+
+def _sort_key(sort: SortSpec) -> List[str]:
+    return [f"{field}:{direction}" for field, direction in sort]
+
+
+def encode_cursor(values: Sequence[Any], sort: SortSpec) -> str:
+    """
+    Encode the sort-key values of the last item on a page as an opaque cursor,
+    together with the sort they belong to. BSON keeps ObjectId and datetime
+    values exact across the round trip.
+    """
+    payload = bson.encode({"k": list(values), "s": _sort_key(sort)})
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, sort: SortSpec) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor for sort. Raises ValueError if
+    it is malformed or was issued for a different sort, whose values would
+    otherwise be compared against the wrong fields.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = bson.decode(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = payload["k"]
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if payload.get("s") != _sort_key(sort):
+        raise ValueError("Cursor was issued for a different sort order")
+    if not isinstance(values, list) or len(values) != len(sort):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def cursor_for(document: Dict[str, Any], sort: SortSpec) -> str:
+    return encode_cursor([document.get(field) for field, _ in sort], sort)
+
+
+def keyset_filter(sort: SortSpec, values: Sequence[Any]) -> Dict[str, Any]:
+    """
+    Build the filter selecting documents strictly after values in sort order,
+    e.g. for [(a, -1), (b, -1)]: a < va OR (a == va AND b < vb).
+    """
+    clauses = []
+    for index, (field, direction) in enumerate(sort):
+        clause = {prev_field: values[prev] for prev, (prev_field, _) in enumerate(sort[:index])}
+        clause[field] = {"$lt" if direction < 0 else "$gt": values[index]}
+        clauses.append(clause)
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+
+def apply_cursor(query: Dict[str, Any], sort: SortSpec, cursor: Optional[str]) -> Dict[str, Any]:
+    """Combine a base query with the keyset filter for cursor. Raises ValueError on a bad cursor."""
+    if not cursor:
+        return query
+    after = keyset_filter(sort, decode_cursor(cursor, sort))
+    return {"$and": [query, after]} if query else after
+
+
+def paginate(documents: List[Dict[str, Any]], sort: SortSpec, limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Split a result fetched with limit + 1 into the page and the cursor for the
+    next page (None when this is the last page).
+    """
+    if len(documents) <= limit:
+        return documents, None
+    page = documents[:limit]
+    return page, cursor_for(page[-1], sort)
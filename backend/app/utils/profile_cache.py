@@ -0,0 +1,88 @@
+from typing import Dict, Iterable, List, Optional
+
+from app.config import settings
+from app.database import get_collection
+from app.utils.cache import LRUCache
+from app.utils.cache_backend import shared_cache
+
+# Keyed by userprofile.userId; documents are stored as read from MongoDB.
+# With a shared cache configured this is a short-lived per-worker layer in
+# front of it, so other workers see invalidations within the local TTL.
+profile_cache = LRUCache(
+    max_entries=settings.PROFILE_CACHE_MAX_ENTRIES,
+    max_bytes=settings.PROFILE_CACHE_MAX_BYTES,
+    ttl=(
+        settings.PROFILE_CACHE_LOCAL_TTL_SECONDS
+        if shared_cache.is_shared
+        else settings.PROFILE_CACHE_TTL_SECONDS
+    )
+)
+
+
+def _shared_key(user_id: str) -> str:
+    return f"profile:{user_id}"
+
+
+async def get_profile(user_id: str) -> Optional[dict]:
+    """
+    Return the userprofile document for user_id, reading through the cache.
+    The returned dict is a shallow copy, so callers may reshape it freely.
+    """
+    profile = profile_cache.get(user_id)
+    if profile is None:
+        if shared_cache.is_shared:
+            profile = await shared_cache.get(_shared_key(user_id))
+        if profile is None:
+            profile = await get_collection("userprofile").find_one({"userId": user_id})
+            if profile is None:
+                return None
+            if shared_cache.is_shared:
+                await shared_cache.set(_shared_key(user_id), profile, ttl=settings.PROFILE_CACHE_TTL_SECONDS)
+        profile_cache.set(user_id, profile)
+    return dict(profile)
+
+
+async def get_profiles(user_ids: Iterable[str]) -> List[dict]:
+    """
+    Return the userprofile documents for user_ids, fetching every cache miss
+    with a single $in query.
+    """
+    profiles: Dict[str, dict] = {}
+    missing = []
+    for user_id in dict.fromkeys(user_ids):
+        profile = profile_cache.get(user_id)
+        if profile is None:
+            missing.append(user_id)
+        else:
+            profiles[user_id] = profile
+
+    if missing and shared_cache.is_shared:
+        shared = await shared_cache.get_many(_shared_key(user_id) for user_id in missing)
+        for user_id in missing:
+            profile = shared.get(_shared_key(user_id))
+            if profile is not None:
+                profile_cache.set(user_id, profile)
+                profiles[user_id] = profile
+        missing = [user_id for user_id in missing if user_id not in profiles]
+
+    if missing:
+        cursor = get_collection("userprofile").find({"userId": {"$in": missing}})
+        async for profile in cursor:
+            profile_cache.set(profile["userId"], profile)
+            profiles[profile["userId"]] = profile
+            if shared_cache.is_shared:
+                await shared_cache.set(
+                    _shared_key(profile["userId"]), profile, ttl=settings.PROFILE_CACHE_TTL_SECONDS
+                )
+
+    return [dict(profile) for profile in profiles.values()]
+
+
+async def invalidate_profile(user_id: str) -> None:
+    """
+    Drop a cached profile after its document has been written, along with any
+    shared entries (e.g. catalog pages) tagged with this mentor.
+    """
+    profile_cache.delete(user_id)
+    await shared_cache.delete(_shared_key(user_id))
+    await shared_cache.delete_tag(f"mentor:{user_id}")
@@ -0,0 +1,194 @@
+from datetime import datetime, UTC
+from typing import Any, Dict, List, Optional, Tuple, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from app.database import get_collection
+from app.schemas.mentor import UserProfileDocument
+
+MAX_PATCH_OPERATIONS = 100
+
+
+def _unwrap_optional(annotation):
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _resolve_annotation(segments: List[str], allow_append: bool = False):
+    """
+    Walk a path through UserProfileDocument and return the type expected at its end.
+    Returns (annotation, position): when the path ends in a list item, position
+    is its index, or "-" for a trailing JSON Patch append; otherwise None.
+    """
+    annotation = UserProfileDocument
+    position: Union[int, str, None] = None
+    for index, segment in enumerate(segments):
+        annotation = _unwrap_optional(annotation)
+        is_last = index == len(segments) - 1
+        position = None
+
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            if segment not in annotation.model_fields:
+                raise ValueError(f"Unknown profile field: {'.'.join(segments[:index + 1])}")
+            annotation = annotation.model_fields[segment].annotation
+        elif get_origin(annotation) in (list, List):
+            item_type = get_args(annotation)[0]
+            if segment == "-" and is_last and allow_append:
+                return item_type, "-"
+            if not segment.isdigit():
+                raise ValueError(f"Expected a list index at: {'.'.join(segments[:index + 1])}")
+            annotation = item_type
+            position = int(segment)
+        else:
+            raise ValueError(f"Cannot descend into scalar field: {'.'.join(segments[:index])}")
+
+    return annotation, position
+
+
+def _existing_item(segments: List[str]) -> Optional[str]:
+    """
+    The deepest list item the path goes through, which must already exist:
+    MongoDB would otherwise pad the list with nulls up to that index.
+    """
+    for index in range(len(segments) - 1, -1, -1):
+        if segments[index].isdigit():
+            return ".".join(segments[:index + 1])
+    return None
+
+
+def _validate_value(annotation, value: Any, path: str) -> Any:
+    adapter = TypeAdapter(annotation)
+    try:
+        validated = adapter.validate_python(value)
+    except ValidationError as e:
+        raise ValueError(f"Invalid value for {path}: {e.errors()[0]['msg']}")
+    return adapter.dump_python(validated, exclude_unset=True)
+
+
+def _json_pointer_to_segments(pointer: str) -> List[str]:
+    if not pointer.startswith("/"):
+        raise ValueError(f"Invalid JSON Patch path: {pointer}")
+    return [
+        segment.replace("~1", "/").replace("~0", "~")
+        for segment in pointer[1:].split("/")
+    ]
+
+
+def _check_conflicts(paths: List[str]) -> None:
+    # MongoDB rejects updates that touch a path and one of its ancestors together
+    seen = sorted(paths)
+    for previous, current in zip(seen, seen[1:]):
+        if current == previous or current.startswith(previous + "."):
+            raise ValueError(f"Conflicting patch paths: {previous} and {current}")
+
+
+def build_profile_update(
+    patch: Union[List[Dict[str, Any]], Dict[str, Any]]
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Any]]:
+    """
+    Translate a profile patch into a MongoDB update document.
+
+    Accepts either a JSON Patch (list of add/replace/remove operations) or a
+    mapping of dotted paths to new values. Every path is validated against
+    UserProfileDocument so only changed, known fields are written. An add at
+    a list index inserts there ($push with $position); an add at "-" appends.
+
+    Returns (update, conditions). conditions must be added to the update's
+    filter: they require every list index the patch names to be in range, so
+    a profile that does not match them has an out-of-range index.
+    Raises ValueError when the patch is invalid.
+    """
+    set_fields: Dict[str, Any] = {}
+    unset_fields: Dict[str, str] = {}
+    push_fields: Dict[str, Dict[str, Any]] = {}
+    conditions: Dict[str, Any] = {}
+
+    if isinstance(patch, dict):
+        operations = [
+            {"op": "replace", "segments": path.split("."), "value": value}
+            for path, value in patch.items()
+        ]
+    else:
+        operations = []
+        for operation in patch:
+            if hasattr(operation, "model_dump"):
+                operation = operation.model_dump()
+            operations.append({
+                "op": operation.get("op"),
+                "segments": _json_pointer_to_segments(operation.get("path", "")),
+                "value": operation.get("value")
+            })
+
+    if not operations:
+        raise ValueError("Patch is empty")
+    if len(operations) > MAX_PATCH_OPERATIONS:
+        raise ValueError(f"Patch exceeds {MAX_PATCH_OPERATIONS} operations")
+
+    for operation in operations:
+        op = operation["op"]
+        segments = operation["segments"]
+        if not segments or any(segment == "" for segment in segments):
+            raise ValueError("Patch path must not be empty")
+
+        if op in ("add", "replace"):
+            annotation, position = _resolve_annotation(segments, allow_append=(op == "add"))
+            if op == "add" and position is not None:
+                path = ".".join(segments[:-1])
+                value = _validate_value(annotation, operation["value"], path)
+                push = push_fields.setdefault(path, {"$each": []})
+                if position != "-":
+                    # One $position per list: a second insert would land relative to the first
+                    if push["$each"]:
+                        raise ValueError(f"Only one add at an index per list is supported: {path}")
+                    push["$position"] = position
+                    # Inserting at index n needs at least n items (n == length appends)
+                    if position > 0:
+                        conditions[f"{path}.{position - 1}"] = {"$exists": True}
+                elif "$position" in push:
+                    raise ValueError(f"Only one add at an index per list is supported: {path}")
+                push["$each"].append(value)
+                parent = _existing_item(segments[:-1])
+            else:
+                path = ".".join(segments)
+                set_fields[path] = _validate_value(annotation, operation["value"], path)
+                parent = _existing_item(segments)
+            if parent:
+                conditions.setdefault(parent, {"$exists": True})
+        elif op == "remove":
+            _resolve_annotation(segments)
+            if segments[-1].isdigit():
+                raise ValueError("Removing list items by index is not supported; replace the list instead")
+            unset_fields[".".join(segments)] = ""
+        else:
+            raise ValueError(f"Unsupported patch operation: {op}")
+
+    _check_conflicts(list(set_fields) + list(unset_fields) + list(push_fields))
+
+    update: Dict[str, Dict[str, Any]] = {
+        "$set": {**set_fields, "updated_at": datetime.now(UTC)}
+    }
+    if unset_fields:
+        update["$unset"] = unset_fields
+    if push_fields:
+        update["$push"] = push_fields
+    return update, conditions
+
+
+async def apply_profile_patch(user_id: str, patch: Union[List[Dict[str, Any]], Dict[str, Any]]) -> None:
+    """
+    Apply a profile patch to the userprofile of user_id in one update.
+    Raises ValueError for an invalid patch or a list index out of range,
+    and LookupError when there is no such profile.
+    """
+    update, conditions = build_profile_update(patch)
+    collection = get_collection("userprofile")
+    result = await collection.update_one({"userId": user_id, **conditions}, update)
+    if result.matched_count:
+        return
+    # Only a failed update pays for telling "out of range" apart from "missing"
+    if conditions and await collection.find_one({"userId": user_id}, {"_id": 1}) is not None:
+        raise ValueError("List index out of range")
+    raise LookupError("Profile not found")
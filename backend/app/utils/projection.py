@@ -0,0 +1,88 @@
+import re
+from typing import Any, Dict, Iterable, List, Optional, Type
+
+from pydantic import BaseModel
+
+# Named response shapes per collection; "full" (no projection) is always available
+VIEWS: Dict[str, Dict[str, List[str]]] = {
+    "userprofile": {
+        "card": ["userId", "name", "profilePhoto", "headline", "primaryExpertise", "role"],
+    },
+    "sessions": {
+        "card": [
+            "sessionId", "userId", "sessionName", "sessionType", "duration",
+            "isPaid", "price", "tokens", "topics"
+        ],
+    },
+}
+
+MAX_FIELDS = 50
+_FIELD_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z0-9_]+)*$")
+
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """Split a comma-separated fields= parameter. Raises ValueError on invalid names."""
+    if not fields:
+        return []
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    if len(names) > MAX_FIELDS:
+        raise ValueError(f"At most {MAX_FIELDS} fields can be requested")
+    for name in names:
+        if not _FIELD_PATTERN.match(name):
+            raise ValueError(f"Invalid field name: {name}")
+    return names
+
+
+def build_projection(
+    collection: str,
+    view: str = "full",
+    fields: Optional[str] = None,
+    required: Iterable[str] = ()
+) -> Optional[Dict[str, int]]:
+    """
+    Turn a view name and/or explicit field list into a MongoDB projection.
+    Returns None for the full document. required names fields the caller needs
+    internally (e.g. sort keys), which are included whenever a projection is used.
+    Raises ValueError for an unknown view or invalid field names.
+    """
+    names = parse_fields(fields)
+    if view != "full":
+        if view not in VIEWS.get(collection, {}):
+            raise ValueError(f"Unknown view '{view}' for {collection}")
+        names = VIEWS[collection][view] + names
+    if not names:
+        return None
+
+    projection = {name: 1 for name in list(required) + names}
+    projection.setdefault("_id", 0)
+    return projection
+
+
+def model_projection(model: Type[BaseModel]) -> Dict[str, int]:
+    """
+    Projection returning exactly the fields of a response model, so documents
+    can be serialized as-is without re-validating them against the model.
+    """
+    return {(field.alias or name): 1 for name, field in model.model_fields.items()}
+
+
+def apply_projection(document: Dict[str, Any], projection: Optional[Dict[str, int]]) -> Dict[str, Any]:
+    """Apply an inclusion projection to a document already in memory (e.g. from a cache)."""
+    if projection is None:
+        return document
+    result: Dict[str, Any] = {}
+    for path, include in projection.items():
+        if not include:
+            continue
+        parts = path.split(".")
+        value = document
+        for part in parts:
+            if not isinstance(value, dict) or part not in value:
+                break
+            value = value[part]
+        else:
+            target = result
+            for part in parts[:-1]:
+                target = target.setdefault(part, {})
+            target[parts[-1]] = value
+    return result
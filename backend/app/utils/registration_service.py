@@ -0,0 +1,277 @@
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo.errors import DuplicateKeyError
+
+from app.database import get_collection
+from app.utils.notifications import notifications
+from app.utils.seats import SeatUnavailable, register_for_session
+from app.utils.waitlist import cancel_registration, fill_from_waitlist, join_waitlist, leave_waitlist, waitlist_position
+
+logger = logging.getLogger(__name__)
+
+# Session fields used to build the registration document and confirmation email
+SESSION_DETAIL_FIELDS = {"title": 1, "date": 1, "time": 1, "duration": 1, "mentor": 1}
+
+
+def registration_document(data: Dict[str, Any], session: Dict[str, Any]) -> Dict[str, Any]:
+    """Registration document with session details and a unique meeting link."""
+    # Generate a unique meeting link
+    meeting_id = str(uuid.uuid4())
+    meeting_link = f"https://meet.mentorhood.com/{meeting_id}"
+
+    registration_dict = {field: data.get(field) for field in ("email", "session_id", "name", "company", "role")}
+    registration_dict.update({
+        "meeting_link": meeting_link,
+        "meeting_id": meeting_id,
+        "session_title": session.get("title", ""),
+        "session_date": session.get("date", ""),
+        "session_time": session.get("time", ""),
+        "session_duration": session.get("duration", ""),
+        "mentor_name": session.get("mentor", {}).get("name", ""),
+        "mentor_role": session.get("mentor", {}).get("role", ""),
+        "mentor_company": session.get("mentor", {}).get("company", ""),
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow()
+    })
+    return registration_dict
+
+
+def confirmation_email(session: Dict[str, Any], meeting_link: str) -> Tuple[str, str]:
+    """
+    Subject and HTML body of the registration confirmation email. Missing
+    session details are left blank rather than failing, since the email is
+    built after the registration is already saved.
+    """
+    title = session.get("title", "")
+    mentor = session.get("mentor") or {}
+    host = ", ".join(part for part in (mentor.get("name", ""), mentor.get("role", "")) if part)
+    subject = f"Registration Confirmation - {title}"
+    body = f"""
+    <html>
+        <head>
+            <style>
+                body {{
+                    font-family: 'Arial', sans-serif;
+                    line-height: 1.6;
+                    color: #333333;
+                    margin: 0;
+                    padding: 0;
+                }}
+                .email-container {{
+                    max-width: 600px;
+                    margin: 0 auto;
+                    padding: 20px;
+                }}
+                .email-header {{
+                    background-color: #000000;
+                    padding: 20px;
+                    text-align: center;
+                }}
+                .logo {{
+                    font-size: 24px;
+                    font-weight: bold;
+                    color: #ffffff;
+                    text-decoration: none;
+                }}
+                .email-body {{
+                    background-color: #ffffff;
+                    padding: 30px;
+                    border: 1px solid #e0e0e0;
+                    border-top: none;
+                }}
+                h2 {{
+                    color: #000000;
+                    font-size: 22px;
+                    margin-top: 0;
+                    margin-bottom: 20px;
+                }}
+                p {{
+                    margin-bottom: 16px;
+                    font-size: 16px;
+                }}
+                .session-details {{
+                    background-color: #f5f5f5;
+                    border: 1px solid #e0e0e0;
+                    padding: 15px;
+                    border-radius: 4px;
+                    margin: 20px 0;
+                }}
+                .email-footer {{
+                    background-color: #f5f5f5;
+                    padding: 20px;
+                    text-align: center;
+                    font-size: 14px;
+                    color: #666666;
+                }}
+                .meeting-link {{
+                    background-color: #f0f8ff;
+                    border: 1px solid #cce6ff;
+                    padding: 15px;
+                    border-radius: 4px;
+                    margin: 20px 0;
+                    word-break: break-all;
+                }}
+                .meeting-link a {{
+                    color: #0066cc;
+                    text-decoration: none;
+                    font-weight: bold;
+                }}
+                .meeting-link a:hover {{
+                    text-decoration: underline;
+                }}
+            </style>
+        </head>
+        <body>
+            <div class="email-container">
+                <div class="email-header">
+                    <span class="logo">MentorHood</span>
+                </div>
+
+                <div class="email-body">
+                    <h2>You're registered for {title}!</h2>
+
+                    <p>Thank you for registering for our upcoming AMA session. We're excited to have you join us!</p>
+
+                    <div class="session-details">
+                        <p><strong>Session:</strong> {title}</p>
+                        <p><strong>Date:</strong> {session.get('date', '')}</p>
+                        <p><strong>Time:</strong> {session.get('time', '')}</p>
+                        <p><strong>Duration:</strong> {session.get('duration', '')}</p>
+                        <p><strong>Host:</strong> {host}</p>
+                    </div>
+
+                    <div class="meeting-link">
+                        <p style="margin-top: 0;"><strong>Your Meeting Link:</strong></p>
+                        <a href="{meeting_link}">{meeting_link}</a>
+                        <p style="margin-bottom: 0; font-size: 14px;">This link will be active 5 minutes before your scheduled session.</p>
+                    </div>
+
+                    <p>We'll send you a reminder before the session starts. In the meantime, feel free to prepare your questions!</p>
+
+                    <p>If you have any questions, feel free to reach out to our support team at <a href="mailto:support@mentorhood.com">support@mentorhood.com</a>.</p>
+
+                    <p>Best regards,<br>The MentorHood Team</p>
+                </div>
+
+                <div class="email-footer">
+                    <p>© 2025 MentorHood. All rights reserved.</p>
+                    <p>123 Mentorship Avenue, Knowledge City, CA 94103</p>
+                </div>
+            </div>
+        </body>
+    </html>
+    """
+    return subject, body
+
+
+async def register(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Register data["email"] for the AMA session data["session_id"] and queue the
+    confirmation email. The seat claim and insert are atomic (see seats), and
+    the email is sent in the background so it adds no latency.
+    Raises SeatUnavailable for a missing or full session or a duplicate registration.
+    """
+    session, registration = await register_for_session(
+        data["session_id"],
+        lambda session: registration_document(data, session),
+        SESSION_DETAIL_FIELDS
+    )
+    _send_confirmation(session, registration)
+    return registration
+
+
+async def register_or_waitlist(data: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[int]]:
+    """
+    Register when a seat is free, otherwise join the waitlist.
+    Returns (registration, None) or (None, waitlist position).
+    Raises SeatUnavailable as register does, or when already registered or
+    already on the waitlist.
+
+    A seat can be released between the failed claim and joining the
+    waitlist (a cancellation that found the waitlist empty), so after
+    joining, any free seat is claimed for the head of the waitlist.
+    """
+    try:
+        return await register(data), None
+    except SeatUnavailable as e:
+        if e.detail != "Session is full":
+            raise
+
+    session_id, email = data["session_id"], data["email"]
+    # A full session fails the claim before the duplicate insert can say so
+    if await is_registered(session_id, email):
+        raise SeatUnavailable(400, "You are already registered for this session")
+    try:
+        await join_waitlist(session_id, dict(data))
+    except DuplicateKeyError:
+        raise SeatUnavailable(400, "You are already on the waitlist for this session")
+
+    session, promoted = await fill_from_waitlist(session_id, registration_document, SESSION_DETAIL_FIELDS)
+    if promoted is not None and promoted["email"] == email:
+        _send_confirmation(session, promoted)
+        return promoted, None
+    if promoted is not None:
+        _notify_promoted(session, promoted)
+
+    position = await waitlist_position(session_id, email)
+    if position is not None:
+        return None, position
+    # Promoted by a concurrent cancellation, which sent the email
+    return await get_collection("registrations").find_one({"session_id": session_id, "email": email}), None
+
+
+def _send_confirmation(session: Optional[Dict[str, Any]], registration: Dict[str, Any], subject: Optional[str] = None) -> None:
+    """
+    Queue the confirmation email for a saved registration. Failures are
+    logged, never raised: the registration stands either way.
+    """
+    try:
+        default_subject, body = confirmation_email(session or {}, registration["meeting_link"])
+        notifications.enqueue_email(registration["email"], subject or default_subject, body)
+    except Exception as e:
+        logger.error(f"Failed to queue confirmation email for {registration.get('email')}: {str(e)}")
+
+
+def _notify_promoted(session: Optional[Dict[str, Any]], promoted: Dict[str, Any]) -> None:
+    """Tell someone promoted off the waitlist that they now have a seat."""
+    _send_confirmation(session, promoted, f"A seat opened up - {(session or {}).get('title', '')}")
+
+
+async def cancel(session_id: str, email: str) -> Optional[Dict[str, Any]]:
+    """
+    Cancel a registration, promote the head of the waitlist into the freed
+    seat and queue their email. Returns the promoted registration, if any.
+    Raises LookupError if there was no registration to cancel.
+    """
+    session, promoted = await cancel_registration(
+        session_id, email, registration_document, SESSION_DETAIL_FIELDS
+    )
+    if promoted is not None:
+        _notify_promoted(session, promoted)
+    return promoted
+
+
+async def leave(session_id: str, email: str) -> bool:
+    return await leave_waitlist(session_id, email)
+
+
+async def is_registered(session_id: str, email: str) -> bool:
+    # Covered by the unique (session_id, email) index
+    registration = await get_collection("registrations").find_one(
+        {"session_id": session_id, "email": email},
+        {"_id": 1}
+    )
+    return registration is not None
+
+
+async def registration_statuses(session_ids: List[str], email: str) -> Dict[str, bool]:
+    """Registration status of email for each session, from one query covered by the unique index."""
+    cursor = get_collection("registrations").find(
+        {"email": email, "session_id": {"$in": session_ids}},
+        {"session_id": 1, "_id": 0}
+    )
+    registered = {document["session_id"] async for document in cursor}
+    return {session_id: session_id in registered for session_id in session_ids}
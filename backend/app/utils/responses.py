@@ -0,0 +1,32 @@
+from typing import Any
+
+import orjson
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+from fastapi.responses import JSONResponse
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Decimal128):
+        return str(value.to_decimal())
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize documents straight from MongoDB, including ObjectId and datetime values."""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class BSONJSONResponse(JSONResponse):
+    """
+    orjson-backed JSON response that understands BSON types natively.
+    Endpoints returning one directly also skip jsonable_encoder and response_model
+    validation, so it is meant for documents read through a trusted projection.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,104 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from pymongo import DESCENDING
+
+from app.config import settings
+from app.database import get_collection
+
+# Searchable collections: the filter applied to every search and the fields
+# counted as facets (True for array fields, which are unwound). Relevance
+# weights live on the text indexes in app.database.
+SEARCH_TARGETS: Dict[str, Dict[str, Any]] = {
+    "mentors": {
+        "collection": "userprofile",
+        "base_query": {"role": "mentor"},
+        "facets": {"primaryExpertise": False, "skills": True, "tools": True, "disciplines": True},
+    },
+    "sessions": {
+        "collection": "sessions",
+        "base_query": {},
+        "facets": {"sessionType": False, "topics": True, "isPaid": False},
+    },
+}
+
+
+def _facet(field: str, is_array: bool) -> List[Dict[str, Any]]:
+    stages: List[Dict[str, Any]] = [{"$unwind": f"${field}"}] if is_array else []
+    return stages + [
+        # Profiles are created with placeholder blanks
+        {"$match": {field: {"$nin": ["", None]}}},
+        {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1, "_id": 1}},
+        {"$limit": settings.SEARCH_FACET_SIZE},
+    ]
+
+
+def search_query(target: str, q: Optional[str], filters: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The match for a search: the target's base query, each filter as an $in
+    (several values for one field match any of them), and q as a $text
+    search over the weighted text index.
+    """
+    match: Dict[str, Any] = dict(SEARCH_TARGETS[target]["base_query"])
+    for field, values in filters.items():
+        if values:
+            match[field] = {"$in": values}
+    if q:
+        match["$text"] = {"$search": q}
+    return match
+
+
+def facet_pipeline(target: str, match: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Facet counts over at most SEARCH_FACET_SCAN_LIMIT matches. The cap is
+    applied before $facet, so every facet reads the same bounded set once.
+    """
+    return [
+        {"$match": match},
+        {"$limit": settings.SEARCH_FACET_SCAN_LIMIT},
+        {"$facet": {field: _facet(field, is_array) for field, is_array in SEARCH_TARGETS[target]["facets"].items()}},
+    ]
+
+
+async def search(
+    target: str,
+    q: Optional[str],
+    filters: Dict[str, Any],
+    skip: int,
+    limit: int,
+    projection: Optional[Dict[str, int]] = None
+) -> Dict[str, Any]:
+    """
+    A page of matches, the total, and facet counts, from three queries run
+    concurrently. The page is a plain find so its sort can use an index:
+    newest first via (role, _id) / _id without q, by text score with it
+    (the text index narrows the candidates first).
+    """
+    config = SEARCH_TARGETS[target]
+    collection = get_collection(config["collection"])
+    match = search_query(target, q, filters)
+
+    projection = dict(projection or {"_id": 0})
+    if q:
+        projection["score"] = {"$meta": "textScore"}
+        sort = [("score", {"$meta": "textScore"}), ("_id", DESCENDING)]
+    else:
+        sort = [("_id", DESCENDING)]
+
+    results, total, facets = await asyncio.gather(
+        collection.find(match, projection).sort(sort).skip(skip).limit(limit).to_list(length=limit),
+        collection.count_documents(match),
+        collection.aggregate(facet_pipeline(target, match)).to_list(length=1),
+    )
+    facet = facets[0] if facets else {}
+    return {
+        "total": total,
+        "results": results,
+        "facets": {
+            field: [{"value": bucket["_id"], "count": bucket["count"]} for bucket in facet.get(field, [])]
+            for field in config["facets"]
+        },
+        # Facets count at most SEARCH_FACET_SCAN_LIMIT matches
+        "facets_truncated": total > settings.SEARCH_FACET_SCAN_LIMIT
+    }
@@ -0,0 +1,80 @@
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.database import get_collection
+from app.utils.etag import bump_version
+
+
+class SeatUnavailable(Exception):
+    """A seat could not be claimed; carries the HTTP status and message for the caller."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+async def claim_seat(session_id: str, projection: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+    """
+    Take one seat in an AMA session with a single conditional update, so the
+    capacity check and the increment cannot interleave with other claims.
+    Returns the session after the claim. Raises SeatUnavailable when the
+    session does not exist or is full.
+    """
+    ama_sessions_collection = get_collection("ama_sessions")
+    session = await ama_sessions_collection.find_one_and_update(
+        {
+            "_id": ObjectId(session_id),
+            "$expr": {"$lt": ["$registrants", "$maxRegistrants"]}
+        },
+        {"$inc": {"registrants": 1}, "$set": {"updated_at": datetime.utcnow()}},
+        projection=projection,
+        return_document=ReturnDocument.AFTER
+    )
+    if session is not None:
+        return session
+
+    # Only a failed claim pays for telling "full" apart from "missing"
+    if await ama_sessions_collection.find_one({"_id": ObjectId(session_id)}, {"_id": 1}) is None:
+        raise SeatUnavailable(404, "Session not found")
+    raise SeatUnavailable(400, "Session is full")
+
+
+async def release_seat(session_id: str) -> None:
+    """Give back a seat taken by claim_seat."""
+    await get_collection("ama_sessions").update_one(
+        {"_id": ObjectId(session_id), "registrants": {"$gt": 0}},
+        {"$inc": {"registrants": -1}, "$set": {"updated_at": datetime.utcnow()}}
+    )
+
+
+async def register_for_session(
+    session_id: str,
+    build_registration: Callable[[Dict[str, Any]], Dict[str, Any]],
+    projection: Optional[Dict[str, int]] = None
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Claim a seat and insert the document built from the claimed session by
+    build_registration. The unique (session_id, email) index rejects
+    duplicates; if the insert fails for any reason the seat is released
+    again. Returns (session, registration).
+    Raises SeatUnavailable for a missing or full session or a duplicate registration.
+    """
+    session = await claim_seat(session_id, projection)
+    registration = build_registration(session)
+    try:
+        result = await get_collection("registrations").insert_one(registration)
+    except DuplicateKeyError:
+        await release_seat(session_id)
+        raise SeatUnavailable(400, "You are already registered for this session")
+    except Exception:
+        await release_seat(session_id)
+        raise
+
+    registration["_id"] = result.inserted_id
+    await bump_version("ama_sessions")
+    return session, registration
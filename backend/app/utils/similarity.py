@@ -0,0 +1,189 @@
+import re
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.database import get_collection
+from app.utils.cache import LRUCache
+from app.utils.singleflight import SingleFlight
+
+# MinHash signature length, split into LSH bands of BAND_ROWS values. Two
+# questions become candidates when any band matches, which for 16 bands of
+# 4 rows is likely from a Jaccard similarity of about 0.5 upwards.
+NUM_PERM = 64
+BAND_ROWS = 4
+NUM_BANDS = NUM_PERM // BAND_ROWS
+
+# Shingles are character trigrams of the normalized text
+SHINGLE_SIZE = 3
+
+_PRIME = np.uint64(4294967311)  # smallest prime above 2**32
+_MAX_HASH = np.uint64(2 ** 32 - 1)
+
+# Fixed seed so signatures stay comparable across rebuilds and workers
+_rng = np.random.RandomState(1)
+_A = _rng.randint(1, 2 ** 31, size=NUM_PERM).astype(np.uint64)
+_B = _rng.randint(0, 2 ** 31, size=NUM_PERM).astype(np.uint64)
+
+_WORD = re.compile(r"\w+")
+STOPWORDS = frozenset(
+    "a an and are as at be can could do does for from how i in is it me my of on "
+    "or should the this to what when where which who why will with would you your".split()
+)
+
+
+def shingles(text: str) -> Set[int]:
+    """Hashed character trigrams of the text with case, punctuation and stopwords removed."""
+    words = [word for word in _WORD.findall(text.lower()) if word not in STOPWORDS]
+    normalized = " ".join(words)
+    if len(normalized) < SHINGLE_SIZE:
+        return {zlib.crc32(normalized.encode("utf-8"))} if normalized else set()
+    return {
+        zlib.crc32(normalized[i:i + SHINGLE_SIZE].encode("utf-8"))
+        for i in range(len(normalized) - SHINGLE_SIZE + 1)
+    }
+
+
+def signature(text: str) -> Optional[np.ndarray]:
+    """MinHash signature of the text, or None when nothing is left to compare."""
+    hashed = shingles(text)
+    if not hashed:
+        return None
+    values = np.fromiter(hashed, dtype=np.uint64, count=len(hashed))
+    # One universal hash per permutation over every shingle, minimum per row
+    permuted = (np.outer(_A, values) + _B[:, None]) % _PRIME & _MAX_HASH
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def question_text(title: str, content: Optional[str] = None) -> str:
+    return f"{title} {content or ''}"
+
+
+class SessionIndex:
+    """
+    MinHash/LSH index over one AMA session's questions. Signatures live in
+    one growing NumPy array; each band maps its slice of a signature to the
+    rows that share it, so a lookup only scores questions sharing a band.
+    """
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._signatures = np.zeros((64, NUM_PERM), dtype=np.uint32)
+        self._bands: List[Dict[bytes, List[int]]] = [defaultdict(list) for _ in range(NUM_BANDS)]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        # Signature array plus a rough per-question allowance for ids and buckets
+        return self._signatures.nbytes + len(self.ids) * (64 + NUM_BANDS * 48)
+
+    def add(self, question_id: str, text: str) -> None:
+        if question_id in self._rows:
+            return
+        sig = signature(text)
+        if sig is None:
+            return
+        row = len(self.ids)
+        if row == len(self._signatures):
+            self._signatures = np.resize(self._signatures, (row * 2, NUM_PERM))
+        self._signatures[row] = sig
+        self.ids.append(question_id)
+        self._rows[question_id] = row
+        for band, buckets in enumerate(self._bands):
+            buckets[sig[band * BAND_ROWS:(band + 1) * BAND_ROWS].tobytes()].append(row)
+
+    def query(self, text: str, limit: int, threshold: float) -> List[Tuple[str, float]]:
+        """(question id, estimated Jaccard similarity) pairs at or above threshold, best first."""
+        sig = signature(text)
+        if sig is None or not self.ids:
+            return []
+        candidates: Set[int] = set()
+        for band, buckets in enumerate(self._bands):
+            candidates.update(buckets.get(sig[band * BAND_ROWS:(band + 1) * BAND_ROWS].tobytes(), ()))
+        if not candidates:
+            return []
+        rows = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        scores = (self._signatures[rows] == sig).mean(axis=1)
+        order = np.argsort(-scores, kind="stable")[:limit]
+        return [
+            (self.ids[rows[i]], round(float(scores[i]), 3))
+            for i in order if scores[i] >= threshold
+        ]
+
+
+class SimilarityIndex:
+    """
+    Per-session SessionIndexes. A session's index is built from the database
+    on first use (concurrent first uses share one build), kept up to date as
+    questions are created, and dropped after SIMILARITY_IDLE_SECONDS without
+    use, when the session is deleted, or when the LRU bound is reached.
+    """
+
+    def __init__(self):
+        self._indexes = LRUCache(
+            max_entries=settings.SIMILARITY_MAX_SESSIONS,
+            max_bytes=settings.SIMILARITY_MAX_BYTES,
+            ttl=settings.SIMILARITY_IDLE_SECONDS,
+            sizeof=lambda index: index.nbytes
+        )
+        self._builds = SingleFlight()
+        self.builds = 0
+
+    def _touch(self, session_id: str, index: SessionIndex) -> None:
+        # Re-set to push the idle expiry forward and refresh the size estimate
+        self._indexes.set(session_id, index)
+
+    async def _build(self, session_id: str) -> SessionIndex:
+        index = SessionIndex()
+        cursor = get_collection("questionnaires").find(
+            {"session_id": session_id}, {"title": 1, "content": 1}
+        ).sort("_id", 1)
+        async for question in cursor:
+            index.add(str(question["_id"]), question_text(question.get("title", ""), question.get("content")))
+        self.builds += 1
+        self._touch(session_id, index)
+        return index
+
+    async def get(self, session_id: str) -> SessionIndex:
+        index = self._indexes.get(session_id)
+        if index is None:
+            return await self._builds.do(session_id, lambda: self._build(session_id))
+        self._touch(session_id, index)
+        return index
+
+    async def similar(
+        self,
+        session_id: str,
+        title: str,
+        content: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        index = await self.get(session_id)
+        return index.query(
+            question_text(title, content),
+            limit or settings.SIMILARITY_MAX_CANDIDATES,
+            settings.SIMILARITY_THRESHOLD
+        )
+
+    def add(self, question: Dict[str, Any]) -> None:
+        """Index a newly created question if its session's index is loaded."""
+        session_id = question.get("session_id")
+        index = self._indexes.get(session_id) if session_id else None
+        if index is not None:
+            index.add(str(question["_id"]), question_text(question.get("title", ""), question.get("content")))
+            self._touch(session_id, index)
+
+    def evict(self, session_id: str) -> None:
+        self._indexes.delete(session_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._indexes.stats(), "builds": self.builds}
+
+
+similarity_index = SimilarityIndex()
@@ -0,0 +1,56 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from fastapi import Request
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls with the same key onto one in-flight awaitable.
+    Callers arriving while a call is running share its result (or exception);
+    nothing is kept once it completes.
+
+    The shared call runs in its own task and every caller awaits it through
+    a shield, so a caller that is cancelled (e.g. its client disconnected)
+    stops waiting without cancelling the call for the others.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def _finish(self, key: Hashable, call: asyncio.Task) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # Mark the exception retrieved when every caller has gone
+        if not call.cancelled():
+            call.exception()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        if call is not None:
+            self.coalesced += 1
+        else:
+            self.calls += 1
+            call = asyncio.ensure_future(fn())
+            self._calls[key] = call
+            call.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(call)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls)
+        }
+
+
+def request_key(request: Request) -> str:
+    """Key a read by route path plus its query parameters in canonical order."""
+    params = "&".join(f"{name}={value}" for name, value in sorted(request.query_params.multi_items()))
+    return f"{request.method} {request.url.path}?{params}"
+
+
+# Shared by the hot read endpoints
+singleflight = SingleFlight()
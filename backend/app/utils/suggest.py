@@ -0,0 +1,303 @@
+import asyncio
+import heapq
+import logging
+import time
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.config import settings
+from app.database import get_collection
+from app.utils.cache import LRUCache
+from app.utils.etag import get_version
+from app.utils.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+SUGGEST_TYPES = ("mentor", "skill", "tool", "topic")
+
+# (type, ref): ref is the mentor's userId, or the normalized term itself
+Entry = Tuple[str, str]
+
+# Prefixes matching more keys than this are answered from the per-type lists
+# of the POPULAR_SIZE most popular entries instead of scanning the range
+BROAD_PREFIX_KEYS = 2000
+POPULAR_SIZE = 1000
+POPULAR_REFRESH_SECONDS = 30
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class PrefixIndex:
+    """
+    Sorted array of (text, type, ref) keys searched with bisect. Every entry is
+    keyed from each word start, so "learn" finds "Machine Learning". Each
+    entry has a popularity weight summed over the documents that contribute
+    it; a document's contributions are remembered so an update replaces them.
+
+    A short prefix can match a large share of the keys, so those lookups are
+    served from per-type lists of the most popular entries, refreshed at
+    most every POPULAR_REFRESH_SECONDS, and only scan the range when the
+    lists hold too few matches.
+    """
+
+    def __init__(self):
+        self._keys: List[Tuple[str, str, str]] = []
+        self._weights: Dict[Entry, int] = {}
+        self._display: Dict[Entry, str] = {}
+        self._documents: Dict[str, Dict[Entry, Tuple[str, int]]] = {}
+        self._popular: Dict[str, List[Tuple[Entry, List[str]]]] = {}
+        self._popular_version = -1
+        self._popular_at = 0.0
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._weights)
+
+    def _key_texts(self, display: str) -> List[str]:
+        words = normalize(display).split(" ")
+        return list(dict.fromkeys(" ".join(words[i:]) for i in range(len(words))))
+
+    def _add(self, entry: Entry, display: str, weight: int) -> None:
+        if entry in self._weights:
+            self._weights[entry] += weight
+            return
+        self._weights[entry] = weight
+        self._display[entry] = display
+        for text in self._key_texts(display):
+            insort(self._keys, (text, *entry))
+
+    def _remove(self, entry: Entry, weight: int) -> None:
+        remaining = self._weights.get(entry, 0) - weight
+        if remaining > 0:
+            self._weights[entry] = remaining
+            return
+        self._weights.pop(entry, None)
+        display = self._display.pop(entry, None)
+        for text in self._key_texts(display or ""):
+            position = bisect_left(self._keys, (text, *entry))
+            if position < len(self._keys) and self._keys[position] == (text, *entry):
+                del self._keys[position]
+
+    def load(self, documents: Iterable[Tuple[str, Dict[Entry, Tuple[str, int]]]]) -> None:
+        """Fill an empty index from (document_id, entries) pairs, sorting the keys once."""
+        for document_id, entries in documents:
+            if not entries:
+                continue
+            self._documents[document_id] = entries
+            for entry, (display, weight) in entries.items():
+                self._weights[entry] = self._weights.get(entry, 0) + weight
+                self._display.setdefault(entry, display)
+        self._keys = sorted(
+            (text, *entry) for entry, display in self._display.items() for text in self._key_texts(display)
+        )
+        self.version += 1
+
+    def set_document(self, document_id: str, entries: Dict[Entry, Tuple[str, int]]) -> None:
+        """Replace what document_id contributes with entries ({(type, ref): (display, weight)})."""
+        previous = self._documents.pop(document_id, {})
+        if previous == entries:
+            if entries:
+                self._documents[document_id] = entries
+            return
+        for entry, (_, weight) in previous.items():
+            self._remove(entry, weight)
+        for entry, (display, weight) in entries.items():
+            self._add(entry, display, weight)
+        if entries:
+            self._documents[document_id] = entries
+        self.version += 1
+
+    def _rank(self, entry: Entry) -> Tuple[int, int, str]:
+        display = self._display[entry]
+        return (-self._weights[entry], len(display), display)
+
+    def _popular_entries(self, type_: str) -> List[Tuple[Entry, List[str]]]:
+        """The most popular entries of a type, best first, with their key texts."""
+        if self._popular_version != self.version and time.monotonic() - self._popular_at >= POPULAR_REFRESH_SECONDS:
+            by_type: Dict[str, List[Entry]] = {}
+            for entry in self._weights:
+                by_type.setdefault(entry[0], []).append(entry)
+            self._popular = {
+                kind: [
+                    (entry, self._key_texts(self._display[entry]))
+                    for entry in heapq.nsmallest(POPULAR_SIZE, entries, key=self._rank)
+                ]
+                for kind, entries in by_type.items()
+            }
+            self._popular_version, self._popular_at = self.version, time.monotonic()
+        return self._popular.get(type_, [])
+
+    def _popular_matches(self, prefix: str, limit: int, type_: str) -> Optional[List[Entry]]:
+        """
+        The best limit entries of a type matching prefix, taken from the
+        popular list, or None when the list may not contain them all.
+        """
+        popular = self._popular_entries(type_)
+        matches = []
+        for entry, texts in popular:
+            # The list may lag behind writes; skip entries removed since
+            if entry in self._weights and any(text.startswith(prefix) for text in texts):
+                matches.append(entry)
+                if len(matches) == limit:
+                    return matches
+        return matches if len(popular) < POPULAR_SIZE else None
+
+    def suggest(self, prefix: str, limit: int, types: Iterable[str] = SUGGEST_TYPES) -> List[Dict[str, Any]]:
+        """Entries with a word starting with prefix, most popular first."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        types = set(types)
+        start = bisect_left(self._keys, (prefix,))
+        end = bisect_left(self._keys, (prefix + "\uffff",))
+
+        matches = set()
+        scan = end - start <= BROAD_PREFIX_KEYS
+        if not scan:
+            for type_ in types:
+                popular = self._popular_matches(prefix, limit, type_)
+                if popular is None:
+                    scan = True
+                    break
+                matches.update(popular)
+        if scan:
+            matches = set()
+            for position in range(start, end):
+                text, type_, ref = self._keys[position]
+                if type_ in types:
+                    matches.add((type_, ref))
+
+        best = heapq.nsmallest(limit, matches, key=self._rank)
+        return [
+            {
+                "text": self._display[entry],
+                "type": entry[0],
+                **({"userId": entry[1]} if entry[0] == "mentor" else {}),
+                "count": self._weights[entry]
+            }
+            for entry in best
+        ]
+
+
+def profile_entries(profile: Dict[str, Any]) -> Dict[Entry, Tuple[str, int]]:
+    """A mentor's name (weighted by sessions completed) and each of their skills and tools."""
+    entries: Dict[Entry, Tuple[str, int]] = {}
+    if profile.get("role") != "mentor":
+        return entries
+    name = (profile.get("name") or "").strip()
+    if name and profile.get("userId"):
+        sessions = (profile.get("stats") or {}).get("sessionsCompleted") or 0
+        entries[("mentor", profile["userId"])] = (name, 1 + int(sessions))
+    for field, type_ in (("skills", "skill"), ("tools", "tool")):
+        for term in profile.get(field) or []:
+            if isinstance(term, str) and term.strip():
+                entries.setdefault((type_, normalize(term)), (term.strip(), 1))
+    return entries
+
+
+def session_entries(session: Dict[str, Any]) -> Dict[Entry, Tuple[str, int]]:
+    entries: Dict[Entry, Tuple[str, int]] = {}
+    for term in session.get("topics") or []:
+        if isinstance(term, str) and term.strip():
+            entries.setdefault(("topic", normalize(term)), (term.strip(), 1))
+    return entries
+
+
+PROFILE_FIELDS = {"_id": 0, "userId": 1, "name": 1, "role": 1, "skills": 1, "tools": 1, "stats.sessionsCompleted": 1}
+SESSION_FIELDS = {"_id": 0, "sessionId": 1, "topics": 1}
+
+
+class Suggestions:
+    """
+    Typeahead over mentor names, skills, tools and session topics. The index
+    is built from the database on first use, updated in place by this
+    worker's profile and session writes, and rebuilt every
+    SUGGEST_REBUILD_SECONDS when either collection's write version has moved,
+    which picks up writes made on other workers.
+    """
+
+    def __init__(self):
+        self.index: Optional[PrefixIndex] = None
+        self._versions: Optional[Tuple[int, int]] = None
+        self._builds = SingleFlight()
+        self._results = LRUCache(max_entries=5000, ttl=settings.SUGGEST_REBUILD_SECONDS)
+        self._task: Optional[asyncio.Task] = None
+        self.builds = 0
+
+    async def _versions_now(self) -> Tuple[int, int]:
+        return (await get_version("userprofile"), await get_version("sessions"))
+
+    async def _build(self) -> PrefixIndex:
+        versions = await self._versions_now()
+        documents = [
+            (f"profile:{profile.get('userId')}", profile_entries(profile))
+            async for profile in get_collection("userprofile").find({"role": "mentor"}, PROFILE_FIELDS)
+        ]
+        documents += [
+            (f"session:{session.get('sessionId')}", session_entries(session))
+            async for session in get_collection("sessions").find({}, SESSION_FIELDS)
+        ]
+        index = PrefixIndex()
+        index.load(documents)
+        self.index, self._versions = index, versions
+        self._results.clear()
+        self.builds += 1
+        return index
+
+    async def get_index(self) -> PrefixIndex:
+        if self.index is not None:
+            return self.index
+        return await self._builds.do("build", self._build)
+
+    async def suggest(self, prefix: str, limit: int, types: Iterable[str] = SUGGEST_TYPES) -> List[Dict[str, Any]]:
+        index = await self.get_index()
+        types = tuple(sorted(set(types)))
+        key = (index.version, normalize(prefix), types, limit)
+        results = self._results.get(key)
+        if results is None:
+            results = index.suggest(prefix, limit, types)
+            self._results.set(key, results)
+        return results
+
+    async def refresh_profile(self, user_id: str) -> None:
+        """Re-index one profile after a write; a no-op until the index is built."""
+        if self.index is None or not user_id:
+            return
+        profile = await get_collection("userprofile").find_one({"userId": user_id}, PROFILE_FIELDS)
+        self.index.set_document(f"profile:{user_id}", profile_entries(profile or {}))
+
+    async def refresh_session(self, session_id: str) -> None:
+        if self.index is None or not session_id:
+            return
+        session = await get_collection("sessions").find_one({"sessionId": session_id}, SESSION_FIELDS)
+        self.index.set_document(f"session:{session_id}", session_entries(session or {}))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.SUGGEST_REBUILD_SECONDS)
+            try:
+                if self.index is not None and await self._versions_now() != self._versions:
+                    await self._builds.do("build", self._build)
+            except Exception as e:
+                logger.error(f"Suggestion index rebuild failed: {str(e)}")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self.index) if self.index is not None else 0,
+            "builds": self.builds,
+            "results_cache": self._results.stats()
+        }
+
+
+suggestions = Suggestions()
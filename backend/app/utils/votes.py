@@ -0,0 +1,45 @@
+from typing import List, Set
+
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+from app.database import get_collection
+
+# Kinds of documents that can be upvoted
+VOTE_TARGETS = ("question", "answer")
+
+
+async def toggle_vote(target_type: str, target_id: ObjectId, user_id: str) -> int:
+    """
+    Flip user_id's upvote on a target and return the change to its count:
+    +1 when the vote was added, -1 when it was removed. A repeat vote is
+    detected by the unique (user_id, target_type, target_id) index on insert,
+    so neither path needs a read first.
+    """
+    votes_collection = get_collection("votes")
+    try:
+        await votes_collection.insert_one({
+            "user_id": user_id,
+            "target_type": target_type,
+            "target_id": target_id
+        })
+        return 1
+    except DuplicateKeyError:
+        pass
+
+    # Concurrent toggles may race to remove the same vote; only the one that deletes it counts
+    result = await votes_collection.delete_one({
+        "user_id": user_id,
+        "target_type": target_type,
+        "target_id": target_id
+    })
+    return -result.deleted_count
+
+
+async def voted_ids(target_type: str, user_id: str, target_ids: List[ObjectId]) -> Set[str]:
+    """Which of target_ids user_id has upvoted, from one query covered by the vote index."""
+    cursor = get_collection("votes").find(
+        {"user_id": user_id, "target_type": target_type, "target_id": {"$in": target_ids}},
+        {"target_id": 1, "_id": 0}
+    )
+    return {str(vote["target_id"]) async for vote in cursor}
@@ -0,0 +1,137 @@
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import ASCENDING
+from pymongo.errors import DuplicateKeyError
+
+from app.database import get_collection
+from app.utils.etag import bump_version
+from app.utils.seats import SeatUnavailable, claim_seat, release_seat
+
+WAITLIST_ORDER = [("_id", ASCENDING)]
+
+
+async def join_waitlist(session_id: str, entry: Dict[str, Any]) -> int:
+    """
+    Queue entry for a full session and return its 1-based position.
+    ObjectIds increase with arrival, so _id order is arrival order.
+    Raises DuplicateKeyError if the email is already waiting for this session.
+    """
+    waitlist_collection = get_collection("waitlist")
+    entry.update({"session_id": session_id, "created_at": datetime.utcnow()})
+    result = await waitlist_collection.insert_one(entry)
+    return await waitlist_collection.count_documents({
+        "session_id": session_id,
+        "_id": {"$lte": result.inserted_id}
+    })
+
+
+async def leave_waitlist(session_id: str, email: str) -> bool:
+    result = await get_collection("waitlist").delete_one({"session_id": session_id, "email": email})
+    return result.deleted_count > 0
+
+
+async def waitlist_position(session_id: str, email: str) -> Optional[int]:
+    """1-based position of email on a session's waitlist, or None if not waiting."""
+    waitlist_collection = get_collection("waitlist")
+    entry = await waitlist_collection.find_one({"session_id": session_id, "email": email}, {"_id": 1})
+    if entry is None:
+        return None
+    return await waitlist_collection.count_documents({
+        "session_id": session_id,
+        "_id": {"$lte": entry["_id"]}
+    })
+
+
+async def promote_from_waitlist(
+    session_id: str,
+    session: Dict[str, Any],
+    build_registration: Callable[[Dict[str, Any], Dict[str, Any]], Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """
+    Hand a seat the caller already holds to the head of the waitlist and
+    return their registration, or release the seat and return None when
+    nobody is waiting.
+
+    The registration is inserted before the waitlist entry is removed, so a
+    crash in between leaves the person registered and still queued (the
+    next promotion skips them) rather than losing the seat. Concurrent
+    promoters that pick the same head are told apart by the unique
+    (session_id, email) registration index; the loser moves on to the next
+    entry with its seat. After releasing, the waitlist is checked again, so
+    someone who joined while the seat was being released is not left
+    waiting next to a free seat.
+    """
+    registrations_collection = get_collection("registrations")
+    waitlist_collection = get_collection("waitlist")
+    while True:
+        entry = await waitlist_collection.find_one({"session_id": session_id}, sort=WAITLIST_ORDER)
+        if entry is None:
+            await release_seat(session_id)
+            await bump_version("ama_sessions")
+            if await waitlist_collection.find_one({"session_id": session_id}, {"_id": 1}) is None:
+                return None
+            try:
+                await claim_seat(session_id)
+            except SeatUnavailable:
+                # Someone else took the seat back; a joiner's own claim covers them
+                return None
+            continue
+
+        registration = build_registration(entry, session)
+        try:
+            result = await registrations_collection.insert_one(registration)
+        except DuplicateKeyError:
+            # Already registered (through another path or a concurrent promotion)
+            await waitlist_collection.delete_one({"_id": entry["_id"]})
+            continue
+        await waitlist_collection.delete_one({"_id": entry["_id"]})
+        registration["_id"] = result.inserted_id
+        # A seat claimed by fill_from_waitlist or the re-claim above changed registrants
+        await bump_version("ama_sessions")
+        return registration
+
+
+async def fill_from_waitlist(
+    session_id: str,
+    build_registration: Callable[[Dict[str, Any], Dict[str, Any]], Dict[str, Any]],
+    projection: Optional[Dict[str, int]] = None
+) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Claim a free seat, if there is one, for the head of the waitlist.
+    Returns (session, promoted registration), or (None, None) when the
+    session is full or missing.
+    """
+    try:
+        session = await claim_seat(session_id, projection)
+    except SeatUnavailable:
+        return None, None
+    return session, await promote_from_waitlist(session_id, session, build_registration)
+
+
+async def cancel_registration(
+    session_id: str,
+    email: str,
+    build_registration: Callable[[Dict[str, Any], Dict[str, Any]], Dict[str, Any]],
+    projection: Optional[Dict[str, int]] = None
+) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Delete a registration and hand its seat to the head of the waitlist.
+    build_registration(entry, session) turns the waitlist entry into a
+    registration document. Returns (session, promoted registration); the
+    registration is None when nobody was waiting and the seat was released.
+    Raises LookupError if there was no registration to cancel.
+
+    The deleted registration's seat passes straight to promote_from_waitlist,
+    so registrants stays unchanged when a seat is transferred.
+    """
+    cancelled = await get_collection("registrations").find_one_and_delete(
+        {"session_id": session_id, "email": email},
+        projection={"_id": 1}
+    )
+    if cancelled is None:
+        raise LookupError("Registration not found")
+
+    session = await get_collection("ama_sessions").find_one({"_id": ObjectId(session_id)}, projection)
+    return session, await promote_from_waitlist(session_id, session or {}, build_registration)
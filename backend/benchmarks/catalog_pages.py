@@ -0,0 +1,67 @@
+"""
+Session catalog page latency at scale (user-029): seeds N sessions (default
+100,000) and times single pages of /sessions/one-on-one/all at increasing
+depth, bypassing the shared cache.
+
+  cursor   the catalog's keyset page (_load_catalog with next_cursor), what
+           the frontend's "Load more" requests
+  skip     the same page fetched with skip() plus the same mentor join,
+           for comparison
+
+    python -m benchmarks.catalog_pages [--sessions 100000] [--page-size 24] [--iterations 50]
+
+Expected: cursor latency flat across depths; skip growing with the offset.
+"""
+import argparse
+
+from app.database import get_collection
+from app.routes.session import CATALOG_SORT, _catalog_query, _load_catalog
+from app.utils.profile_cache import get_profiles
+from app.utils.projection import build_projection
+from benchmarks.common import measure, report, run, seed_catalog, use_bench_database
+
+DEPTHS = (1, 10, 100, 1000)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--mentors", type=int, default=2_000)
+    parser.add_argument("--page-size", type=int, default=24)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    db = await use_bench_database()
+    await seed_catalog(db, mentors=args.mentors, sessions=args.sessions)
+
+    query = _catalog_query("one-on-one", None, None, None, None, None)
+    session_projection = build_projection("sessions", "card", required=("_id", "userId"))
+    mentor_projection = build_projection("userprofile", "card", required=("userId",))
+
+    def load(cursor):
+        return lambda: _load_catalog(query, cursor, args.page_size, session_projection, mentor_projection)
+
+    def skip(page: int):
+        async def fetch():
+            sessions = await get_collection("sessions").find(query, session_projection).sort(CATALOG_SORT) \
+                .skip((page - 1) * args.page_size).limit(args.page_size).to_list(length=args.page_size)
+            # The same mentor join as the cursor page, so only the session query differs
+            await get_profiles(list(set(session["userId"] for session in sessions)))
+        return fetch
+
+    # Walk the catalog once, as "Load more" would, to get each depth's cursor
+    depths = [depth for depth in DEPTHS if (depth - 1) * args.page_size < args.sessions // 2]
+    cursors, cursor = {1: None}, None
+    for page in range(2, depths[-1] + 1):
+        cursor = (await load(cursor)())["next_cursor"]
+        cursors[page] = cursor
+
+    rows = {}
+    for depth in depths:
+        rows[f"page {depth}, cursor"] = await measure(load(cursors[depth]), args.iterations)
+        rows[f"page {depth}, skip"] = await measure(skip(depth), args.iterations)
+    report(f"one-on-one catalog, {args.sessions} sessions, {args.page_size} per page", rows)
+
+
+if __name__ == "__main__":
+    run(main)
@@ -0,0 +1,202 @@
+"""
+Shared setup for the benchmark scripts in this package.
+
+Each script is run from backend/ as ``python -m benchmarks.<name>`` against
+the MongoDB at MONGODB_URI (and Redis at REDIS_URL where relevant). They
+write to a separate database, BENCH_DATABASE (default mentorhood_bench),
+which is dropped first, never to the application's own database.
+"""
+import asyncio
+import os
+import random
+import statistics
+import time
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app import database
+from app.database import INDEXES
+
+BENCH_DATABASE = os.getenv("BENCH_DATABASE", "mentorhood_bench")
+
+
+async def use_bench_database(drop: bool = True):
+    """Point get_collection() at the benchmark database and create the app's indexes there."""
+    if drop:
+        await database.client.drop_database(BENCH_DATABASE)
+    database.db = database.client[BENCH_DATABASE]
+    for collection_name, indexes in INDEXES.items():
+        await database.db[collection_name].create_indexes(indexes)
+    return database.db
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Latency percentiles in milliseconds from samples in seconds."""
+    ordered = sorted(samples)
+
+    def percentile(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 3)
+
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+async def measure(fn: Callable[[], Awaitable], iterations: int, warmup: int = 5) -> Dict[str, float]:
+    for _ in range(warmup):
+        await fn()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+def report(title: str, rows: Dict[str, Dict[str, float]]) -> None:
+    print(f"\n== {title}")
+    for name, stats in rows.items():
+        print(f"{name:<40} " + "  ".join(f"{key}={value}" for key, value in stats.items()))
+
+
+def run(main: Callable[[], Awaitable]) -> None:
+    asyncio.run(main())
+
+
+@asynccontextmanager
+async def running_app():
+    """The FastAPI app with its startup and shutdown hooks run around the block."""
+    from app.main import app
+
+    await app.router.startup()
+    try:
+        yield app
+    finally:
+        await app.router.shutdown()
+
+
+async def request(
+    app,
+    method: str,
+    path: str,
+    headers: Optional[Dict[str, str]] = None,
+    body: bytes = b""
+) -> Tuple[int, Dict[str, str], bytes]:
+    """
+    Call the ASGI app in-process, with no HTTP client or socket in the way.
+    Returns (status, headers, body) with the body as sent (e.g. compressed).
+    """
+    route, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": route,
+        "raw_path": route.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()],
+        "client": ("127.0.0.1", 0),
+        "server": ("benchmark", 80),
+    }
+    received = False
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.Event().wait()
+
+    status, response_headers, chunks = 0, {}, []
+
+    async def send(message):
+        nonlocal status, response_headers
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            response_headers = {name.decode(): value.decode() for name, value in message["headers"]}
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, response_headers, b"".join(chunks)
+
+
+# Documents shaped like production ones, with the long fields listing screens don't show
+
+WORDS = (
+    "career growth interview resume startup scaling teams mentoring hiring remote product analytics "
+    "design systems leadership feedback roadmap architecture cloud data engineering strategy"
+).split()
+
+
+def _text(words: int) -> str:
+    return " ".join(random.choices(WORDS, k=words)).capitalize() + "."
+
+
+def mentor_profile(i: int) -> Dict[str, Any]:
+    return {
+        "userId": str(uuid.UUID(int=i)),
+        "name": f"Mentor {i}",
+        "email": f"mentor{i}@bench.test",
+        "role": "mentor",
+        "profilePhoto": "https://mentorhood-assets.s3.amazonaws.com/avatars/default-avatar.png",
+        "headline": _text(8),
+        "bio": _text(120),
+        "primaryExpertise": random.choice(["Data Science", "Product Management", "Design", "Software Engineering"]),
+        "skills": random.sample(WORDS, 6),
+        "tools": random.sample(WORDS, 4),
+        "disciplines": random.sample(WORDS, 3),
+        "mentoringTopics": random.sample(WORDS, 5),
+        "experience": [
+            {"title": _text(3), "company": f"Company {n}", "description": _text(60), "duration": "2 years"}
+            for n in range(4)
+        ],
+        "projects": [{"title": _text(3), "description": _text(50)} for _ in range(3)],
+        "achievements": [{"title": _text(3), "description": _text(30), "date": "2023-01-01"} for _ in range(2)],
+        "stats": {"sessionsCompleted": random.randint(0, 200), "totalHours": random.randint(0, 400)},
+        "linkedinUrl": f"https://linkedin.com/in/mentor{i}",
+        "created_at": datetime.utcnow() - timedelta(days=i % 365),
+    }
+
+
+def catalog_session(i: int, mentor_count: int) -> Dict[str, Any]:
+    return {
+        "sessionId": str(uuid.UUID(int=10 ** 9 + i)),
+        "userId": str(uuid.UUID(int=i % mentor_count)),
+        "sessionName": _text(4),
+        "description": _text(80),
+        "duration": "60",
+        "sessionType": "one-on-one" if i % 2 else "group-session",
+        "topics": random.sample(WORDS, 3),
+        "isPaid": bool(i % 3),
+        "price": str(random.choice([0, 25, 50, 100])),
+        "tokens": random.choice([0, 100, 250]),
+        "timeSlots": [
+            {
+                "day": day,
+                "available": True,
+                "timeRanges": [{"start": f"{hour:02d}:00", "end": f"{hour + 1:02d}:00"} for hour in range(9, 17)],
+            }
+            for day in ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday")
+        ],
+        "created_at": datetime.utcnow(),
+    }
+
+
+async def seed_catalog(db, mentors: int, sessions: int) -> None:
+    random.seed(1)
+    await db.userprofile.insert_many([mentor_profile(i) for i in range(mentors)])
+    for start in range(0, sessions, 5000):
+        await db.sessions.insert_many([
+            catalog_session(i, mentors) for i in range(start, min(start + 5000, sessions))
+        ])
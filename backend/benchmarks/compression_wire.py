@@ -0,0 +1,105 @@
+"""
+Response compression (user-035): bytes on the wire and CPU cost for the
+catalog and mentor list payloads, per encoding and level, and the CPU a
+hit saves when the compressed copy comes from the precompressed cache.
+
+    python -m benchmarks.compression_wire [--sessions 100] [--mentors 500]
+
+The payloads are built in memory with the benchmark seed documents and
+serialized with app.utils.responses.dumps, as the routes do; no database
+is needed (app.config still wants MONGODB_URI and DATABASE_NAME set).
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from app.utils.compression import CompressionMiddleware, compress, compression_stats, precompressed_cache
+from app.utils.responses import dumps
+from benchmarks.common import catalog_session, mentor_profile, request
+
+CARD = ("userId", "name", "profilePhoto", "headline", "primaryExpertise", "role")
+
+
+def payloads(sessions: int, mentors: int) -> dict:
+    random.seed(1)
+    profiles = [mentor_profile(i) for i in range(mentors)]
+    page = [catalog_session(i, mentors) for i in range(sessions)]
+    page_mentors = {session["userId"] for session in page}
+    return {
+        f"catalog page ({sessions})": dumps({
+            "status": "success",
+            "sessions": page,
+            "mentors": [profile for profile in profiles if profile["userId"] in page_mentors],
+            "next_cursor": "x" * 40,
+        }),
+        f"/mentors/all full ({mentors})": dumps({"status": "success", "mentors": profiles}),
+        f"/mentors/all card ({mentors})": dumps({
+            "status": "success",
+            "mentors": [{field: profile[field] for field in CARD} for profile in profiles],
+        }),
+    }
+
+
+def cpu_ms(fn, min_seconds: float = 0.5) -> float:
+    runs, started = 0, time.process_time()
+    while time.process_time() - started < min_seconds:
+        fn()
+        runs += 1
+    return (time.process_time() - started) / runs * 1000
+
+
+def body_app(body: bytes):
+    """An ASGI app returning body as JSON, to drive the middleware on its own."""
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+    return app
+
+
+async def middleware_cpu(body: bytes, encoding: str, iterations: int = 50) -> tuple:
+    """(first request CPU ms, mean cached-hit CPU ms) through CompressionMiddleware on a cacheable route."""
+    app = CompressionMiddleware(body_app(body))
+    path = "/sessions/one-on-one/all"
+    precompressed_cache.clear()
+    started = time.process_time()
+    await request(app, "GET", path, {"accept-encoding": encoding})
+    first = (time.process_time() - started) * 1000
+    hits_before = compression_stats["cache_hits"]
+    started = time.process_time()
+    for _ in range(iterations):
+        await request(app, "GET", path, {"accept-encoding": encoding})
+    hit = (time.process_time() - started) * 1000 / iterations
+    assert compression_stats["cache_hits"] - hits_before == iterations
+    return first, hit
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--mentors", type=int, default=500)
+    args = parser.parse_args()
+
+    bodies = payloads(args.sessions, args.mentors)
+    print(f"{'payload':<28} {'encoding':<9} {'bytes':>10} {'ratio':>7} {'CPU ms':>8}")
+    for name, body in bodies.items():
+        print(f"{name:<28} {'identity':<9} {len(body):>10} {'':>7} {'':>8}")
+        for encoding, level in (("gzip", 1), ("gzip", 6), ("gzip", 9), ("br", 4), ("br", 9), ("br", 11)):
+            compressed = compress(body, encoding, level)
+            cost = cpu_ms(lambda: compress(body, encoding, level))
+            label = f"{encoding}-{level}"
+            print(f"{'':<28} {label:<9} {len(compressed):>10} {len(compressed) / len(body):>7.1%} {cost:>8.2f}")
+
+    print(f"\n{'payload':<28} {'encoding':<9} {'first ms':>9} {'cached hit ms':>14}")
+    for name, body in bodies.items():
+        for encoding in ("gzip", "br"):
+            first, hit = await middleware_cpu(body, encoding)
+            print(f"{name:<28} {encoding:<9} {first:>9.2f} {hit:>14.3f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
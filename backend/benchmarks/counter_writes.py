@@ -0,0 +1,90 @@
+"""
+Write-behind counters (user-042): database writes issued for a burst of
+upvotes on a few hot questions, one write per increment versus the
+CounterBuffer's coalesced bulk_write, plus a check that no increment is
+lost once the buffer is stopped.
+
+    python -m benchmarks.counter_writes [--increments 50000] [--questions 5] [--seconds 10]
+                                        [--flush-ms 250] [--flush-threshold 1000]
+
+Increments are spread evenly over --seconds. Staleness on other workers is
+bounded by --flush-ms (COUNTER_FLUSH_INTERVAL_MS in the app).
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+from app.database import get_collection
+from app.utils.counters import CounterBuffer
+from app.utils.hot import UPVOTE_POINTS
+from benchmarks.common import run, use_bench_database
+
+
+async def seed(db, questions: int) -> list:
+    result = await db.questionnaires.insert_many([
+        {"session_id": "bench-ama", "title": f"Question {i}", "upvotes": 0,
+         "hot_score": 0.0, "hot_updated_at": datetime.utcnow()}
+        for i in range(questions)
+    ])
+    return result.inserted_ids
+
+
+async def paced(increments: int, seconds: float, fn) -> float:
+    """Call fn(i) increments times spread over seconds; returns the elapsed time."""
+    started = time.perf_counter()
+    batch = max(1, increments // max(1, int(seconds * 100)))
+    for start in range(0, increments, batch):
+        await asyncio.gather(*(fn(i) for i in range(start, min(start + batch, increments))))
+        target = started + seconds * min(start + batch, increments) / increments
+        await asyncio.sleep(max(0.0, target - time.perf_counter()))
+    return time.perf_counter() - started
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--increments", type=int, default=50_000)
+    parser.add_argument("--questions", type=int, default=5)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--flush-ms", type=int, default=250)
+    parser.add_argument("--flush-threshold", type=int, default=1000)
+    args = parser.parse_args()
+
+    db = await use_bench_database()
+    collection = get_collection("questionnaires")
+
+    # One $inc per upvote
+    ids = await seed(db, args.questions)
+    direct = await paced(
+        args.increments, args.seconds,
+        lambda i: collection.update_one({"_id": ids[i % len(ids)]}, {"$inc": {"upvotes": 1}})
+    )
+    await db.questionnaires.delete_many({})
+
+    # The same upvotes through the write-behind buffer, as the route does
+    ids = await seed(db, args.questions)
+    buffer = CounterBuffer(
+        "questionnaires", "upvotes",
+        flush_interval_ms=args.flush_ms, flush_threshold=args.flush_threshold, hot_points=UPVOTE_POINTS
+    )
+    buffer.start()
+    buffered = await paced(args.increments, args.seconds, lambda i: buffer.add(ids[i % len(ids)], 1))
+    await buffer.stop()
+    stats = buffer.stats()
+    stored = sum([doc["upvotes"] async for doc in db.questionnaires.find({}, {"upvotes": 1})])
+
+    print(f"{args.increments} upvotes on {args.questions} questions over ~{args.seconds:.0f}s")
+    print(f"  direct $inc   writes={args.increments:>8}  writes/sec={args.increments / direct:>10.1f}")
+    print(
+        f"  write-behind  writes={stats['documents_written']:>8}  writes/sec={stats['documents_written'] / buffered:>10.1f}"
+        f"  bulk_writes={stats['flushes']}  saved={stats['writes_saved']}"
+        f" ({stats['writes_saved'] / args.increments:.1%})"
+    )
+    print(f"  staleness bound on other workers: {args.flush_ms} ms")
+    print(f"  stored upvotes after stop: {stored} (expected {args.increments})")
+    if stored != args.increments:
+        raise SystemExit("increments were lost")
+
+
+if __name__ == "__main__":
+    run(main)
@@ -0,0 +1,124 @@
+"""
+Live Q&A fan-out under load (user-047): S subscribers (default 5,000) on one
+AMA session's channel, fed by the change-stream watcher, while questions
+are created, upvoted in bursts and answered, and the hot_score decay job
+rewrites every live question.
+
+    python -m benchmarks.live_fanout [--subscribers 5000] [--questions 200] [--upvotes 2000]
+
+MONGODB_URI must point at a replica set (change streams need one; a
+single-node set started with --replSet is enough). Reports write-to-
+delivery latency over every subscriber, events per subscriber by type,
+dropped events, and how many events the decay pass produced (expected 0).
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+from datetime import datetime
+
+import orjson
+
+from app.utils.hot import decay_scores
+from app.utils.live import broker, change_feed, session_channel
+from benchmarks.common import report, run, summarize, use_bench_database
+
+SESSION_ID = "bench-live-session"
+
+
+async def subscriber(queue: asyncio.Queue, latencies: list, kinds: Counter, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        try:
+            data = await asyncio.wait_for(queue.get(), timeout=0.5)
+        except asyncio.TimeoutError:
+            continue
+        event = orjson.loads(data)
+        kinds[event["type"]] += 1
+        if event["type"] == "question_created":
+            latencies.append(time.time() - float(event["question"]["title"]))
+
+
+async def settle(seconds: float = 2.0) -> None:
+    """Wait for the stream and the coalescing flusher to deliver what was written."""
+    await asyncio.sleep(seconds)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subscribers", type=int, default=5000)
+    parser.add_argument("--questions", type=int, default=200)
+    parser.add_argument("--upvotes", type=int, default=2000)
+    args = parser.parse_args()
+
+    db = await use_bench_database()
+    broker.start()
+    change_feed.start()
+    await asyncio.sleep(1)
+
+    channel = session_channel(SESSION_ID)
+    latencies: list = []
+    kinds: Counter = Counter()
+    stop = asyncio.Event()
+    tasks = [
+        asyncio.create_task(subscriber(broker.subscribe(channel), latencies, kinds, stop))
+        for _ in range(args.subscribers)
+    ]
+
+    # Questions; the title carries the send time for the latency measurement
+    ids = []
+    for _ in range(args.questions):
+        result = await db.questionnaires.insert_one({
+            "session_id": SESSION_ID,
+            "title": repr(time.time()),
+            "content": "",
+            "upvotes": 0,
+            "answers": 0,
+            "hot_score": 1.0,
+            "hot_updated_at": datetime.utcnow(),
+            "timestamp": datetime.utcnow(),
+        })
+        ids.append(result.inserted_id)
+        await asyncio.sleep(0.005)
+    await settle()
+
+    # A burst of upvotes spread over the questions, coalesced by the broker
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        db.questionnaires.update_one({"_id": ids[i % len(ids)]}, {"$inc": {"upvotes": 1}})
+        for i in range(args.upvotes)
+    ))
+    burst_seconds = time.perf_counter() - started
+
+    # One answer per question: the insert plus the question's answer count
+    for question_id in ids:
+        await db.answers.insert_one({"question_id": str(question_id), "content": "answer", "upvotes": 0})
+        await db.questionnaires.update_one({"_id": question_id}, {"$inc": {"answers": 1}})
+    await settle()
+
+    before_decay = sum(kinds.values())
+    published_before = broker.published
+    updated = await decay_scores()
+    await settle()
+    decay_events = sum(kinds.values()) - before_decay
+
+    stop.set()
+    await asyncio.gather(*tasks)
+    change_feed.stop()
+    broker.stop()
+
+    report(
+        f"question_created write-to-delivery, {args.subscribers} subscribers",
+        {"latency": summarize(latencies)}
+    )
+    per_subscriber = {kind: round(count / args.subscribers, 2) for kind, count in kinds.items()}
+    print(f"\nevents per subscriber by type: {per_subscriber}")
+    print(f"upvote burst: {args.upvotes} writes in {burst_seconds:.2f}s")
+    print(f"broker: {broker.stats()}")
+    print(
+        f"decay pass rewrote {updated} questions -> {decay_events} deliveries, "
+        f"{broker.published - published_before} publishes (expected 0)"
+    )
+
+
+if __name__ == "__main__":
+    run(main)
@@ -0,0 +1,110 @@
+"""
+Overbooking check (user-036): N concurrent clients (default 2,000) register
+for one AMA session of S seats (default 50) through the same code paths as
+POST /registrations and POST /registrations/waitlist, while some clients
+retry with the same email and some registered users cancel. Afterwards the
+session's registrants counter must equal its registrations, never exceed
+its seats, and no email may be both registered and waitlisted.
+
+    python -m benchmarks.overbooking [--clients 2000] [--seats 50] [--rounds 5]
+
+Exits non-zero when an invariant is broken. Confirmation emails are queued
+without a worker, so none are sent.
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+
+from app.utils import registration_service
+from app.utils.notifications import notifications
+from app.utils.seats import SeatUnavailable
+from benchmarks.common import run, use_bench_database
+
+
+async def client(session_id: str, i: int, waitlist: bool, outcomes: Counter) -> None:
+    data = {"session_id": session_id, "email": f"user{i}@bench.test", "name": f"User {i}", "company": "", "role": ""}
+    try:
+        if waitlist:
+            registration, _ = await registration_service.register_or_waitlist(data)
+            outcomes["registered" if registration else "waitlisted"] += 1
+        else:
+            await registration_service.register(data)
+            outcomes["registered"] += 1
+    except SeatUnavailable as e:
+        outcomes[e.detail] += 1
+
+
+async def canceller(session_id: str, db, outcomes: Counter) -> None:
+    """Cancel a few registrations while claims are still in flight."""
+    for _ in range(10):
+        await asyncio.sleep(random.uniform(0, 0.05))
+        registration = await db.registrations.find_one({"session_id": session_id}, {"email": 1})
+        if registration is None:
+            continue
+        try:
+            await registration_service.cancel(session_id, registration["email"])
+            outcomes["cancelled"] += 1
+        except LookupError:
+            pass
+
+
+async def check(db, session_id, seats: int) -> list:
+    session = await db.ama_sessions.find_one({"_id": session_id})
+    registrations = await db.registrations.count_documents({"session_id": str(session_id)})
+    registered = {r["email"] async for r in db.registrations.find({"session_id": str(session_id)}, {"email": 1})}
+    waitlisted = {w["email"] async for w in db.waitlist.find({"session_id": str(session_id)}, {"email": 1})}
+    problems = []
+    if session["registrants"] != registrations:
+        problems.append(f"registrants={session['registrants']} but {registrations} registrations")
+    if registrations > seats:
+        problems.append(f"{registrations} registrations for {seats} seats")
+    if registered & waitlisted:
+        problems.append(f"{len(registered & waitlisted)} emails both registered and waitlisted")
+    if waitlisted and registrations < seats:
+        problems.append(f"{len(waitlisted)} waitlisted with {seats - registrations} seats free")
+    return problems
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--seats", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    db = await use_bench_database()
+    notifications._queue = asyncio.Queue()
+    failed = False
+    for round_ in range(args.rounds):
+        inserted = await db.ama_sessions.insert_one({
+            "title": f"Overbooking round {round_}",
+            "mentor": {"name": "Bench", "role": "Mentor"},
+            "registrants": 0,
+            "maxRegistrants": args.seats,
+            "created_at": datetime.utcnow(),
+        })
+        session_id = str(inserted.inserted_id)
+        outcomes: Counter = Counter()
+        # Every tenth client retries with an earlier client's email
+        emails = [i if i % 10 else random.randrange(max(i, 1)) for i in range(args.clients)]
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(client(session_id, i, waitlist=bool(n % 2), outcomes=outcomes) for n, i in enumerate(emails)),
+            canceller(session_id, db, outcomes)
+        )
+        elapsed = time.perf_counter() - started
+        problems = await check(db, inserted.inserted_id, args.seats)
+        failed = failed or bool(problems)
+        print(f"round {round_}: {args.clients} clients in {elapsed:.2f}s {dict(outcomes)}")
+        for problem in problems:
+            print(f"  FAIL: {problem}")
+    print("\nno overbooking" if not failed else "\noverbooking invariants broken")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    run(main)
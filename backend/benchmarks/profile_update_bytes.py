@@ -0,0 +1,95 @@
+"""
+Profile edit cost, full document vs PATCH (user-026): for a few typical
+edits to a production-sized mentor profile, the request body each route
+receives and the size of the oplog entry the write produces.
+
+  POST  /users/profile/update   the whole profile, read, edited and sent
+                                back, written with one $set of every field
+  PATCH /users/profile          only the changed paths
+
+    python -m benchmarks.profile_update_bytes [--repeat 20]
+
+MONGODB_URI must point at a replica set (a single-node set started with
+--replSet is enough, as for live_fanout): the oplog entry is read back
+from local.oplog.rs after each write.
+"""
+import argparse
+import statistics
+
+import bson
+import orjson
+
+from app import database
+from benchmarks.common import BENCH_DATABASE, mentor_profile, report, request, running_app, run, use_bench_database
+
+USER_ID = mentor_profile(0)["userId"]
+
+# name -> (edit applied to the full document, the same edit as a PATCH body)
+EDITS = {
+    "headline": (
+        lambda profile, n: profile.update(headline=f"Staff engineer, edit {n}"),
+        lambda n: {"headline": f"Staff engineer, edit {n}"},
+    ),
+    "one experience description": (
+        lambda profile, n: profile["experience"][1].update(description=f"Led the platform team, edit {n}"),
+        lambda n: {"experience.1.description": f"Led the platform team, edit {n}"},
+    ),
+    "append a skill": (
+        lambda profile, n: profile["skills"].append(f"skill-{n}"),
+        lambda n: [{"op": "add", "path": "/skills/-", "value": f"skill-{n}"}],
+    ),
+}
+
+
+async def last_oplog_entry() -> dict:
+    entry = await database.client.local["oplog.rs"].find_one(
+        {"ns": f"{BENCH_DATABASE}.userprofile", "op": "u"},
+        sort=[("$natural", -1)]
+    )
+    if entry is None:
+        raise RuntimeError("no oplog entry found; MONGODB_URI must be a replica set")
+    return entry
+
+
+async def send(app, method: str, path: str, payload) -> int:
+    body = orjson.dumps(payload)
+    status, _, response = await request(app, method, path, {"content-type": "application/json"}, body)
+    if status != 200:
+        raise RuntimeError(f"{status}: {response[:200]!r}")
+    return len(body)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    db = await use_bench_database()
+    await db.userprofile.insert_one(mentor_profile(0))
+
+    rows = {}
+    async with running_app() as app:
+        for name, (edit_document, patch_body) in EDITS.items():
+            full, patch = {"request": [], "oplog": []}, {"request": [], "oplog": []}
+            for n in range(args.repeat):
+                # What the profile editor does today: fetch the profile, change it, send it all back
+                profile = await db.userprofile.find_one({"userId": USER_ID}, {"_id": 0})
+                edit_document(profile, n)
+                full["request"].append(await send(app, "POST", f"/users/profile/update?userId={USER_ID}", profile))
+                full["oplog"].append(len(bson.encode(await last_oplog_entry())))
+
+                patch["request"].append(await send(app, "PATCH", f"/users/profile?userId={USER_ID}", patch_body(n)))
+                patch["oplog"].append(len(bson.encode(await last_oplog_entry())))
+
+            for route, sizes in (("POST .../update", full), ("PATCH", patch)):
+                rows[f"{name}, {route}"] = {
+                    "n": args.repeat,
+                    "request_bytes": round(statistics.fmean(sizes["request"])),
+                    "oplog_entry_bytes": round(statistics.fmean(sizes["oplog"])),
+                    "oplog_entry_max": max(sizes["oplog"]),
+                }
+    report("mean bytes per profile edit", rows)
+
+
+if __name__ == "__main__":
+    run(main)
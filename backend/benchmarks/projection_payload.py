@@ -0,0 +1,57 @@
+"""
+Card vs full response shapes (user-030): response size and latency of the
+listing endpoints with view=full (the documents as stored, what they
+returned before) and view=card (the fields the listing screens show).
+
+    python -m benchmarks.projection_payload [--mentors 2000] [--sessions 10000] [--iterations 50]
+
+Requests go through the app in-process, uncompressed, with the catalog
+cache cleared before each one so every request reads from MongoDB.
+"""
+import argparse
+import time
+
+from app.utils.cache_backend import shared_cache
+from benchmarks.common import request, running_app, run, seed_catalog, summarize, use_bench_database
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mentors", type=int, default=2000)
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    db = await use_bench_database()
+    await seed_catalog(db, args.mentors, args.sessions)
+    mentor_id = (await db.sessions.find_one({}, {"userId": 1}))["userId"]
+
+    endpoints = {
+        "/mentors/all": "/mentors/all?view={view}",
+        "/sessions/one-on-one/all (100)": "/sessions/one-on-one/all?limit=100&view={view}",
+        "/sessions/group-session/all (100)": "/sessions/group-session/all?limit=100&view={view}",
+        f"/sessions/mentor/{{id}}": f"/sessions/mentor/{mentor_id}?view={{view}}",
+    }
+    headers = {"accept-encoding": "identity"}
+
+    async with running_app() as app:
+        print(f"{'endpoint':<36} {'view':<5} {'bytes':>10} {'p50 ms':>8} {'p95 ms':>8}")
+        for name, template in endpoints.items():
+            sizes = {}
+            for view in ("full", "card"):
+                path = template.format(view=view)
+                samples = []
+                for _ in range(args.iterations):
+                    await shared_cache.delete_tag("sessions")
+                    started = time.perf_counter()
+                    status, _, body = await request(app, "GET", path, headers)
+                    samples.append(time.perf_counter() - started)
+                    assert status == 200, (path, status, body[:200])
+                sizes[view] = len(body)
+                stats = summarize(samples)
+                print(f"{name:<36} {view:<5} {len(body):>10} {stats['p50_ms']:>8} {stats['p95_ms']:>8}")
+            print(f"{'':<36} card is {sizes['card'] / sizes['full']:.1%} of full")
+
+
+if __name__ == "__main__":
+    run(main)
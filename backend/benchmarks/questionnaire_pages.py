@@ -0,0 +1,109 @@
+"""
+Questionnaire page latency, cursor vs skip (user-045): seeds one AMA
+session with Q questions and one question with A answers (default 12,000
+each), then times page 1 and page 500 of each listing through the app.
+
+  GET /questionnaires/?session_id=...            newest first
+  GET /questionnaires/?session_id=...&sort_by=upvotes
+  GET /questionnaires/{id}/answers               newest first
+
+The cursor for page 500 is found by following X-Next-Cursor from page 1,
+as a client scrolling down would; the skip row asks for the same page
+with skip=(page - 1) * limit.
+
+    python -m benchmarks.questionnaire_pages [--questions 12000] [--answers 12000] [--page-size 20] [--iterations 50]
+
+Expected: cursor latency the same at both pages; skip growing with the page.
+"""
+import argparse
+import random
+from datetime import datetime, timedelta
+from urllib.parse import quote
+
+from bson import ObjectId
+
+from benchmarks.common import measure, report, request, running_app, run, use_bench_database
+
+PAGES = (1, 500)
+
+
+def author(i: int) -> dict:
+    return {"id": f"user-{i}", "name": f"User {i}", "initials": "U"}
+
+
+def question(session_id: str, i: int, now: datetime) -> dict:
+    timestamp = now - timedelta(seconds=i)
+    return {
+        "session_id": session_id, "title": f"Question {i}", "content": "How do I grow as an engineer?",
+        "authors": [author(i)], "upvotes": random.randint(0, 500), "answers": 0,
+        "hot_score": 1.0, "hot_updated_at": now, "timestamp": timestamp, "created_at": timestamp,
+    }
+
+
+def answer(question_id: str, i: int, now: datetime) -> dict:
+    timestamp = now - timedelta(seconds=i)
+    return {
+        "question_id": question_id, "content": f"Answer {i}", "author": author(i),
+        "upvotes": random.randint(0, 50), "timestamp": timestamp, "created_at": timestamp,
+    }
+
+
+async def get(app, path: str):
+    status, headers, body = await request(app, "GET", path)
+    if status != 200:
+        raise RuntimeError(f"{status}: {body[:200]!r}")
+    return headers.get("x-next-cursor")
+
+
+async def page_cursor(app, path: str, page: int):
+    """The cursor for a page, found by following X-Next-Cursor from the first one."""
+    cursor = None
+    for _ in range(page - 1):
+        cursor = await get(app, f"{path}&cursor={quote(cursor)}" if cursor else path)
+    return cursor
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", type=int, default=12_000)
+    parser.add_argument("--answers", type=int, default=12_000)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    random.seed(1)
+    db = await use_bench_database()
+    now = datetime.utcnow()
+    session_id, question_id = str(ObjectId()), str(ObjectId())
+    for start in range(0, args.questions, 5000):
+        await db.questionnaires.insert_many([
+            question(session_id, i, now) for i in range(start, min(start + 5000, args.questions))
+        ])
+    for start in range(0, args.answers, 5000):
+        await db.answers.insert_many([
+            answer(question_id, i, now) for i in range(start, min(start + 5000, args.answers))
+        ])
+
+    listings = {
+        "questions, newest": (f"/questionnaires/?session_id={session_id}&limit={args.page_size}", args.questions),
+        "questions, upvotes": (
+            f"/questionnaires/?session_id={session_id}&sort_by=upvotes&limit={args.page_size}", args.questions
+        ),
+        "answers, newest": (f"/questionnaires/{question_id}/answers?limit={args.page_size}", args.answers),
+    }
+    rows = {}
+    async with running_app() as app:
+        for name, (path, total) in listings.items():
+            for page in PAGES:
+                if (page - 1) * args.page_size >= total:
+                    continue
+                cursor = await page_cursor(app, path, page)
+                cursor_path = f"{path}&cursor={quote(cursor)}" if cursor else path
+                skip_path = f"{path}&skip={(page - 1) * args.page_size}"
+                rows[f"{name}, page {page}, cursor"] = await measure(lambda: get(app, cursor_path), args.iterations)
+                rows[f"{name}, page {page}, skip"] = await measure(lambda: get(app, skip_path), args.iterations)
+    report(f"{args.page_size} per page, {args.questions} questions, {args.answers} answers", rows)
+
+
+if __name__ == "__main__":
+    run(main)
@@ -0,0 +1,85 @@
+"""
+Search latency at scale (user-049): seeds N mentor profiles (default
+100,000) and sessions, then times /search/mentors and /search/sessions
+query shapes straight through app.utils.search.search, uncached.
+
+    python -m benchmarks.search_latency [--mentors 100000] [--iterations 200]
+
+Target: p95 under 50 ms per query shape.
+"""
+import argparse
+import random
+
+from app.utils.search import search
+from benchmarks.common import measure, report, run, use_bench_database
+
+EXPERTISE = ["Data Science", "Product Management", "Design", "Software Engineering", "Marketing", "DevOps"]
+SKILLS = ["python", "sql", "react", "figma", "machine learning", "kubernetes", "go", "java", "leadership", "seo"]
+TOOLS = ["jupyter", "docker", "jira", "notion", "aws", "gcp", "tableau", "vscode"]
+DISCIPLINES = ["AI", "Web", "Mobile", "Cloud", "Growth", "UX"]
+WORDS = "career growth interview resume startup scaling teams mentoring hiring remote product analytics".split()
+
+
+def mentor(i: int) -> dict:
+    return {
+        "userId": f"bench-{i}",
+        "name": f"Mentor {i}",
+        "role": "mentor" if i % 10 else "user",
+        "primaryExpertise": random.choice(EXPERTISE),
+        "skills": random.sample(SKILLS, 3),
+        "tools": random.sample(TOOLS, 2),
+        "disciplines": random.sample(DISCIPLINES, 2),
+        "mentoringTopics": random.sample(WORDS, 3),
+        "bio": " ".join(random.choices(WORDS, k=30)),
+    }
+
+
+def session(i: int) -> dict:
+    return {
+        "sessionId": f"bench-{i}",
+        "userId": f"bench-{i % 1000}",
+        "sessionName": " ".join(random.sample(WORDS, 3)),
+        "description": " ".join(random.choices(WORDS, k=40)),
+        "topics": random.sample(SKILLS, 2),
+        "sessionType": random.choice(["one-on-one", "group-session"]),
+        "isPaid": bool(i % 3),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mentors", type=int, default=100_000)
+    parser.add_argument("--sessions", type=int, default=50_000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    random.seed(1)
+    db = await use_bench_database()
+    for start in range(0, args.mentors, 10_000):
+        await db.userprofile.insert_many([mentor(i) for i in range(start, min(start + 10_000, args.mentors))])
+    for start in range(0, args.sessions, 10_000):
+        await db.sessions.insert_many([session(i) for i in range(start, min(start + 10_000, args.sessions))])
+
+    card = {"userId": 1, "name": 1, "primaryExpertise": 1, "_id": 0}
+    shapes = {
+        "mentors browse (no q)": lambda: search("mentors", None, {}, 0, 20, card),
+        "mentors browse, skills filter": lambda: search("mentors", None, {"skills": ["python"]}, 0, 20, card),
+        "mentors q=python": lambda: search("mentors", "python", {}, 0, 20, card),
+        "mentors q=machine learning + filter": lambda: search(
+            "mentors", "machine learning", {"primaryExpertise": ["Data Science"]}, 0, 20, card
+        ),
+        "mentors q=rare term": lambda: search("mentors", "kubernetes seo", {}, 0, 20, card),
+        "mentors deep page (skip 1000)": lambda: search("mentors", None, {}, 1000, 20, card),
+        "sessions browse": lambda: search("sessions", None, {}, 0, 20, None),
+        "sessions q=career": lambda: search("sessions", "career", {"isPaid": [True]}, 0, 20, None),
+    }
+    rows = {}
+    for name, fn in shapes.items():
+        rows[name] = await measure(fn, args.iterations)
+    report(f"search latency, {args.mentors} profiles / {args.sessions} sessions", rows)
+    slow = [name for name, stats in rows.items() if stats["p95_ms"] >= 50]
+    print("\nall shapes under 50 ms p95" if not slow else f"\nover 50 ms p95: {', '.join(slow)}")
+
+
+if __name__ == "__main__":
+    run(main)
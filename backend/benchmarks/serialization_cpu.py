@@ -0,0 +1,97 @@
+"""
+Response serialization CPU (user-033): CPU time to turn a list of AMA
+session documents into a response body for lists of 10, 1k and 10k items.
+
+  before  copy each document and str() its _id, validate against the
+          List[AMASession] response_model and render through
+          jsonable_encoder + JSONResponse, as the routes did
+  after   BSONJSONResponse straight from the projected documents
+
+    python -m benchmarks.serialization_cpu [--sizes 10,1000,10000]
+
+No database is needed; the documents are built in memory (app.config
+still wants MONGODB_URI and DATABASE_NAME set).
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime
+from typing import List
+
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.schemas.ama_session import AMASession
+from app.utils.responses import BSONJSONResponse
+from benchmarks.common import WORDS
+
+FIELD = create_response_field(name="response", type_=List[AMASession])
+
+
+def ama_session(i: int) -> dict:
+    return {
+        "_id": ObjectId(),
+        "title": f"AMA {i}: " + " ".join(random.choices(WORDS, k=6)),
+        "description": " ".join(random.choices(WORDS, k=60)),
+        "mentor": {"name": f"Mentor {i}", "role": "Staff Engineer", "company": "Acme", "image": "https://cdn.example/a.png"},
+        "date": "2025-06-01",
+        "time": "18:00",
+        "duration": "60",
+        "registrants": random.randint(0, 100),
+        "maxRegistrants": 100,
+        "questions": [" ".join(random.choices(WORDS, k=8)) for _ in range(3)],
+        "isWomanTech": bool(i % 2),
+        "isPaid": False,
+        "price": 0.0,
+        "tokenPrice": 0,
+        "topics": random.sample(WORDS, 3),
+        "timeSlots": [],
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow(),
+    }
+
+
+async def before(documents: list) -> bytes:
+    copies = []
+    for document in documents:
+        copy = dict(document)
+        copy["_id"] = str(copy["_id"])
+        copies.append(copy)
+    content = await serialize_response(field=FIELD, response_content=copies)
+    return JSONResponse(content).body
+
+
+async def after(documents: list) -> bytes:
+    return BSONJSONResponse(documents).body
+
+
+async def cpu_per_response(render, documents: list, min_seconds: float = 1.0) -> float:
+    """Mean CPU seconds per response over at least min_seconds of CPU."""
+    await render(documents)
+    runs, started = 0, time.process_time()
+    while time.process_time() - started < min_seconds:
+        await render(documents)
+        runs += 1
+    return (time.process_time() - started) / runs
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10,1000,10000")
+    args = parser.parse_args()
+
+    random.seed(1)
+    print(f"{'items':>6} {'before ms':>10} {'after ms':>10} {'speedup':>8} {'bytes':>10}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        documents = [ama_session(i) for i in range(size)]
+        slow = await cpu_per_response(before, documents)
+        fast = await cpu_per_response(after, documents)
+        body = await after(documents)
+        print(f"{size:>6} {slow * 1000:>10.3f} {fast * 1000:>10.3f} {slow / fast:>7.1f}x {len(body):>10}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,123 @@
+"""
+Near-duplicate question detection (user-048): build a SessionIndex of 10k
+questions, then query it with reworded copies of indexed questions
+(should be found) and with new questions about a different topic,
+situation and focus that may still share the opening words (should not
+match anything).
+
+    python -m benchmarks.similarity_recall [--questions 10000] [--queries 2000]
+
+Reports recall (the original is among the candidates), the false-positive
+rate on new questions, query and insert latency, and index size, at
+SIMILARITY_THRESHOLD / SIMILARITY_MAX_CANDIDATES. No database is needed
+(app.config still wants MONGODB_URI and DATABASE_NAME set).
+"""
+import argparse
+import random
+import time
+
+from app.config import settings
+from app.utils.similarity import SessionIndex, question_text
+from benchmarks.common import summarize
+
+OPENERS = ["How do I", "What is the best way to", "Any tips to", "How should I", "What's your advice to", "How can a junior"]
+VERBS = ["negotiate", "prepare for", "switch into", "get better at", "learn", "break into", "ask for", "plan", "grow in", "avoid burnout in"]
+OBJECTS = [
+    "a senior engineering offer", "system design interviews", "product management", "machine learning research",
+    "a promotion to staff", "remote work at a startup", "data engineering", "UX design", "a first tech job",
+    "open source contributions", "an engineering manager role", "cloud certifications", "a career gap",
+    "technical writing", "developer relations", "a PhD to industry move", "frontend performance work",
+    "security engineering", "a bootcamp to FAANG path", "public speaking at conferences",
+]
+CONTEXTS = [
+    "with no degree", "after a layoff", "while working full time", "as a career changer", "in Europe",
+    "with two years of experience", "at a big company", "coming from academia", "as a single parent",
+    "in a fully remote team", "without a referral", "in under six months", "on a tight budget",
+]
+FOCUS = [
+    "salary", "portfolio projects", "networking", "mock interviews", "side projects", "mentorship",
+    "time management", "visa sponsorship", "leetcode practice", "reading papers", "writing a resume",
+    "cold emails", "team culture", "imposter syndrome", "work-life balance", "personal branding",
+]
+# New questions draw topic, situation and focus from the tail of each list,
+# which indexed questions never use
+INDEXED_SPLIT = {"objects": 15, "contexts": 10, "focus": 12}
+
+
+def new_question(rng: random.Random, indexed: bool = True) -> str:
+    def pick(values, split):
+        return rng.choice(values[:split] if indexed else values[split:])
+
+    return (
+        f"{rng.choice(OPENERS)} {rng.choice(VERBS)} {pick(OBJECTS, INDEXED_SPLIT['objects'])} "
+        f"{pick(CONTEXTS, INDEXED_SPLIT['contexts'])}, especially around {pick(FOCUS, INDEXED_SPLIT['focus'])}?"
+    )
+
+
+def reword(text: str, rng: random.Random) -> str:
+    """A copy an attendee might type: different case, punctuation, filler, a typo or swapped words."""
+    words = text.rstrip("?").split()
+    edits = rng.sample(["case", "filler", "typo", "swap", "punctuation", "prefix"], k=2)
+    if "swap" in edits and len(words) > 3:
+        i = rng.randrange(len(words) - 1)
+        words[i], words[i + 1] = words[i + 1], words[i]
+    if "typo" in edits:
+        i = rng.randrange(len(words))
+        word = words[i]
+        if len(word) > 3:
+            j = rng.randrange(len(word) - 1)
+            words[i] = word[:j] + word[j + 1] + word[j] + word[j + 2:]
+    if "filler" in edits:
+        words.insert(rng.randrange(len(words)), rng.choice(["really", "actually", "please", "honestly"]))
+    result = " ".join(words)
+    if "case" in edits:
+        result = result.lower()
+    if "prefix" in edits:
+        result = rng.choice(["Quick question: ", "Hi! ", "Sorry if asked already - "]) + result
+    return result + ("!!" if "punctuation" in edits else "?")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    indexed = list(dict.fromkeys(new_question(rng) for _ in range(args.questions * 2)))[:args.questions]
+    unseen = [new_question(rng, indexed=False) for _ in range(args.queries)]
+
+    index = SessionIndex()
+    inserts = []
+    for number, text in enumerate(indexed):
+        started = time.perf_counter()
+        index.add(str(number), question_text(text))
+        inserts.append(time.perf_counter() - started)
+
+    threshold, limit = settings.SIMILARITY_THRESHOLD, settings.SIMILARITY_MAX_CANDIDATES
+    found, latencies = 0, []
+    for _ in range(args.queries):
+        number = rng.randrange(len(indexed))
+        query = reword(indexed[number], rng)
+        started = time.perf_counter()
+        matches = index.query(question_text(query), limit, threshold)
+        latencies.append(time.perf_counter() - started)
+        found += any(question_id == str(number) for question_id, _ in matches)
+
+    false_positives = 0
+    for text in unseen:
+        started = time.perf_counter()
+        matches = index.query(question_text(text), limit, threshold)
+        latencies.append(time.perf_counter() - started)
+        false_positives += bool(matches)
+
+    print(f"{len(index)} questions indexed, threshold {threshold}, up to {limit} candidates")
+    print(f"  recall on reworded duplicates:      {found / args.queries:.1%} ({found}/{args.queries})")
+    print(f"  new questions with any candidate:   {false_positives / len(unseen):.1%} ({false_positives}/{len(unseen)})")
+    print(f"  query latency:  {summarize(latencies)}")
+    print(f"  insert latency: {summarize(inserts)}")
+    print(f"  index size:     ~{index.nbytes / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Thundering herd on the hot read endpoints (user-032): N identical requests
+(default 1,000) arrive at once on one worker, with request coalescing on
+and with it replaced by a pass-through.
+
+  GET /ama-sessions            polled by every open AMA page
+  GET /sessions/one-on-one/all first catalog page, shared cache emptied
+                               before each round so the herd starts cold
+
+    python -m benchmarks.singleflight_herd [--requests 1000] [--rounds 5] [--sessions 200]
+
+DB ops/sec is the growth of the server's opcounters (query, getmore and
+command) over the rounds divided by their wall time, so nothing else
+should be using MONGODB_URI while this runs. Also reports how many
+loads the single flight ran versus coalesced, and per-request latency.
+"""
+import argparse
+import asyncio
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import app.routes.ama_session as ama_session_routes
+import app.routes.session as session_routes
+import app.utils.etag as etag
+from app import database
+from app.utils.cache_backend import shared_cache
+from app.utils.singleflight import SingleFlight
+from benchmarks.common import report, request, running_app, run, seed_catalog, summarize, use_bench_database
+
+COALESCING_MODULES = (ama_session_routes, session_routes, etag)
+
+
+class PassThrough:
+    """Stands in for the single flight: every caller runs its own load."""
+
+    async def do(self, key, fn):
+        return await fn()
+
+    def stats(self):
+        return {"calls": 0, "coalesced": 0, "in_flight": 0}
+
+
+@contextmanager
+def coalescing(flight):
+    saved = [module.singleflight for module in COALESCING_MODULES]
+    saved_cache_flight = shared_cache._singleflight
+    for module in COALESCING_MODULES:
+        module.singleflight = flight
+    # The shared cache coalesces its own misses
+    shared_cache._singleflight = flight
+    try:
+        yield flight
+    finally:
+        for module, original in zip(COALESCING_MODULES, saved):
+            module.singleflight = original
+        shared_cache._singleflight = saved_cache_flight
+
+
+async def db_ops() -> int:
+    status = await database.client.admin.command("serverStatus")
+    counters = status["opcounters"]
+    return counters["query"] + counters["getmore"] + counters["command"]
+
+
+async def herd(app, path: str, requests: int, rounds: int, cold, flight) -> dict:
+    samples = []
+    elapsed = 0.0
+    ops_before = await db_ops()
+
+    async def one():
+        started = time.perf_counter()
+        status, _, body = await request(app, "GET", path)
+        if status != 200:
+            raise RuntimeError(f"{status}: {body[:200]!r}")
+        samples.append(time.perf_counter() - started)
+
+    with coalescing(flight):
+        for _ in range(rounds):
+            await cold()
+            started = time.perf_counter()
+            await asyncio.gather(*(one() for _ in range(requests)))
+            elapsed += time.perf_counter() - started
+
+    # Less the serverStatus call that took the first reading
+    ops = await db_ops() - ops_before - 1
+    stats = flight.stats()
+    return {
+        "db_ops": ops,
+        "db_ops_per_sec": round(ops / elapsed, 1),
+        "loads": stats["calls"],
+        "coalesced": stats["coalesced"],
+        **summarize(samples),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--sessions", type=int, default=200)
+    args = parser.parse_args()
+
+    db = await use_bench_database()
+    await seed_catalog(db, mentors=50, sessions=args.sessions)
+    await db.ama_sessions.insert_many([
+        {
+            "title": f"AMA {i}", "description": "Ask me anything", "mentor": {"name": f"Mentor {i}"},
+            "date": "2025-01-01", "time": "18:00", "duration": "60", "maxRegistrants": 100,
+            "registrants": 0, "created_at": datetime.utcnow(),
+        }
+        for i in range(20)
+    ])
+
+    async def warm():
+        pass
+
+    async def empty_catalog_cache():
+        await shared_cache.delete_tag("sessions")
+
+    endpoints = {
+        "GET /ama-sessions": ("/ama-sessions", warm),
+        "GET /sessions/one-on-one/all": ("/sessions/one-on-one/all", empty_catalog_cache),
+    }
+    rows = {}
+    async with running_app() as app:
+        for name, (path, cold) in endpoints.items():
+            rows[f"{name}, single flight"] = await herd(app, path, args.requests, args.rounds, cold, SingleFlight())
+            rows[f"{name}, pass-through"] = await herd(app, path, args.requests, args.rounds, cold, PassThrough())
+    report(f"{args.requests} concurrent identical requests x {args.rounds} rounds, one worker", rows)
+
+
+if __name__ == "__main__":
+    run(main)
@@ -0,0 +1,99 @@
+"""
+Upvote throughput on one worker (user-041): upvotes/sec and latency with C
+concurrent clients voting on a handful of hot questions during a live AMA.
+
+  three round trips    find_one + update_one($inc) + find_one, the old route
+  find_one_and_update  one $inc returning the document (ReturnDocument.AFTER)
+  POST .../upvote      the route as it is now, through the app: one read,
+                       the per-user vote insert, and the buffered increment
+
+    python -m benchmarks.upvote_throughput [--clients 200] [--seconds 10] [--questions 5]
+"""
+import argparse
+import asyncio
+import itertools
+import time
+from datetime import datetime
+
+from pymongo import ReturnDocument
+
+from app.database import get_collection
+from app.routes.questionnaire import QUESTIONNAIRE_FIELDS
+from benchmarks.common import report, request, running_app, run, summarize, use_bench_database
+
+
+async def three_round_trips(question_id, _):
+    collection = get_collection("questionnaires")
+    if await collection.find_one({"_id": question_id}) is None:
+        raise LookupError(question_id)
+    await collection.update_one({"_id": question_id}, {"$inc": {"upvotes": 1}})
+    return await collection.find_one({"_id": question_id})
+
+
+async def find_one_and_update(question_id, _):
+    document = await get_collection("questionnaires").find_one_and_update(
+        {"_id": question_id},
+        {"$inc": {"upvotes": 1}},
+        projection=QUESTIONNAIRE_FIELDS,
+        return_document=ReturnDocument.AFTER
+    )
+    if document is None:
+        raise LookupError(question_id)
+    return document
+
+
+def route(app):
+    async def upvote(question_id, voter):
+        status, _, body = await request(app, "POST", f"/questionnaires/{question_id}/upvote?user_id={voter}")
+        if status != 200:
+            raise RuntimeError(f"{status}: {body[:200]!r}")
+    return upvote
+
+
+async def load(fn, question_ids, clients: int, seconds: float) -> dict:
+    voters = itertools.count()
+    samples = []
+    deadline = time.perf_counter() + seconds
+
+    async def client():
+        while time.perf_counter() < deadline:
+            voter = next(voters)
+            started = time.perf_counter()
+            await fn(question_ids[voter % len(question_ids)], f"voter-{voter}")
+            samples.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    return {"upvotes_per_sec": round(len(samples) / elapsed, 1), **summarize(samples)}
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--questions", type=int, default=5)
+    args = parser.parse_args()
+
+    db = await use_bench_database()
+    result = await db.questionnaires.insert_many([
+        {
+            "session_id": "bench-ama", "title": f"Question {i}", "content": "", "authors": [],
+            "upvotes": 0, "answers": 0, "hot_score": 1.0, "hot_updated_at": datetime.utcnow(),
+            "timestamp": datetime.utcnow(),
+        }
+        for i in range(args.questions)
+    ])
+    question_ids = result.inserted_ids
+
+    rows = {
+        "three round trips": await load(three_round_trips, question_ids, args.clients, args.seconds),
+        "find_one_and_update": await load(find_one_and_update, question_ids, args.clients, args.seconds),
+    }
+    async with running_app() as app:
+        rows["POST /questionnaires/{id}/upvote"] = await load(route(app), question_ids, args.clients, args.seconds)
+    report(f"upvotes, {args.clients} concurrent clients on {args.questions} questions, one worker", rows)
+
+
+if __name__ == "__main__":
+    run(main)
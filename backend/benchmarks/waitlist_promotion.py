@@ -0,0 +1,100 @@
+"""
+Waitlist promotion latency (user-037): time from a cancellation to the
+head of the waitlist holding the freed seat, for a full AMA session of S
+seats (default 200) with W people waiting (default 1,000).
+
+  one at a time   DELETE /registrations/{session_id}/{email}, one after another
+  concurrent      C cancellations at once (default 50), as when a session is moved
+
+The route returns once the promoted registration is inserted, so its
+latency is the cancel-to-promotion latency. Afterwards registrants must
+still equal the seats and every cancellation must have promoted someone.
+
+    python -m benchmarks.waitlist_promotion [--seats 200] [--waitlist 1000] [--concurrency 50]
+
+The app's email worker is stopped, so confirmations are queued but never sent.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime
+
+import orjson
+
+from app.utils.notifications import notifications
+from benchmarks.common import report, request, running_app, run, summarize, use_bench_database
+
+
+# The API validates emails, which rejects reserved domains such as .test
+def person(session_id: str, i: int) -> dict:
+    return {"session_id": session_id, "email": f"user{i}@bench.mentorhood.com", "name": f"User {i}", "company": "", "role": ""}
+
+
+async def cancel(app, session_id: str, email: str) -> float:
+    started = time.perf_counter()
+    status, _, body = await request(app, "DELETE", f"/registrations/{session_id}/{email}")
+    elapsed = time.perf_counter() - started
+    if status != 200 or orjson.loads(body).get("promoted") is None:
+        raise RuntimeError(f"{status}: {body[:200]!r}")
+    return elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seats", type=int, default=200)
+    parser.add_argument("--waitlist", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    if args.seats < 2 * args.concurrency or args.waitlist < args.seats:
+        parser.error("need --seats >= 2 * --concurrency and --waitlist >= --seats")
+
+    db = await use_bench_database()
+    inserted = await db.ama_sessions.insert_one({
+        "title": "Promotion latency",
+        "mentor": {"name": "Bench", "role": "Mentor"},
+        "registrants": 0,
+        "maxRegistrants": args.seats,
+        "created_at": datetime.utcnow(),
+    })
+    session_id = str(inserted.inserted_id)
+
+    rows = {}
+    async with running_app() as app:
+        # Stop the email worker; confirmations pile up in a queue nobody reads
+        notifications._worker.cancel()
+        notifications._worker = None
+        notifications._queue = asyncio.Queue()
+        for i in range(args.seats + args.waitlist):
+            body = orjson.dumps(person(session_id, i))
+            status, _, response = await request(
+                app, "POST", "/registrations/waitlist", {"content-type": "application/json"}, body
+            )
+            if status != 200:
+                raise RuntimeError(f"{status}: {response[:200]!r}")
+
+        # The first half of the seats are cancelled one at a time, the rest in batches
+        half = args.seats // 2
+        rows["one at a time"] = summarize([
+            await cancel(app, session_id, f"user{i}@bench.mentorhood.com") for i in range(half)
+        ])
+        samples = []
+        for start in range(half, args.seats - args.concurrency + 1, args.concurrency):
+            samples += await asyncio.gather(*(
+                cancel(app, session_id, f"user{i}@bench.mentorhood.com") for i in range(start, start + args.concurrency)
+            ))
+        rows[f"{args.concurrency} concurrent"] = summarize(samples)
+
+    session = await db.ama_sessions.find_one({"_id": inserted.inserted_id})
+    registrations = await db.registrations.count_documents({"session_id": session_id})
+    waiting = await db.waitlist.count_documents({"session_id": session_id})
+    cancelled = rows["one at a time"]["n"] + len(samples)
+    report(f"cancel-to-promotion, {args.seats} seats, {args.waitlist} waiting", rows)
+    print(f"\nregistrants={session['registrants']} registrations={registrations} still waiting={waiting}")
+    if session["registrants"] != args.seats or registrations != args.seats or waiting != args.waitlist - cancelled:
+        print("FAIL: a freed seat was not handed to the waitlist")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run(main)
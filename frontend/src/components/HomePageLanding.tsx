@@ -18,7 +18,7 @@ import mentor5 from "../MentoImg/mentor5.jpg";
 import mentor6 from "../MentoImg/mentor6.jpg";
 import mentor7 from "../MentoImg/mentor7.jpg";
 import mentor8 from "../MentoImg/mentor8.jpg";
-import { API_URL } from "../utils/api";
+import { API_URL, fetchSessionCatalog } from "../utils/api";
 import OneOneSession from "./one-one-Session";
 import UpcomingSessions from "./upcomingsessions";
 import AskMeAnything from "./AskMeAnything";
@@ -260,15 +260,9 @@ function App() {
 
     const fetchOneOnOneSessions = async () => {
       try {
-        const response = await fetch(`${API_URL}/sessions/one-on-one/all`);
-        if (!response.ok) {
-          throw new Error("Failed to fetch sessions");
-        }
-        const data = await response.json();
-        if (data.status === "success") {
-          setOneOnOneSessions(data.sessions);
-          setMentors(data.mentors);
-        }
+        const data = await fetchSessionCatalog("one-on-one");
+        setOneOnOneSessions(data.sessions);
+        setMentors(data.mentors);
       } catch (error) {
         console.error("Error fetching sessions:", error);
       } finally {
@@ -278,14 +272,8 @@ function App() {
 
     const fetchGroupSessions = async () => {
       try {
-        const response = await fetch(`${API_URL}/sessions/group-session/all`);
-        if (!response.ok) {
-          throw new Error("Failed to fetch group sessions");
-        }
-        const data = await response.json();
-        if (data.status === "success") {
-          setGroupSessions(data.sessions);
-        }
+        const data = await fetchSessionCatalog("group-session");
+        setGroupSessions(data.sessions);
       } catch (error) {
         console.error("Error fetching group sessions:", error);
       }
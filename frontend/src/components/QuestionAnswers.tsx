@@ -59,9 +59,13 @@ export default function QuestionAnswers() {
 
   const handleUpvoteAnswer = async (answerId: string) => {
     try {
-      // Call the upvote API
+      // Call the upvote API; votes are counted once per user
+      const userId = JSON.parse(localStorage.getItem("user") || "{}").userId;
+      if (!userId) {
+        throw new Error("Please log in to upvote answers");
+      }
       const response = await fetch(
-        `${API_URL}/questionnaires/${questionId}/answers/${answerId}/upvote/`,
+        `${API_URL}/questionnaires/${questionId}/answers/${answerId}/upvote?user_id=${encodeURIComponent(userId)}`,
         {
           method: "POST",
           headers: {
@@ -1,7 +1,7 @@
 import { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { Star , Clock, Briefcase  } from 'lucide-react';
-import { API_URL } from '../utils/api';
+import { API_URL, fetchSessionCatalog, mergeMentors } from '../utils/api';
 
 
 
@@ -92,7 +92,11 @@ const AllMentors = () => {
   const [oneOnOneMentors, setOneOnOneMentors] = useState<MentorProfile[]>([]);
   const [groupSessionData, setGroupSessionData] = useState<Session[]>([]);
   const [groupSessionMentors, setGroupSessionMentors] = useState<MentorProfile[]>([]);
+  // Cursor of the next catalog page for each session tab; null once the last page is loaded
+  const [oneOnOneCursor, setOneOnOneCursor] = useState<string | null>(null);
+  const [groupSessionCursor, setGroupSessionCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   // Get the tab from URL parameters
   const searchParams = new URLSearchParams(window.location.search);
@@ -133,20 +137,15 @@ const AllMentors = () => {
             setAllMentorsData(data.mentors);
           }
         } else if (activeTab === 'one-on-one') {
-          const response = await fetch(`${API_URL}/sessions/one-on-one/all`);
-          const data = await response.json();
-          if (data.status === 'success') {
-            setOneOnOneData(data.sessions);
-            setOneOnOneMentors(data.mentors);
-          }
+          const data = await fetchSessionCatalog('one-on-one');
+          setOneOnOneData(data.sessions);
+          setOneOnOneMentors(data.mentors);
+          setOneOnOneCursor(data.next_cursor);
         } else if (activeTab === 'group-session') {
-          const response = await fetch(`${API_URL}/sessions/group-session/all`);
-          const data = await response.json();
-          console.log('Group Session Data:', data);
-          if (data.status === 'success') {
-            setGroupSessionData(data.sessions);
-            setGroupSessionMentors(data.mentors);
-          }
+          const data = await fetchSessionCatalog('group-session');
+          setGroupSessionData(data.sessions);
+          setGroupSessionMentors(data.mentors);
+          setGroupSessionCursor(data.next_cursor);
         }
       } catch (error) {
         console.error('Error fetching data:', error);
@@ -158,6 +157,40 @@ const AllMentors = () => {
     fetchData();
   }, [activeTab]);
 
+  // Append the next catalog page of the active session tab
+  const loadMore = async () => {
+    try {
+      setLoadingMore(true);
+      if (activeTab === 'one-on-one' && oneOnOneCursor) {
+        const data = await fetchSessionCatalog('one-on-one', oneOnOneCursor);
+        setOneOnOneData((sessions) => [...sessions, ...data.sessions]);
+        setOneOnOneMentors((mentors) => mergeMentors(mentors, data.mentors));
+        setOneOnOneCursor(data.next_cursor);
+      } else if (activeTab === 'group-session' && groupSessionCursor) {
+        const data = await fetchSessionCatalog('group-session', groupSessionCursor);
+        setGroupSessionData((sessions) => [...sessions, ...data.sessions]);
+        setGroupSessionMentors((mentors) => mergeMentors(mentors, data.mentors));
+        setGroupSessionCursor(data.next_cursor);
+      }
+    } catch (error) {
+      console.error('Error fetching more sessions:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const loadMoreButton = (cursor: string | null) => cursor && (
+    <div className="flex justify-center mt-12">
+      <button
+        onClick={loadMore}
+        disabled={loadingMore}
+        className="px-8 py-3 border border-gray-300 rounded-xl text-gray-800 hover:bg-gray-50 transition-colors disabled:opacity-50"
+      >
+        {loadingMore ? 'Loading...' : 'Load more'}
+      </button>
+    </div>
+  );
+
   return (
     <div className="min-h-screen bg-white">
       <div className="hero-section relative">
@@ -355,6 +388,7 @@ const AllMentors = () => {
               );
             })}
           </div>
+          {loadMoreButton(oneOnOneCursor)}
         </div>
       ) : (
         // Group Sessions Grid
@@ -425,6 +459,7 @@ const AllMentors = () => {
               );
             })}
           </div>
+          {loadMoreButton(groupSessionCursor)}
         </div>
       )}
     </div>
@@ -1,3 +1,40 @@
 
 // API URL configuration
-export const API_URL = import.meta.env.VITE_APP_API_URL || 'http://localhost:9000';
\ No newline at end of file
+export const API_URL = import.meta.env.VITE_APP_API_URL || 'http://localhost:9000';
+
+export interface SessionCatalog {
+  sessions: any[];
+  mentors: any[];
+  next_cursor: string | null;
+}
+
+// The session catalog is served in pages: fetch one page, and pass its
+// next_cursor back in to fetch the next one when the user asks for more.
+export const fetchSessionCatalog = async (
+  sessionType: 'one-on-one' | 'group-session',
+  cursor: string | null = null,
+  pageSize = 24
+): Promise<SessionCatalog> => {
+  const params = new URLSearchParams({ limit: String(pageSize) });
+  if (cursor) {
+    params.set('cursor', cursor);
+  }
+  const response = await fetch(`${API_URL}/sessions/${sessionType}/all?${params}`);
+  if (!response.ok) {
+    throw new Error('Failed to fetch sessions');
+  }
+  const data = await response.json();
+  if (data.status !== 'success') {
+    throw new Error('Failed to fetch sessions');
+  }
+  return { sessions: data.sessions, mentors: data.mentors, next_cursor: data.next_cursor };
+};
+
+// Pages list each mentor once, but a mentor can appear on several pages
+export const mergeMentors = <T extends { userId: string }>(loaded: T[], page: T[]): T[] => {
+  const mentors = new Map(loaded.map((mentor) => [mentor.userId, mentor]));
+  for (const mentor of page) {
+    mentors.set(mentor.userId, mentor);
+  }
+  return Array.from(mentors.values());
+};